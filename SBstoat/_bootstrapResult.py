@@ -8,22 +8,123 @@ Container for the results of bootstrapping. Provides
 metrics that are calculated from the results.
 """
 
-import SBstoat
 from SBstoat.timeseriesStatistic import TimeseriesStatistic
 from SBstoat.logs import Logger
 from SBstoat import rpickle
 from SBstoat import _helpers
+from SBstoat._parallelRunner import ParallelRunner
+from SBstoat._simulationRunner import SimulationRunner,  \
+      SimulationRunnerArgument
 
 import lmfit
+import multiprocessing
 import numpy as np
-import pandas as pd
 
 PERCENTILES = [2.5, 50, 97.55]  # Percentile for confidence limits
 MIN_COUNT_PERCENTILE = 100  # Minimum number of values required to get percentiles
 MIN_VALUE = 1e-3
+BATCH_PER_PROCESS = 2  # Batches of simulations per process
+SIMULATION_BATCH_SIZE = 100  # Simulations per work unit
+# Convergence of bootstrap estimates
+CONVERGENCE_PERCENTILES = [2.5, 97.5]
+CONVERGENCE_INTERVAL = 50  # Successful iterations between checks
+MIN_CONVERGENCE_ITERATION = 100  # Minimum successful iterations
+NUM_CONVERGENCE_CHECK = 2  # Consecutive checks within tolerance
 
 
 ######### CLASSES ###############
+class BootstrapConvergence():
+    """
+    Detects that bootstrap estimates of parameters have converged.
+    The estimates are the means, standard deviations, and
+    CONVERGENCE_PERCENTILES of parameter values. These are calculated
+    every checkInterval successful iterations. Convergence is when the
+    relative change in all estimates is within the tolerance for
+    NUM_CONVERGENCE_CHECK consecutive checks.
+    """
+
+    def __init__(self, tolerance:float, checkInterval:int=CONVERGENCE_INTERVAL,
+          minIteration:int=MIN_CONVERGENCE_ITERATION):
+        """
+        Parameters
+        ----------
+        tolerance: float
+            maximum relative change in an estimate
+        checkInterval: int
+            number of successful iterations between checks
+        minIteration: int
+            minimum number of successful iterations
+        """
+        self.tolerance = tolerance
+        self.checkInterval = checkInterval
+        self.minIteration = minIteration
+        self.parameterDct = {}  # key: parameter, value: list of values
+        self.numIteration = 0  # Number of successful iterations
+        self.isConverged = False
+        self._lastEstimateArr = None
+        self._numCheck = 0  # Consecutive checks within tolerance
+
+    @staticmethod
+    def calcEstimates(parameterDct:dict)->np.ndarray:
+        """
+        Calculates the estimates used to check convergence.
+
+        Parameters
+        ----------
+        parameterDct: dict
+            key: parameter name
+            value: list of values
+
+        Returns
+        -------
+        np.ndarray
+            rows are parameters; columns are mean, std, percentiles
+        """
+        estimates = []
+        for values in parameterDct.values():
+            row = [np.mean(values), np.std(values)]
+            row.extend(np.percentile(values, CONVERGENCE_PERCENTILES))
+            estimates.append(row)
+        return np.array(estimates)
+
+    def update(self, bootstrapResult)->bool:
+        """
+        Includes the parameter values of a bootstrap result.
+
+        Parameters
+        ----------
+        bootstrapResult: BootstrapResult
+
+        Returns
+        -------
+        bool
+            estimates have converged
+        """
+        if self.isConverged:
+            return True
+        for name, values in bootstrapResult.parameterDct.items():
+            if name not in self.parameterDct:
+                self.parameterDct[name] = []
+            self.parameterDct[name].extend(values)
+        numIteration = bootstrapResult.numSimulation
+        isCheck = (self.numIteration // self.checkInterval)  \
+              < ((self.numIteration + numIteration) // self.checkInterval)
+        self.numIteration += numIteration
+        if isCheck:
+            estimateArr = self.calcEstimates(self.parameterDct)
+            if self._lastEstimateArr is not None:
+                scaleArr = np.maximum(np.abs(self._lastEstimateArr), MIN_VALUE)
+                changeArr = np.abs(estimateArr - self._lastEstimateArr)/scaleArr
+                if np.max(changeArr) <= self.tolerance:
+                    self._numCheck += 1
+                else:
+                    self._numCheck = 0
+            self._lastEstimateArr = estimateArr
+            self.isConverged = (self._numCheck >= NUM_CONVERGENCE_CHECK)  \
+                  and (self.numIteration >= self.minIteration)
+        return self.isConverged
+
+
 class BootstrapResult(rpickle.RPickler):
 
     def __init__(self, fitter, numIteration: int, parameterDct:dict,
@@ -182,7 +283,9 @@ class BootstrapResult(rpickle.RPickler):
                 self._params.add(name, value=value, min=minValue, max=maxValue)
         return self._params
 
-    def simulate(self, numSample:int=1000, numPoint:int=100)->TimeseriesStatistic:
+    def simulate(self, numSample:int=1000, numPoint:int=100,
+          isParallel:bool=False, maxProcess:int=None,
+          isProgressBar:bool=False)->TimeseriesStatistic:
         """
         Runs a simulation using the parameters from the bootstrap.
 
@@ -190,6 +293,9 @@ class BootstrapResult(rpickle.RPickler):
         ----------
         numSample: number of fitted parameters to sample
         numPoint: number of points in the simulation
+        isParallel: run batches of samples in separate processes
+        maxProcess: maximum number of processes used
+        isProgressBar: display a progress bar for parallel runs
 
         Returns
         -------
@@ -197,21 +303,30 @@ class BootstrapResult(rpickle.RPickler):
         """
         if self.fitter is None:
             raise RuntimeError("Must use setFitter before running simulation.")
-        params_list = self._sampleParams(numSample)
-        fittedTS = self.fitter.simulate(params=params_list[0], numPoint=numPoint)
-        timeseriesStatistic = TimeseriesStatistic(fittedTS,
-              percentiles=PERCENTILES)
-        timeseriesStatistic.accumulate(fittedTS)
-        # Do the simulation
-        for params in params_list[1:]:
-            fittedTS = self.fitter.simulate(params=params, numPoint=numPoint)
-            timeseriesStatistic.accumulate(fittedTS)
+        parameterNames = list(self.parameterDct.keys())
+        parameterArr = self._sampleParams(numSample)
+        if maxProcess is None:
+            maxProcess = multiprocessing.cpu_count()
+        if isParallel:
+            numBatch = min(maxProcess*BATCH_PER_PROCESS, numSample)
+        else:
+            numBatch = 1
+        argumentsList = [SimulationRunnerArgument(self.fitter,
+              parameterNames, arr, numPoint=numPoint,
+              batchSize=SIMULATION_BATCH_SIZE, percentiles=PERCENTILES)
+              for arr in np.array_split(parameterArr, numBatch)]
+        runner = ParallelRunner(SimulationRunner, desc="simulation",
+              maxProcess=maxProcess, isDynamic=True)
+        statistics = runner.runSync(argumentsList, isParallel=isParallel,
+              isProgressBar=isProgressBar)
+        timeseriesStatistic = TimeseriesStatistic.merge(statistics)
         timeseriesStatistic.calculate()
         return timeseriesStatistic
 
-    def _sampleParams(self, numSample:int):
+    def _sampleParams(self, numSample:int)->np.ndarray:
         """
-        Samples the parameters obtained in bootstrapping.
+        Samples with replacement the parameter values obtained in
+        bootstrapping.
 
         Parameters
         ----------
@@ -219,23 +334,13 @@ class BootstrapResult(rpickle.RPickler):
 
         Returns
         -------
-        list-lmfit.Parameters
+        np.ndarray
+            rows are samples; columns are in the order of parameterDct
         """
-        if self.fitter is None:
-            raise RuntimeError("Must use setFitter before running simulation.")
-        df = pd.DataFrame(self.parameterDct)
-        df_sample = df.sample(numSample, replace=True, axis=0)
-        dcts = df_sample.to_dict('records')
-        results = []
-        for dct in dcts:
-            parametersToFit = []
-            for name in dct.keys():
-                value = dct[name]
-                parametersToFit.append(SBstoat.Parameter(name,
-                      lower=value*0.9, value=value, upper=value*1.1))
-            params = self.fitter.mkParams(parametersToFit)
-            results.append(params)
-        return results
+        valueArr = np.array(list(self.parameterDct.values()),
+              dtype=float).T
+        idxs = np.random.randint(0, len(valueArr), numSample)
+        return valueArr[idxs, :]
 
     @classmethod
     def merge(cls, bootstrapResults, fitter=None):
@@ -246,6 +351,7 @@ class BootstrapResult(rpickle.RPickler):
         ---------
         bootstrapResults: list-BootstrapResult
         fitter: ModelFitter
+            if None, the result can be merged again
 
         Return
         ------
@@ -253,25 +359,31 @@ class BootstrapResult(rpickle.RPickler):
         """
         if len(bootstrapResults) == 0:
             raise ValueError("Must provide a non-empty list")
-        parameterDct = {p: [] for p in bootstrapResults[0].parameterDct}
+        parameterDct = {}
         numIteration = sum([r.numIteration for r in bootstrapResults])
         bootstrapError = sum([b.bootstrapError for b in bootstrapResults])
         fittedStatistic = None
+        # Merge the logs
+        logger = Logger.merge([b.logger for b in bootstrapResults])
         if numIteration > 0:
-            # Merge the logs
-            logger = Logger.merge([b.logger for b in bootstrapResults])
             # Merge the statistics for fitted timeseries
             fittedStatistics = [b.fittedStatistic for b in bootstrapResults
                   if b.fittedStatistic is not None]
             fittedStatistic = TimeseriesStatistic.merge(fittedStatistics)
-            # Accumulate the results
+            # Accumulate the results. Unsuccessful results have no parameters.
             for bootstrapResult in bootstrapResults:
-                for parameter in parameterDct.keys():
-                    parameterDct[parameter].extend(
-                          bootstrapResult.parameterDct[parameter])
+                for parameter, values in bootstrapResult.parameterDct.items():
+                    if parameter not in parameterDct:
+                        parameterDct[parameter] = []
+                    parameterDct[parameter].extend(values)
             #
-        fitter.logger = Logger.merge([fitter.logger, logger])
-        bootstrapResult = BootstrapResult(fitter, numIteration, parameterDct,
-              fittedStatistic, bootstrapError=bootstrapError)
-        bootstrapResult.setFitter(fitter)
+        if fitter is None:
+            bootstrapResult = BootstrapResult(None, numIteration, parameterDct,
+                  fittedStatistic, bootstrapError=bootstrapError)
+            bootstrapResult.logger = logger
+        else:
+            fitter.logger = Logger.merge([fitter.logger, logger])
+            bootstrapResult = BootstrapResult(fitter, numIteration,
+                  parameterDct, fittedStatistic, bootstrapError=bootstrapError)
+            bootstrapResult.setFitter(fitter)
         return bootstrapResult
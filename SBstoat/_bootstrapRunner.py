@@ -34,13 +34,30 @@ class RunnerArgument():
                  numIteration:int=10,
                  synthesizerClass=ObservationSynthesizerRandomizedResiduals,
                  _loggerPrefix="",
+                 reservoirSize:int=None,
                  **kwargs: dict):
         # Same the antimony model, not roadrunner bcause of Pickle
-        self.fitter = fitter.copy(isKeepLogger=True)
+        self.fitter = fitter.copy(isKeepLogger=True, isLightweight=True)
         self.numIteration  = numIteration
         self.synthesizerClass = synthesizerClass
         self._loggerPrefix = _loggerPrefix
+        # Maximum fitted timeseries kept for percentiles. None keeps all.
+        self.reservoirSize = reservoirSize
         self.kwargs = kwargs
+        # Initial fit so that runners need not repeat it
+        self.params = None
+        self.fittedTS = None
+        self.residualsTS = None
+        self.redchi = None
+        isSameColumns = self.fitter.selectedColumns == fitter.selectedColumns
+        if (fitter.minimizerResult is not None)  \
+              and (fitter.optimizer is not None) and isSameColumns:
+            # Values of the fit, not of an earlier bootstrap
+            self.params = fitter.optimizer.params.copy()
+            self.fittedTS = fitter.fittedTS.copy()
+            if fitter.residualsTS is not None:
+                self.residualsTS = fitter.residualsTS.copy()
+            self.redchi = fitter.minimizerResult.redchi
 
 
 class BootstrapRunner(AbstractRunner):
@@ -54,6 +71,7 @@ class BootstrapRunner(AbstractRunner):
         Notes
         -----
         1. Uses METHOD_LEASTSQ for fitModel iterations.
+        2. Does an initial fit only if runnerArgument does not have one.
         """
         super().__init__()
         #
@@ -62,11 +80,18 @@ class BootstrapRunner(AbstractRunner):
         self.numIteration = runnerArgument.numIteration
         self.kwargs = runnerArgument.kwargs
         self.synthesizerClass = runnerArgument.synthesizerClass
+        self.reservoirSize = runnerArgument.reservoirSize
         if "logger" in self.fitter.__dict__.keys():
             self.logger = self.fitter.logger
         else:
             self.logger = Logger()
-        self._isDone = not self._fitInitial()
+        self.baseChisq = runnerArgument.redchi
+        if runnerArgument.params is None:
+            self._isInitialFit = self._fitInitial()
+        else:
+            self._useInitialFit(runnerArgument)
+            self._isInitialFit = True
+        self._isDone = not self._isInitialFit
         self.columns = self.fitter.selectedColumns
         # Initializations for bootstrap loop
         if not self.isDone:
@@ -77,14 +102,16 @@ class BootstrapRunner(AbstractRunner):
                   fittedTS=fittedTS,
                   **self.kwargs)
             self.numSuccessIteration = 0
-            if self.fitter.minimizerResult is None:
-                self.fitter.fitModel()
-            self.baseChisq = self.fitter.minimizerResult.redchi
+            if self.baseChisq is None:
+                if self.fitter.minimizerResult is None:
+                    self.fitter.fitModel()
+                self.baseChisq = self.fitter.minimizerResult.redchi
             self.curIteration = 0
             self.fd = self.logger.getFileDescriptor()
             self.baseFittedStatistic = TimeseriesStatistic(
                   self.fitter.observedTS.subsetColumns(
-                  self.fitter.selectedColumns, isCopy=False))
+                  self.fitter.selectedColumns, isCopy=False),
+                  reservoirSize=self.reservoirSize)
 
     def report(self, id=None):
         if True:
@@ -103,6 +130,22 @@ class BootstrapRunner(AbstractRunner):
     def isDone(self):
         return self._isDone
 
+    def restart(self, numIteration):
+        """
+        Prepares to do more bootstrap iterations, reusing the initial fit.
+
+        Parameters
+        ----------
+        numIteration: int
+        """
+        self.numIteration = numIteration
+        if not self._isInitialFit:
+            return
+        self._isDone = False
+        self.numSuccessIteration = 0
+        if (self.fd is None) or self.fd.closed:
+            self.fd = self.logger.getFileDescriptor()
+
     def run(self):
         """
         Runs the bootstrap.
@@ -112,8 +155,7 @@ class BootstrapRunner(AbstractRunner):
         BootstrapResult
         """
         def mkNullResult():
-            fittedStatistic = TimeseriesStatistic(
-                  self.fitter.observedTS[self.fitter.selectedColumns])
+            fittedStatistic = self.baseFittedStatistic.copy()
             return BootstrapResult(self.fitter, 0, {}, fittedStatistic)
         #
         if self.isDone:
@@ -176,6 +218,21 @@ class BootstrapRunner(AbstractRunner):
             self._isDone = True
         return bootstrapResult
 
+    def _useInitialFit(self, runnerArgument):
+        """
+        Uses the initial fit in the argument instead of fitting.
+
+        Parameters
+        ----------
+        runnerArgument: RunnerArgument
+        """
+        # Parameters are those of the initial fit in the argument
+        self.fitter.bootstrapResult = None
+        self.fitter._params = runnerArgument.params.copy()
+        self.fitter.fittedTS = runnerArgument.fittedTS
+        self.fitter.residualsTS = runnerArgument.residualsTS
+        self.fitter.initializeRoadRunnerModel()
+
     def _fitInitial(self):
         """
         Do the initial fit.
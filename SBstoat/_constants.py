@@ -6,6 +6,15 @@ METHOD_BOTH = "both"
 METHOD_LEASTSQ = "leastsq"
 METHOD_FITTER_DEFAULTS = [METHOD_DIFFERENTIAL_EVOLUTION, METHOD_LEASTSQ]
 METHOD_BOOTSTRAP_DEFAULTS = [METHOD_LEASTSQ]
+# Methods that can evaluate a population of parameters in one batch
+METHOD_BATCH = [METHOD_DIFFERENTIAL_EVOLUTION]
+# Methods that choose initial values for restarts
+START_RANDOM = "random"
+START_LATIN_HYPERCUBE = "latin_hypercube"
+START_SOBOL = "sobol"
+START_HALTON = "halton"
+START_METHODS = [START_RANDOM, START_LATIN_HYPERCUBE, START_SOBOL,
+      START_HALTON]
 # Keywords
 MAX_NFEV = "max_nfev"
 MAX_NFEV_DFT = 100
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+ Created on October 18, 2026
+
+Records the evaluations of an objective function in preallocated
+ring buffers. The buffers keep the most recent evaluations so that
+memory does not grow with the number of evaluations. Totals are
+kept for all evaluations.
+
+    Usage
+    -----
+    tracer = EvaluationTracer(names=["k1", "k2"])
+    tracer.record(duration, rssq, values=[1.0, 2.0])
+    durationArr = tracer.getDurations()
+"""
+
+import numpy as np
+
+CAPACITY = 10000  # Number of evaluations kept
+
+
+class EvaluationTracer():
+
+    def __init__(self, capacity:int=CAPACITY, names:list=None):
+        """
+        Parameters
+        ----------
+        capacity: int
+            maximum number of evaluations kept
+        names: list-str
+            names of parameter values recorded. None if no values.
+        """
+        self.capacity = capacity
+        self.names = names
+        if self.names is None:
+            self.names = []
+        self._durationArr = np.zeros(self.capacity)
+        self._rssqArr = np.zeros(self.capacity)
+        self._valueArr = np.zeros((self.capacity, len(self.names)))
+        # Statistics for all evaluations
+        self.numEvaluation = 0
+        self.totalDuration = 0.0
+
+    def record(self, duration:float, rssq:float, values=None):
+        """
+        Records an evaluation.
+
+        Parameters
+        ----------
+        duration: float
+            seconds
+        rssq: float
+            residual sum of squares
+        values: list-float
+            parameter values in the order of names
+        """
+        position = self.numEvaluation % self.capacity
+        self._durationArr[position] = duration
+        self._rssqArr[position] = rssq
+        if (values is not None) and (len(self.names) > 0):
+            self._valueArr[position, :] = values
+        self.numEvaluation += 1
+        self.totalDuration += duration
+
+    def recordBatch(self, durations, rssqs, valueArr=None):
+        """
+        Records evaluations done in a batch.
+
+        Parameters
+        ----------
+        durations: np.ndarray (N)
+        rssqs: np.ndarray (N)
+        valueArr: np.ndarray (N X P)
+            rows are parameter values in the order of names
+        """
+        durations = np.asarray(durations, dtype=float)
+        rssqs = np.asarray(rssqs, dtype=float)
+        # Only the last capacity evaluations are kept
+        numKeep = min(len(rssqs), self.capacity)
+        positions = (self.numEvaluation + len(rssqs) - numKeep
+              + np.arange(numKeep)) % self.capacity
+        self._durationArr[positions] = durations[-numKeep:]
+        self._rssqArr[positions] = rssqs[-numKeep:]
+        if (valueArr is not None) and (len(self.names) > 0):
+            self._valueArr[positions, :] = np.asarray(valueArr)[-numKeep:, :]
+        self.numEvaluation += len(rssqs)
+        self.totalDuration += float(np.sum(durations))
+
+    def _getOrdered(self, arr:np.ndarray)->np.ndarray:
+        """
+        Provides the kept evaluations from oldest to most recent.
+        """
+        if self.numEvaluation <= self.capacity:
+            return arr[:self.numEvaluation].copy()
+        position = self.numEvaluation % self.capacity
+        return np.concatenate([arr[position:], arr[:position]])
+
+    def getDurations(self)->np.ndarray:
+        """
+        Returns
+        -------
+        np.ndarray
+            durations of the kept evaluations, oldest first
+        """
+        return self._getOrdered(self._durationArr)
+
+    def getRssqs(self)->np.ndarray:
+        """
+        Returns
+        -------
+        np.ndarray
+            residual sum of squares of the kept evaluations, oldest first
+        """
+        return self._getOrdered(self._rssqArr)
+
+    def getValues(self)->np.ndarray:
+        """
+        Returns
+        -------
+        np.ndarray (N X P)
+            parameter values of the kept evaluations, oldest first.
+            Columns are in the order of names.
+        """
+        return self._getOrdered(self._valueArr)
+
+    @property
+    def meanDuration(self)->float:
+        """
+        Average duration of all evaluations.
+        """
+        if self.numEvaluation == 0:
+            return np.nan
+        return self.totalDuration/self.numEvaluation
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+ Created on October 18, 2026
+
+Cache of compiled roadrunner models keyed by a hash of the model
+specification. Constructing a roadrunner model from Antimony compiles
+the model, which can take seconds for large models. The cache keeps
+the saved state of a compiled model (roadrunner saveStateS) so
+that new instances are created without compiling.
+
+Saved states are kept in memory for the process and in files in a
+cache directory so that they are shared by processes and sessions.
+Processes created by fork inherit the states in memory. The default
+cache directory is private to the user (mode 0700). Files are only
+used if the directory and the file are owned by the user and cannot
+be changed by other users.
+
+    Usage
+    -----
+    roadrunner = getRoadrunner(antimonyStr)  # A new instance
+    setCacheDirectory(None)  # Disables the files
+"""
+
+import collections
+import hashlib
+import os
+import roadrunner as rr
+import stat
+import tellurium as te
+import tempfile
+
+MAX_CACHED_MODEL = 20  # Maximum number of states kept in memory
+_GETUID = getattr(os, "getuid", None)  # Not available on Windows
+if _GETUID is None:
+    CACHE_DIRECTORY = os.path.join(tempfile.gettempdir(), "SBstoat_models")
+else:
+    CACHE_DIRECTORY = os.path.join(tempfile.gettempdir(),
+          "SBstoat_models_%d" % _GETUID())
+DIRECTORY_MODE = 0o700
+FILE_MODE = 0o600
+STATE_EXTENSION = "rrstate"
+# key: hash of model; value: bytes of roadrunner state
+_STATE_DCT = collections.OrderedDict()
+_cacheDirectory = CACHE_DIRECTORY
+
+
+def setCacheDirectory(directory:str):
+    """
+    Sets the directory in which saved states are kept.
+
+    Parameters
+    ----------
+    directory: str
+        None if saved states are not kept in files
+    """
+    global _cacheDirectory
+    _cacheDirectory = directory
+
+def getCacheDirectory()->str:
+    """
+    Returns
+    -------
+    str (None if saved states are not kept in files)
+    """
+    return _cacheDirectory
+
+def clearCache(isFiles:bool=False):
+    """
+    Removes saved states from memory and optionally from files.
+
+    Parameters
+    ----------
+    isFiles: bool
+        remove the files in the cache directory
+    """
+    _STATE_DCT.clear()
+    if isFiles and (_cacheDirectory is not None)  \
+          and os.path.isdir(_cacheDirectory):
+        for ffile in os.listdir(_cacheDirectory):
+            if ffile.endswith(STATE_EXTENSION):
+                os.remove(os.path.join(_cacheDirectory, ffile))
+
+def mkKey(antimonyStr:str)->str:
+    """
+    Constructs the key for a model. Saved states depend on the version
+    of roadrunner.
+
+    Parameters
+    ----------
+    antimonyStr: str
+
+    Returns
+    -------
+    str
+    """
+    hasher = hashlib.sha256()
+    hasher.update(rr.__version__.encode())
+    hasher.update(antimonyStr.encode())
+    return hasher.hexdigest()
+
+def _isOwned(path:str)->bool:
+    """
+    Checks that a file or directory is owned by the user and cannot be
+    changed by other users.
+    """
+    if _GETUID is None:
+        # The temporary directory is private to the user on Windows
+        return True
+    try:
+        status = os.lstat(path)
+    except OSError:
+        return False
+    if status.st_uid != _GETUID():
+        return False
+    isKind = stat.S_ISDIR(status.st_mode) or stat.S_ISREG(status.st_mode)
+    return isKind and ((status.st_mode & 0o022) == 0)
+
+def _getPath(key:str)->str:
+    if _cacheDirectory is None:
+        return None
+    return os.path.join(_cacheDirectory, "%s.%s" % (key, STATE_EXTENSION))
+
+def _readState(key:str)->bytes:
+    """
+    Obtains the saved state from a file.
+
+    Returns
+    -------
+    bytes (None if there is no file)
+    """
+    path = _getPath(key)
+    if (path is None) or (not os.path.isfile(path)):
+        return None
+    # States are only loaded from files that other users cannot change
+    if (not _isOwned(_cacheDirectory)) or (not _isOwned(path)):
+        return None
+    with open(path, "rb") as fd:
+        return fd.read()
+
+def _writeState(key:str, state:bytes):
+    """
+    Saves the state in a file. The file is renamed into place so that
+    other processes never read a partial file.
+    """
+    path = _getPath(key)
+    if path is None:
+        return
+    try:
+        os.makedirs(_cacheDirectory, mode=DIRECTORY_MODE, exist_ok=True)
+        if not _isOwned(_cacheDirectory):
+            return
+        tmpPath = "%s.%d" % (path, os.getpid())
+        fileDescriptor = os.open(tmpPath,
+              os.O_WRONLY | os.O_CREAT | os.O_TRUNC, FILE_MODE)
+        with os.fdopen(fileDescriptor, "wb") as fd:
+            fd.write(state)
+        os.replace(tmpPath, path)
+    except OSError:
+        # The cache is an optimization
+        pass
+
+def _putState(key:str, state:bytes):
+    _STATE_DCT[key] = state
+    _STATE_DCT.move_to_end(key)
+    if len(_STATE_DCT) > MAX_CACHED_MODEL:
+        _ = _STATE_DCT.popitem(last=False)
+
+def _loadState(state:bytes):
+    """
+    Creates a roadrunner model from a saved state.
+
+    Returns
+    -------
+    ExtendedRoadRunner
+    """
+    roadrunner = te.roadrunner.ExtendedRoadRunner()
+    roadrunner.loadStateS(state)
+    return roadrunner
+
+def getRoadrunner(antimonyStr:str):
+    """
+    Provides a new roadrunner instance for the model, compiling it only
+    if it is not in the cache.
+
+    Parameters
+    ----------
+    antimonyStr: str
+
+    Returns
+    -------
+    ExtendedRoadRunner
+    """
+    key = mkKey(antimonyStr)
+    state = _STATE_DCT.get(key, None)
+    if state is None:
+        state = _readState(key)
+    if state is not None:
+        try:
+            roadrunner = _loadState(state)
+            _putState(key, state)
+            return roadrunner
+        except Exception:
+            # Saved state is not usable
+            _ = _STATE_DCT.pop(key, None)
+    roadrunner = te.loada(antimonyStr)
+    state = roadrunner.saveStateS()
+    _putState(key, state)
+    _writeState(key, state)
+    return roadrunner
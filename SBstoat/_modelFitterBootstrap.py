@@ -13,12 +13,15 @@ Several considerations are made;
 """
 
 from SBstoat._bootstrapRunner import BootstrapRunner, RunnerArgument
-from SBstoat._bootstrapResult import BootstrapResult
+from SBstoat._bootstrapResult import BootstrapResult, BootstrapConvergence
 from SBstoat import _modelFitterCrossValidator as mfc
-from SBstoat._parallelRunner import ParallelRunner
+from SBstoat._parallelRunner import ParallelRunner, RunnerPool
 from SBstoat import _helpers
 
+import atexit
+import hashlib
 import multiprocessing
+import numpy as np
 import time
 import typing
 
@@ -27,8 +30,48 @@ PERCENTILES = [2.5, 97.55]  # Percentile for confidence limits
 IS_REPORT = True
 ITERATION_MULTIPLIER = 10  # Multiplier to calculate max bootsrap iterations
 ITERATION_PER_PROCESS = 5  # Numer of iterations handled by a process
+BATCH_PER_PROCESS = 2  # Batches of iterations per process for load balancing
+MERGE_SIZE = 100  # Number of bootstrap results merged at once
 MAX_TRIES = 10  # Maximum number of tries to fit
 MAX_ITERATION_TIME = 10.0
+_BOOTSTRAP_POOL = None  # RunnerPool shared by fitters
+
+
+def getBootstrapPool(numProcess):
+    """
+    Provides the RunnerPool used by bootstrap. The pool is kept
+    between calls so that its processes keep their models and initial fits.
+
+    Parameters
+    ----------
+    numProcess: int
+        number of processes required
+
+    Returns
+    -------
+    RunnerPool
+    """
+    global _BOOTSTRAP_POOL
+    numProcess = min(numProcess, multiprocessing.cpu_count())
+    if _BOOTSTRAP_POOL is not None:
+        if (not _BOOTSTRAP_POOL.isAlive)  \
+              or (_BOOTSTRAP_POOL.maxProcess < numProcess):
+            closeBootstrapPool()
+    if _BOOTSTRAP_POOL is None:
+        _BOOTSTRAP_POOL = RunnerPool(BootstrapRunner, maxProcess=numProcess,
+              desc="iteration")
+    return _BOOTSTRAP_POOL
+
+def closeBootstrapPool():
+    """
+    Ends the processes of the bootstrap RunnerPool.
+    """
+    global _BOOTSTRAP_POOL
+    if _BOOTSTRAP_POOL is not None:
+        _BOOTSTRAP_POOL.close()
+        _BOOTSTRAP_POOL = None
+
+atexit.register(closeBootstrapPool)
 
 
 class ModelFitterBootstrap(mfc.ModelFitterCrossValidator):
@@ -38,6 +81,9 @@ class ModelFitterBootstrap(mfc.ModelFitterCrossValidator):
           numIteration:int=None,
           maxProcess:int=None,
           serializePath:str=None,
+          convergenceTolerance:float=None,
+          isDynamic:bool=None,
+          reservoirSize:int=None,
           **kwargs: dict):
         """
         Constructs a bootstrap estimate of parameter values.
@@ -49,6 +95,19 @@ class ModelFitterBootstrap(mfc.ModelFitterCrossValidator):
         numIteration: number of bootstrap iterations
         maxProcess: Maximum number of processes to use. Default: numCPU
         serializePath: Where to serialize the fitter after bootstrap
+        convergenceTolerance: float
+            stop before numIteration once the relative change in the means,
+            stds, and percentiles of parameters is within this tolerance.
+            Not used with a persistent pool since its results are
+            available only after all iterations complete. Uses the
+            dynamic scheduler.
+        isDynamic: bool
+            run smaller batches of iterations that are balanced among
+            the processes by the dynamic scheduler
+        reservoirSize: int
+            maximum number of fitted timeseries kept by each batch for
+            percentiles, a uniform random sample of them. By default,
+            all are kept and percentiles are exact.
         kwargs: arguments passed to ObservationSynthesizer
 
         Example
@@ -78,34 +137,108 @@ class ModelFitterBootstrap(mfc.ModelFitterCrossValidator):
         numIteration = getValue("numIteration", numIteration)
         isParallel = getValue("_isParallel", isParallel)
         isProgressBar = getValue("_isProgressBar", None, defaultValue=True)
+        isPersistentPool = getValue("_isPersistentPool", None,
+              defaultValue=False)
         if maxProcess is None:
             maxProcess = self._maxProcess
         if maxProcess is None:
             maxProcess = multiprocessing.cpu_count()
         serializePath = getValue("serializePath", serializePath)
+        convergenceTolerance = getValue("convergenceTolerance",
+              convergenceTolerance)
+        isDynamic = getValue("isDynamic", isDynamic, defaultValue=False)
+        reservoirSize = getValue("reservoirSize", reservoirSize)
+        convergence = None
+        if convergenceTolerance is not None:
+            convergence = BootstrapConvergence(convergenceTolerance)
+            # Results are used as they complete
+            isDynamic = True
         # Ensure that there is a fitted model
         if self.minimizerResult is None:
             self.fitModel()
         # Construct arguments collection
         numProcess = min(maxProcess, numIteration)
         batchSize = numIteration // numProcess
-        argumentsCol = [RunnerArgument(self,
-              numIteration=batchSize,
-              _loggerPrefix="bootstrap",
-              **kwargs) for i in range(numProcess)]
-        # Run separate processes for each batch
-        runner = ParallelRunner(BootstrapRunner,
-              desc="iteration", maxProcess=numProcess)
-        results = runner.runSync(argumentsCol, isParallel=isParallel,
-            isProgressBar=isProgressBar)
+        if isParallel and isPersistentPool:
+            # Reuse processes that have the model and initial fit
+            if convergence is not None:
+                self.logger.activity(
+                      "convergenceTolerance is not used with a persistent pool.")
+                convergence = None
+            pool = getBootstrapPool(numProcess)
+            keyKwargs = dict(kwargs)
+            if reservoirSize is not None:
+                keyKwargs["reservoirSize"] = reservoirSize
+            mkArgument = lambda: RunnerArgument(self,
+                  numIteration=batchSize,
+                  _loggerPrefix="bootstrap",
+                  reservoirSize=reservoirSize,
+                  **kwargs)
+            resultsList = pool.runSync(self._mkBootstrapKey(keyKwargs),
+                  mkArgument, numProcess*batchSize, numProcess=numProcess,
+                  isProgressBar=isProgressBar)
+            results = (r for r in resultsList)
+            runner = None
+        elif not isDynamic:
+            argumentsCol = [RunnerArgument(self,
+                  numIteration=batchSize,
+                  _loggerPrefix="bootstrap",
+                  reservoirSize=reservoirSize,
+                  **kwargs) for _ in range(numProcess)]
+            # Run separate processes for each batch
+            runner = ParallelRunner(BootstrapRunner,
+                  desc="iteration", maxProcess=numProcess)
+            resultsList = runner.runSync(argumentsCol, isParallel=isParallel,
+                isProgressBar=isProgressBar)
+            results = (r for r in resultsList)
+        else:
+            # Smaller batches are balanced among the processes
+            numBatch = min(numProcess*BATCH_PER_PROCESS, numProcess*batchSize)
+            batchSizes = [len(a) for a in
+                  np.array_split(range(numProcess*batchSize), numBatch)]
+            argumentsCol = [RunnerArgument(self,
+                  numIteration=s,
+                  _loggerPrefix="bootstrap",
+                  reservoirSize=reservoirSize,
+                  **kwargs) for s in batchSizes]
+            # Run separate processes for each batch
+            runner = ParallelRunner(BootstrapRunner,
+                  desc="iteration", maxProcess=numProcess, isDynamic=True)
+            results = runner.runStream(argumentsCol, isParallel=isParallel,
+                isProgressBar=isProgressBar)
+        # Merge results as they complete
+        numResult = 0
+        mergeResults = []
+        for result in results:
+            numResult += 1
+            mergeResults.append(result)
+            if len(mergeResults) >= MERGE_SIZE:
+                mergeResults = [BootstrapResult.merge(mergeResults)]
+            if convergence is not None:
+                if convergence.update(result):
+                    # Stops the remaining iterations
+                    results.close()
+                    break
+        if (runner is not None) and (len(runner.abandonedIdxs) > 0):
+            self.logger.exception(
+                  "Bootstrap batches %s were abandoned: %s"
+                  % (str(runner.abandonedIdxs), str(runner.errorDct)))
+        if convergence is not None:
+            if convergence.isConverged:
+                msg = "Bootstrap converged after %d iterations."  \
+                      % convergence.numIteration
+            else:
+                msg = "Bootstrap did not converge in %d iterations."  \
+                      % convergence.numIteration
+            self.logger.result(msg)
         # Check the results
-        if len(results) == 0:
+        if numResult == 0:
             msg = "modelFitterBootstrap/timeout in solving model."
             msg = "\nConsider increasing per timeout."
             msg = "\nCurent value: %f" % MAX_ITERATION_TIME
             self.logger.result(msg)
         else:
-            self.bootstrapResult = BootstrapResult.merge(results, self)
+            self.bootstrapResult = BootstrapResult.merge(mergeResults, self)
             # Update the logger in place
             _ = _helpers.copyObject(self.bootstrapResult.fitter.logger,
                   self.logger)
@@ -115,6 +248,41 @@ class ModelFitterBootstrap(mfc.ModelFitterCrossValidator):
             if serializePath is not None:
                 self.serialize(serializePath)
 
+    def _mkBootstrapKey(self, kwargs):
+        """
+        Constructs a key that identifies the model, data, fitted
+        parameters, and options used by the bootstrap processes.
+        Results of earlier bootstraps are not part of the key so that
+        repeated bootstraps reuse the processes.
+
+        Parameters
+        ----------
+        kwargs: dict
+            arguments passed to ObservationSynthesizer
+
+        Returns
+        -------
+        str
+        """
+        if isinstance(self.modelSpecification, str):
+            modelStr = self.modelSpecification
+        else:
+            modelStr = self.modelSpecification.getAntimony()
+        parameterStrs = []  # Processes do the initial fit
+        if self.optimizer is not None:
+            parameterStrs = ["%s %s %s %s" % (p.name, str(p.value),
+                  str(p.min), str(p.max))
+                  for p in self.optimizer.params.values()]
+        descriptions = [self.__class__.__name__, modelStr,
+              str(self.observedTS.colnames), str(self.selectedColumns),
+              str(parameterStrs), str(self._bootstrapMethods),
+              str(sorted(kwargs.items()))]
+        hasher = hashlib.sha256()
+        for description in descriptions:
+            hasher.update(description.encode())
+        hasher.update(self.observedTS.values.tobytes())
+        return hasher.hexdigest()
+
     def getParameterMeans(self)->typing.List[float]:
         """
         Returns a list of values mean values of parameters from bootstrap.
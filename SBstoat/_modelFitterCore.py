@@ -10,15 +10,19 @@ import SBstoat
 from SBstoat._parameterManager import Parameter
 import SBstoat._constants as cn
 from SBstoat._optimizer import Optimizer
+from SBstoat._parameterBinding import ParameterBinding
+from SBstoat._sharedArray import SharedArray
 from SBstoat.namedTimeseries import NamedTimeseries, TIME, mkNamedTimeseries
 from SBstoat.logs import Logger
 import SBstoat.timeseriesPlotter as tp
 from SBstoat import rpickle
 from SBstoat import _helpers
+from SBstoat import _modelCache
 
 import copy
 import inspect
 import lmfit
+import multiprocessing
 import numpy as np
 import tellurium as te
 import typing
@@ -27,7 +31,52 @@ import typing
 MAX_CHISQ_MULT = 5
 PERCENTILES = [2.5, 97.55]  # Percentile for confidence limits
 LARGE_RESIDUAL = 1000000
-
+_BATCH_FITTER = None  # Fitter used by a process of the residuals pool
+# Attributes set on construction that lightweight copies share
+LIGHTWEIGHT_ATTRIBUTES = ["_numIteration", "_serializePath", "_loggerPrefix",
+      "modelSpecification", "parametersToFit", "parameterLowerBound",
+      "parameterUpperBound", "_maxProcess", "_isOutputTimes",
+      "_isBatchResiduals", "_isPersistentPool",
+      "_isParallelRestart", "_targetRssq", "_restartMethod",
+      "_numRestartCandidate", "_numFitRepeat", "_observedArr", "_outputTimes",
+      "_outputIdxs", "_isObservedNan", "numPoint", "endTime",
+      "_fitterMethods", "_bootstrapMethods", "_isPlot", "_plotter",
+      "logger", "_numRestart", "_isParallel", "_isProgressBar",
+      "_selectedIdxs"]
+
+
+##################### FUNCTIONS #########################
+def _initializeBatchProcess(fitter):
+    """
+    Initializes a process in the residuals pool with its own roadrunner model.
+
+    Parameters
+    ----------
+    fitter: ModelFitterCore
+    """
+    global _BATCH_FITTER
+    _BATCH_FITTER = fitter
+    _BATCH_FITTER.initializeRoadRunnerModel()
+
+def _calcBatchResiduals(arguments):
+    """
+    Calculates residuals in a process of the residuals pool.
+
+    Parameters
+    ----------
+    arguments: tuple
+        np.ndarray (N X P): parameter values
+        list-str: parameter names
+
+    Returns
+    -------
+    np.ndarray (N X R)
+    """
+    paramArr, names = arguments
+    return _BATCH_FITTER._calcResidualsMatrix(paramArr, names)
+
+
+##################### CLASSES #########################
 
 class ModelFitterCore(rpickle.RPickler):
 
@@ -51,6 +100,13 @@ class ModelFitterCore(rpickle.RPickler):
           serializePath:str=None,
           isParallel=True,
           isProgressBar=True,
+          isOutputTimes=False,
+          isBatchResiduals=False,
+          isPersistentPool=False,
+          isParallelRestart=False,
+          targetRssq=None,
+          restartMethod=cn.START_RANDOM,
+          numRestartCandidate=None,
           ):
         """
         Constructs estimates of parameter values.
@@ -92,6 +148,28 @@ class ModelFitterCore(rpickle.RPickler):
             run in parallel where possible
         isProgressBar: bool
             display the progress bar
+        isOutputTimes: bool
+            simulate only at the times in observedData instead of
+            a grid of numPoint points
+        isBatchResiduals: bool
+            fitModel evaluates populations of parameters (e.g.,
+            differential_evolution) and the finite differences of
+            leastsq in batches on a pool of processes
+        isPersistentPool: bool
+            bootstrap uses long-lived processes that keep models and
+            initial fits across calls
+        isParallelRestart: bool
+            fitModel runs the initial fit and the numRestart restarts
+            concurrently in processes
+        targetRssq: float
+            fitModel does no more restarts once a fit has a residual
+            sum of squares no larger than this
+        restartMethod: str
+            how initial values of restarts are chosen (cn.START_METHODS).
+            Values are reproducible with np.random.seed.
+        numRestartCandidate: int
+            number of initial values evaluated to choose the numRestart
+            with the smallest residual sum of squares
 
         Usage
         -----
@@ -114,6 +192,13 @@ class ModelFitterCore(rpickle.RPickler):
             self.parameterLowerBound = parameterLowerBound
             self.parameterUpperBound = parameterUpperBound
             self._maxProcess = maxProcess
+            self._isOutputTimes = isOutputTimes
+            self._isBatchResiduals = isBatchResiduals
+            self._isPersistentPool = isPersistentPool
+            self._isParallelRestart = isParallelRestart
+            self._targetRssq = targetRssq
+            self._restartMethod = restartMethod
+            self._numRestartCandidate = numRestartCandidate
             self.bootstrapKwargs = dict(
                   numIteration=numIteration,
                   serializePath=serializePath,
@@ -146,6 +231,10 @@ class ModelFitterCore(rpickle.RPickler):
             self._isParallel = isParallel
             self._isProgressBar = isProgressBar
             self._selectedIdxs = None
+            self._residualsPool = None  # Processes for calcResidualsBatch
+            self._parameterBinding = None  # Setters for roadrunnerModel
+            self._isSensitivity = None  # Sensitivities apply to the fit
+            self._antimonySpecification = None  # Conversion for copies
             self._params = self.mkParams()
             # The following are calculated during fitting
             self.roadrunnerModel = None
@@ -159,7 +248,8 @@ class ModelFitterCore(rpickle.RPickler):
         else:
             pass
 
-    def copy(self, isKeepLogger=False, isKeepOptimizer=False, **kwargs):
+    def copy(self, isKeepLogger=False, isKeepOptimizer=False,
+          isLightweight=False, **kwargs):
         """
         Creates a copy of the model fitter, overridding any argument
         that is not None.
@@ -170,6 +260,9 @@ class ModelFitterCore(rpickle.RPickler):
         ----------
         isKeepLogger: bool
         isKeepOptimizer: bool
+        isLightweight: bool
+            share the model specification and observed data instead of
+            constructing a new fitter. Applies if there are no kwargs.
         kwargs: dict
             arguments to override in copy
         
@@ -177,6 +270,9 @@ class ModelFitterCore(rpickle.RPickler):
         -------
         ModelFitter
         """
+        if isLightweight and (len(kwargs) == 0):
+            return self._copyLightweight(isKeepLogger=isKeepLogger,
+                  isKeepOptimizer=isKeepOptimizer)
         def setValues(names):
             """
             Sets the value for a list of names.
@@ -247,8 +343,108 @@ class ModelFitterCore(rpickle.RPickler):
         if self.bootstrapResult is not None:
             newModelFitter.bootstrapResult = self.bootstrapResult.copy()
         return newModelFitter
+
+    def _getAntimonySpecification(self)->tuple:
+        """
+        Converts a roadrunner model specification to antimony. The
+        conversion is done once for the observed data.
+
+        Returns
+        -------
+        str: antimony model
+        NamedTimeseries: observedTS with names in the antimony model
+        list-str: selectedColumns with names in the antimony model
+        """
+        cache = self.__dict__.get("_antimonySpecification", None)
+        if (cache is None) or (cache[0] is not self.observedTS)  \
+              or (cache[1] != self.selectedColumns):
+            try:
+                modelSpecification = self.modelSpecification.getAntimony()
+                observedTS, selectedColumns = self._adjustNames(
+                      modelSpecification, self.observedTS)
+            except Exception as err:
+                self.logger.error("Problem wth conversion to Antimony. Details:",
+                      err)
+                raise ValueError("Cannot proceed.")
+            cache = (self.observedTS, list(self.selectedColumns),
+                  modelSpecification, observedTS, selectedColumns)
+            self._antimonySpecification = cache
+        return cache[2:]
+
+    def _copyLightweight(self, isKeepLogger=False, isKeepOptimizer=False):
+        """
+        Creates a copy of the model fitter in the state after construction.
+        The copy shares with this fitter the values in LIGHTWEIGHT_ATTRIBUTES,
+        which do not change after construction (e.g., model specification).
+        Observed data in shared memory are attached by the copy, which
+        does not own them. The roadrunner model is created when the copy
+        first simulates. A roadrunner model specification is converted
+        to antimony once, and the copies share the antimony model.
+
+        Parameters
+        ----------
+        isKeepLogger: bool
+        isKeepOptimizer: bool
+
+        Returns
+        -------
+        ModelFitter
+        """
+        newModelFitter = self.__class__.__new__(self.__class__)
+        for name in LIGHTWEIGHT_ATTRIBUTES:
+            if name in self.__dict__.keys():
+                newModelFitter.__dict__[name] = self.__dict__[name]
+        if not isKeepLogger:
+            newModelFitter.logger = Logger()
+        newModelFitter.selectedColumns = list(self.selectedColumns)
+        # Copies do not own the shared memory of this fitter
+        if self.observedTS.isShared:
+            newModelFitter.observedTS = self.observedTS.attach()
+        else:
+            newModelFitter.observedTS = self.observedTS.copy()
+        newModelFitter.observedData = newModelFitter.observedTS
+        newModelFitter._sharedObservedArr = None
+        if self._isObservedArrShared():
+            newModelFitter._sharedObservedArr = self._sharedObservedArr.attach()
+            newModelFitter._observedArr = newModelFitter._sharedObservedArr.array
+        newModelFitter._antimonySpecification = None
+        if not isinstance(self.modelSpecification, str):
+            modelSpecification, observedTS, selectedColumns  \
+                  = self._getAntimonySpecification()
+            newModelFitter.modelSpecification = modelSpecification
+            if observedTS is not self.observedTS:
+                # Names changed in the antimony export
+                newModelFitter._sharedObservedArr = None
+                newModelFitter.selectedColumns = list(selectedColumns)
+                _ = newModelFitter._updateObservedTS(observedTS.copy(),
+                      isCheck=False)
+                newModelFitter.observedData = newModelFitter.observedTS
+        newModelFitter.bootstrapKwargs = dict(self.bootstrapKwargs)
+        # State that is not shared
+        newModelFitter._residualsPool = None
+        newModelFitter._parameterBinding = None
+        newModelFitter._isSensitivity = None
+        newModelFitter._params = None  # Constructed when used
+        newModelFitter.roadrunnerModel = None
+        newModelFitter.minimizerResult = None
+        newModelFitter.fittedTS = newModelFitter.observedTS.copy(
+              isInitialize=True)
+        newModelFitter.residualsTS = None
+        newModelFitter.bootstrapResult = None
+        newModelFitter.optimizer = None
+        newModelFitter.suiteFitterParams = None
+        if self.optimizer is not None:
+            if isKeepOptimizer:
+                newModelFitter.optimizer = self.optimizer.copyResults()
+        if self.bootstrapResult is not None:
+            newModelFitter.bootstrapResult = self.bootstrapResult.copy()
+        return newModelFitter
  
     def _updateSelectedIdxs(self):
+        if self._isOutputTimes:
+            # Simulation rows correspond to self._outputTimes
+            self._selectedIdxs = self._outputIdxs
+            return
         resultTS = self.simulate()
         if resultTS is not None:
             self._selectedIdxs =  \
@@ -291,8 +487,13 @@ class ModelFitterCore(rpickle.RPickler):
             self.selectedColumns = self.observedTS.colnames
         if self.observedTS is None:
             self._observedArr = None
+            self._outputTimes = None
+            self._outputIdxs = None
         else:
             self._observedArr = self.observedTS[self.selectedColumns].flatten()
+            # Distinct, increasing times for simulations in output times mode
+            self._outputTimes, self._outputIdxs = np.unique(
+                  self.observedTS[TIME], return_inverse=True)
         #
         return self.observedTS, self.selectedColumns
 
@@ -310,6 +511,8 @@ class ModelFitterCore(rpickle.RPickler):
             if self.optimizer is not None:
                 params = self.optimizer.params
             else:
+                if self._params is None:
+                    self._params = self.mkParams()
                 params = self._params
         return params
 
@@ -400,7 +603,8 @@ class ModelFitterCore(rpickle.RPickler):
               te.roadrunner.extended_roadrunner.ExtendedRoadRunner):
             roadrunnerModel = modelSpecification
         elif isinstance(modelSpecification, str):
-            roadrunnerModel = te.loada(modelSpecification)
+            # Avoid compiling a model that has been compiled
+            roadrunnerModel = _modelCache.getRoadrunner(modelSpecification)
         else:
             msg = 'Invalid model.'
             msg = msg + "\nA model must either be a Roadrunner model "
@@ -409,20 +613,34 @@ class ModelFitterCore(rpickle.RPickler):
         return roadrunnerModel
 
     @classmethod
-    def setupModel(cls, roadrunner, parameters, logger=Logger()):
+    def setupModel(cls, roadrunner, parameters, logger=Logger(),
+          binding=None):
         """
         Sets up the model for use based on the parameter parameters
 
         Parameters
         ----------
         roadrunner: ExtendedRoadRunner
-        parameters: lmfit.Parameters
+        parameters: lmfit.Parameters/dict/pd.Series/np.ndarray
+            parameters or a mapping from parameter name to value.
+            np.ndarray is values in the order of binding.names.
         logger Logger
+        binding: ParameterBinding
+            setters for roadrunner
         """
-        pp = parameters.valuesdict()
-        for parameter in pp.keys():
+        if binding is not None:
+            if isinstance(parameters, np.ndarray):
+                binding.setValues(parameters)
+            else:
+                binding.setValues(binding.getValues(parameters))
+            return
+        if isinstance(parameters, lmfit.Parameters):
+            pp = parameters.valuesdict()
+        else:
+            pp = parameters
+        for parameter, value in pp.items():
             try:
-                roadrunner.model[parameter] = pp[parameter]
+                roadrunner.model[parameter] = value
             except Exception as err:
                 msg = "_modelFitterCore.setupModel: Could not set value for %s"  \
                       % parameter
@@ -460,8 +678,10 @@ class ModelFitterCore(rpickle.RPickler):
           endTime=5,
           numPoint=30,
           selectedColumns=None,
+          times=None,
           _logger=Logger(),
           _loggerPrefix="",
+          _binding=None,
           ):
         """
         Runs a simulation. Defaults to parameter values in the simulation.
@@ -471,8 +691,8 @@ class ModelFitterCore(rpickle.RPickler):
        ----------
         modelSpecification: ExtendedRoadRunner/str
             Roadrunner model
-        parameters: lmfit.Parameters
-            lmfit parameters
+        parameters: lmfit.Parameters/dict/pd.Series
+            lmfit parameters or a mapping from parameter name to value
         startTime: float
             start time for the simulation
         endTime: float
@@ -481,8 +701,13 @@ class ModelFitterCore(rpickle.RPickler):
             number of points in the simulation
         selectedColumns: list-str
             output columns in simulation
+        times: list-float
+            increasing times at which output is produced. Overrides
+            startTime, endTime, numPoint.
         _logger: Logger
         _loggerPrefix: str
+        _binding: ParameterBinding
+            setters for modelSpecification if it is a roadrunner model
 
 
         Return
@@ -496,21 +721,30 @@ class ModelFitterCore(rpickle.RPickler):
             roadrunnerModel.reset()
         if parameters is not None:
             # Parameters have been specified
-            cls.setupModel(roadrunnerModel, parameters, logger=_logger)
+            cls.setupModel(roadrunnerModel, parameters, logger=_logger,
+                  binding=_binding)
         # Do the simulation
         if selectedColumns is not None:
             newSelectedColumns = list(selectedColumns)
             if TIME not in newSelectedColumns:
                 newSelectedColumns.insert(0, TIME)
             try:
-                dataArr = roadrunnerModel.simulate(startTime, endTime, numPoint,
-                      newSelectedColumns)
+                if times is None:
+                    dataArr = roadrunnerModel.simulate(startTime, endTime,
+                          numPoint, newSelectedColumns)
+                else:
+                    dataArr = roadrunnerModel.simulate(
+                          selections=newSelectedColumns, times=list(times))
             except Exception as err:
                 _logger.error("Roadrunner exception: ", err)
                 dataArr = None
         else:
             try:
-                dataArr = roadrunnerModel.simulate(startTime, endTime, numPoint)
+                if times is None:
+                    dataArr = roadrunnerModel.simulate(startTime, endTime,
+                          numPoint)
+                else:
+                    dataArr = roadrunnerModel.simulate(times=list(times))
             except Exception as err:
                 _logger.exception("Roadrunner exception: %s" % err)
                 dataArr = None
@@ -534,6 +768,27 @@ class ModelFitterCore(rpickle.RPickler):
         """
         if "logger" not in self.__dict__.keys():
             self.logger = Logger()
+        if "_isOutputTimes" not in self.__dict__.keys():
+            self._isOutputTimes = False
+        if "_isBatchResiduals" not in self.__dict__.keys():
+            self._isBatchResiduals = False
+        if "_isPersistentPool" not in self.__dict__.keys():
+            self._isPersistentPool = False
+        if ("_observedArr" in self.__dict__.keys())  \
+              and (not self._isObservedArrShared()):
+            # Shared memory is not available after deserialization
+            self._sharedObservedArr = None
+        if "_isParallelRestart" not in self.__dict__.keys():
+            self._isParallelRestart = False
+        if "_targetRssq" not in self.__dict__.keys():
+            self._targetRssq = None
+        if "_restartMethod" not in self.__dict__.keys():
+            self._restartMethod = cn.START_RANDOM
+        if "_numRestartCandidate" not in self.__dict__.keys():
+            self._numRestartCandidate = None
+        self._residualsPool = None
+        self._parameterBinding = None
+        self._isSensitivity = None
 
     def _adjustNames(self, antimonyModel:str, observedTS:NamedTimeseries)  \
           ->typing.Tuple[NamedTimeseries, list]:
@@ -547,7 +802,7 @@ class ModelFitterCore(rpickle.RPickler):
         NamedTimeseries: newObservedTS
         list: newSelectedColumns
         """
-        rr = te.loada(antimonyModel)
+        rr = _modelCache.getRoadrunner(antimonyModel)
         dataNames = rr.simulate().colnames
         names = ["[%s]" % n for n in observedTS.colnames]
         missingNames = [n[1:-1] for n in set(names).difference(dataNames)]
@@ -571,8 +826,77 @@ class ModelFitterCore(rpickle.RPickler):
         Cleans the object so that it can be pickled.
         """
         self.roadrunnerModel = None
+        self._parameterBinding = None
+        self._isSensitivity = None
+        self.closeResidualsPool()
+        return self
+
+    def _isObservedArrShared(self)->bool:
+        sharedArray = self.__dict__.get("_sharedObservedArr", None)
+        return (sharedArray is not None)  \
+              and (sharedArray.array is not None)  \
+              and (self._observedArr is sharedArray.array)
+
+    def shareObservedData(self):
+        """
+        Puts observedTS and the flattened observed values used by
+        calcResiduals in shared memory. Processes that receive a pickled
+        copy of the fitter attach to these values instead of copying
+        them. Data that are changed afterwards (e.g., by bootstrap)
+        are not shared. Deep copies are not shared. Lightweight copies
+        attach to the shared memory, and only this fitter removes it.
+
+        Sharing is opt-in. ParallelRunner, RunnerPool, ServerManager,
+        and FitterRunner send fitters as they are, so callers share
+        the data before fitters are passed to them.
+
+        Returns
+        -------
+        ModelFitterCore
+        """
+        self.observedTS.share()
+        if not self._isObservedArrShared():
+            self._sharedObservedArr = SharedArray(self._observedArr)
+            self._observedArr = self._sharedObservedArr.array
         return self
 
+    def unshareObservedData(self):
+        """
+        Moves observed data from shared memory to memory of this process.
+        """
+        self.observedTS.unshare()
+        if self._isObservedArrShared():
+            self._observedArr = np.array(self._observedArr)
+            self._sharedObservedArr.unlink()
+        self._sharedObservedArr = None
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        if self._isObservedArrShared():
+            # Attached on unpickling
+            del state["_observedArr"]
+        else:
+            state.pop("_sharedObservedArr", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if "_observedArr" not in self.__dict__.keys():
+            self._observedArr = self._sharedObservedArr.array
+
+    def __deepcopy__(self, memo):
+        # Copies do not depend on the shared memory of this fitter
+        newFitter = self.__class__.__new__(self.__class__)
+        memo[id(self)] = newFitter
+        for key, value in self.__dict__.items():
+            if key == "_sharedObservedArr":
+                newFitter.__dict__[key] = None
+            elif key == "_observedArr" and self._isObservedArrShared():
+                newFitter.__dict__[key] = np.array(value)
+            else:
+                newFitter.__dict__[key] = copy.deepcopy(value, memo)
+        return newFitter
+
     def initializeRoadRunnerModel(self):
         """
         Sets self.roadrunnerModel.
@@ -602,10 +926,11 @@ class ModelFitterCore(rpickle.RPickler):
 
         Parameters
        ----------
-        params: lmfit.Parameters
+        params: lmfit.Parameters/dict
         startTime: float
         endTime: float
         numPoint: int
+        times: list-float
 
         Return
         ------
@@ -614,16 +939,20 @@ class ModelFitterCore(rpickle.RPickler):
         fixedArr = self._simulateNumpy(**kwargs)
         return NamedTimeseries(namedArray=fixedArr)
 
-    def _simulateNumpy(self, params=None, startTime=None, endTime=None, numPoint=None):
+    def _simulateNumpy(self, params=None, startTime=None, endTime=None,
+          numPoint=None, times=None):
         """
         Runs a simulation. Defaults to parameter values in the simulation.
 
         Parameters
        ----------
-        params: lmfit.Parameters
+        params: lmfit.Parameters/dict
+            parameters or a mapping from parameter name to value
         startTime: float
         endTime: float
         numPoint: int
+        times: list-float
+            increasing output times. Overrides startTime, endTime, numPoint.
 
         Return
         ------
@@ -648,8 +977,34 @@ class ModelFitterCore(rpickle.RPickler):
               endTime=endTime,
               numPoint=numPoint,
               selectedColumns=self.selectedColumns,
+              times=times,
               _logger=self.logger,
-              _loggerPrefix=self._loggerPrefix)
+              _loggerPrefix=self._loggerPrefix,
+              _binding=self._getParameterBinding(params))
+
+    def _getParameterBinding(self, parameters):
+        """
+        Provides the setters for the names in parameters. The binding
+        is kept until roadrunnerModel or the names change.
+
+        Parameters
+        ----------
+        parameters: lmfit.Parameters/dict/pd.Series
+
+        Returns
+        -------
+        ParameterBinding (None if no parameters)
+        """
+        if (parameters is None) or (self.roadrunnerModel is None):
+            return None
+        names = list(parameters.keys())
+        binding = self.__dict__.get("_parameterBinding", None)
+        if (binding is None) or (not binding.isBound(self.roadrunnerModel,
+              names)):
+            binding = ParameterBinding(self.roadrunnerModel, names,
+                  logger=self.logger)
+            self._parameterBinding = binding
+        return binding
 
     def updateFittedAndResiduals(self, **kwargs)->np.ndarray:
         """
@@ -670,6 +1025,8 @@ class ModelFitterCore(rpickle.RPickler):
         -------
         1-d ndarray of residuals
         """
+        if self._isOutputTimes:
+            kwargs["times"] = self._outputTimes
         self.fittedTS = self.simulate(**kwargs)  # Updates self.fittedTS
         if self._selectedIdxs is None:
             self._updateSelectedIdxs()
@@ -684,26 +1041,55 @@ class ModelFitterCore(rpickle.RPickler):
         self.residualsTS[cols] = residualsArr
 
     @staticmethod
-    def selectCompatibleIndices(bigTimes, smallTimes):
+    def selectCompatibleIndices(bigTimes, smallTimes, tolerance=None):
         """
         Finds the indices such that smallTimes[n] is close to bigTimes[indices[n]]
+        Ties are resolved in favor of the smaller time.
 
         Parameters
         ----------
         bigTimes: np.ndarray
         smalltimes: np.ndarray
+        tolerance: float
+            maximum distance between matched times. None is no check.
 
         Returns
         np.ndarray
+
+        Raises
+        ------
+        ValueError: a time in smallTimes is not matched within tolerance
         """
-        indices = []
-        for idx, _ in enumerate(smallTimes):
-            distances = (bigTimes - smallTimes[idx])**2
-            def getValue(k):
-                return distances[k]
-            thisIndices = sorted(range(len(distances)), key=getValue)
-            indices.append(thisIndices[0])
-        return np.array(indices)
+        bigTimes = np.asarray(bigTimes, dtype=float)
+        smallTimes = np.asarray(smallTimes, dtype=float)
+        if len(bigTimes) == 0:
+            raise ValueError("bigTimes must be non-empty.")
+        # Sorted view of bigTimes
+        sortIdxs = None
+        sortedTimes = bigTimes
+        if np.any(np.diff(bigTimes) < 0):
+            sortIdxs = np.argsort(bigTimes, kind="stable")
+            sortedTimes = bigTimes[sortIdxs]
+        # Nearest neighbor among the insertion point and its predecessor
+        upperIdxs = np.searchsorted(sortedTimes, smallTimes)
+        upperIdxs = np.clip(upperIdxs, 1, max(len(sortedTimes) - 1, 1))
+        lowerIdxs = upperIdxs - 1
+        lowerDistances = np.abs(smallTimes - sortedTimes[lowerIdxs])
+        upperDistances = np.abs(sortedTimes[upperIdxs] - smallTimes)
+        indices = np.where(lowerDistances <= upperDistances, lowerIdxs,
+              upperIdxs)
+        if len(sortedTimes) == 1:
+            indices = np.zeros(len(smallTimes), dtype=int)
+        if sortIdxs is not None:
+            indices = sortIdxs[indices]
+        if tolerance is not None:
+            distances = np.abs(bigTimes[indices] - smallTimes)
+            unmatchedTimes = smallTimes[distances > tolerance]
+            if len(unmatchedTimes) > 0:
+                msg = "Times not matched within tolerance %s: %s"  \
+                      % (str(tolerance), str(list(unmatchedTimes)))
+                raise ValueError(msg)
+        return indices
 
     def calcResiduals(self, params)->np.ndarray:
         """
@@ -722,14 +1108,19 @@ class ModelFitterCore(rpickle.RPickler):
         """
         if self._selectedIdxs is None:
             self._updateSelectedIdxs()
+        times = None
+        if self._isOutputTimes:
+            times = self._outputTimes
         dataArr = ModelFitterCore.runSimulationNumpy(parameters=params,
               modelSpecification=self.roadrunnerModel,
               startTime=self.observedTS.start,
               endTime=self.endTime,
               numPoint=self.numPoint,
               selectedColumns=self.selectedColumns,
+              times=times,
               _logger=self.logger,
-              _loggerPrefix=self._loggerPrefix)
+              _loggerPrefix=self._loggerPrefix,
+              _binding=self._getParameterBinding(params))
         if dataArr is None:
             residualsArr = np.repeat(LARGE_RESIDUAL, len(self._observedArr))
         else:
@@ -740,7 +1131,181 @@ class ModelFitterCore(rpickle.RPickler):
                 residualsArr = np.nan_to_num(residualsArr)
         return residualsArr
 
-    def fitModel(self, params:lmfit.Parameters=None):
+    def _calcResidualsMatrix(self, paramArr, names):
+        """
+        Calculates residuals for each row of parameter values
+        in this process.
+
+        Parameters
+        ----------
+        paramArr: np.ndarray (N X P)
+        names: list-str
+            parameter names for the columns of paramArr
+
+        Returns
+        -------
+        np.ndarray (N X R)
+        """
+        self.initializeRoadRunnerModel()
+        params = lmfit.Parameters()
+        for name in names:
+            params.add(name, value=0)
+        residualsArrs = []
+        for values in paramArr:
+            for name, value in zip(names, values):
+                params[name].value = value
+            residualsArrs.append(self.calcResiduals(params))
+        return np.array(residualsArrs)
+
+    def _getResidualsPool(self):
+        """
+        Provides the pool of processes for calcResidualsBatch. Each process
+        has its own roadrunner model. The pool persists until
+        closeResidualsPool.
+
+        Returns
+        -------
+        multiprocessing.Pool
+        """
+        if self._residualsPool is None:
+            numProcess = self._maxProcess
+            if numProcess is None:
+                numProcess = multiprocessing.cpu_count()
+            fitter = self.copy(isKeepLogger=True, isLightweight=True).clean()
+            self._residualsPool = multiprocessing.Pool(numProcess,
+                  initializer=_initializeBatchProcess, initargs=(fitter,))
+            self._numBatchProcess = numProcess
+        return self._residualsPool
+
+    def closeResidualsPool(self):
+        """
+        Terminates the processes used by calcResidualsBatch.
+        """
+        if self.__dict__.get("_residualsPool", None) is not None:
+            self._residualsPool.terminate()
+            self._residualsPool = None
+
+    def calcResidualsBatch(self, paramArr, names=None, isParallel=None)  \
+          ->np.ndarray:
+        """
+        Calculates residuals for a population of parameter values.
+        Work is spread over a pool of processes that is retained
+        between calls.
+
+        Parameters
+        ----------
+        paramArr: np.ndarray (N X P)
+            each row is a set of parameter values
+        names: list-str
+            parameter names for the columns of paramArr
+            default: names of self.params
+        isParallel: bool
+            use the pool of processes. Default is self._isParallel
+
+        Returns
+        -------
+        np.ndarray (N X R)
+            rows are the result of calcResiduals
+        """
+        if names is None:
+            names = list(self.params.keys())
+        if isParallel is None:
+            isParallel = self._isParallel
+        paramArr = np.atleast_2d(np.array(paramArr, dtype=float))
+        if (not isParallel) or (len(paramArr) == 1):
+            return self._calcResidualsMatrix(paramArr, names)
+        pool = self._getResidualsPool()
+        numChunk = min(len(paramArr), self._numBatchProcess)
+        arguments = [(a, names) for a in np.array_split(paramArr, numChunk)]
+        residualsArrs = pool.map(_calcBatchResiduals, arguments)
+        return np.concatenate(residualsArrs, axis=0)
+
+    def _getJacobianFunction(self, params):
+        """
+        Provides calcJacobian if roadrunner sensitivities can be used
+        for the parameters and selectedColumns. Sensitivities are
+        available for global parameters and floating species at
+        the times of a simulation grid.
+
+        Parameters
+        ----------
+        params: lmfit.Parameters
+
+        Returns
+        -------
+        Function (None if sensitivities cannot be used)
+        """
+        self.initializeRoadRunnerModel()
+        model = self.roadrunnerModel.model
+        varyNames = [n for n, p in params.items() if p.vary]
+        speciesIds = list(model.getFloatingSpeciesIds())
+        if self._isOutputTimes:
+            msg = "Sensitivities are not used with isOutputTimes."
+        elif not set(varyNames).issubset(model.getGlobalParameterIds()):
+            msg = "Sensitivities require that parameters be global parameters."
+        elif not set(self.selectedColumns).issubset(speciesIds):
+            msg = "Sensitivities require that columns be floating species."
+        else:
+            msg = None
+        if msg is not None:
+            self.logger.activity(msg + " Using finite differences.")
+            return None
+        self._isSensitivity = True
+        return self.calcJacobian
+
+    def calcJacobian(self, params)->np.ndarray:
+        """
+        Computes the derivatives of the residuals calculated by
+        calcResiduals with respect to the varying parameters using
+        roadrunner forward sensitivities. Requires that the varying
+        parameters are global parameters and that selectedColumns are
+        floating species.
+
+        Parameters
+        ----------
+        params: lmfit.Parameters
+
+        Returns
+        -------
+        np.ndarray (R X V)
+            rows are residuals; columns are varying parameters
+        """
+        if not self._isSensitivity:
+            if self._getJacobianFunction(params) is None:
+                raise ValueError("Sensitivities cannot be used for this fit.")
+        if self._selectedIdxs is None:
+            self._updateSelectedIdxs()
+        varyNames = [n for n, p in params.items() if p.vary]
+        model = self.roadrunnerModel.model
+        self.roadrunnerModel.reset()
+        ModelFitterCore.setupModel(self.roadrunnerModel, params,
+              logger=self.logger, binding=self._getParameterBinding(params))
+        # The sensitivity solver retains the parameters of its last use.
+        # So, all global parameters are always requested.
+        globalIds = list(model.getGlobalParameterIds())
+        varyIdxs = [globalIds.index(n) for n in varyNames]
+        try:
+            self.roadrunnerModel.getSensitivitySolver().syncWithModel(model)
+            _, sensitivityArr, _, _ =  \
+                  self.roadrunnerModel.timeSeriesSensitivities(
+                  self.observedTS.start, self.endTime, self.numPoint,
+                  globalIds, self.selectedColumns)
+        except Exception as err:
+            self.logger.error("Roadrunner exception: ", err)
+            return np.zeros((len(self._observedArr), len(varyNames)))
+        # time X parameter X species to time X species X parameter
+        sensitivityArr = np.array(sensitivityArr)[self._selectedIdxs]
+        sensitivityArr = np.transpose(sensitivityArr[:, varyIdxs, :],
+              (0, 2, 1))
+        # Sensitivities are of the selections simulated by calcResiduals
+        # (amounts of floating species). So, no scaling is needed.
+        # Residuals are observed minus simulated
+        jacobianArr = -np.reshape(sensitivityArr, (-1, len(varyNames)))
+        if self._isObservedNan:
+            jacobianArr[np.isnan(self._observedArr), :] = 0
+        return jacobianArr
+
+    def fitModel(self, params:lmfit.Parameters=None, isJacobian:bool=False):
         """
         Fits the model by adjusting values of parameters based on
         differences between simulated and provided values of
@@ -750,6 +1315,9 @@ class ModelFitterCore(rpickle.RPickler):
         ----------
         params: lmfit.parameters
             starting values of parameters
+        isJacobian: bool
+            leastsq uses derivatives from roadrunner sensitivities
+            instead of finite differences if they apply
 
         Example
         -------
@@ -759,9 +1327,26 @@ class ModelFitterCore(rpickle.RPickler):
             params = self.params
         self.initializeRoadRunnerModel()
         if self.parametersToFit is not None:
-            self.optimizer = Optimizer.optimize(self.calcResiduals, params,
-                  self._fitterMethods, logger=self.logger,
-                  numRestart=self._numRestart)
+            batchFunction = None
+            if self._isBatchResiduals:
+                names = list(params.keys())
+                batchFunction = lambda a: self.calcResidualsBatch(a,
+                      names=names)
+            jacobianFunction = None
+            if isJacobian:
+                jacobianFunction = self._getJacobianFunction(params)
+            try:
+                self.optimizer = Optimizer.optimize(self.calcResiduals, params,
+                      self._fitterMethods, logger=self.logger,
+                      numRestart=self._numRestart, batchFunction=batchFunction,
+                      jacobianFunction=jacobianFunction,
+                      isParallel=self._isParallelRestart,
+                      maxProcess=self._maxProcess,
+                      targetRssq=self._targetRssq,
+                      startMethod=self._restartMethod,
+                      numCandidate=self._numRestartCandidate)
+            finally:
+                self.closeResidualsPool()
             self.minimizerResult = self.optimizer.minimizerResult
         # Ensure that residualsTS and fittedTS match the parameters
         self.updateFittedAndResiduals(params=self.params)
@@ -826,7 +1411,7 @@ class ModelFitterCore(rpickle.RPickler):
         path: str
             File path
         """
-        newModelFitter = self.copy()
+        newModelFitter = self.copy(isLightweight=True)
         with open(path, "wb") as fd:
             rpickle.dump(newModelFitter, fd)
 
@@ -84,11 +84,15 @@ class ModelFitterWrapper(AbstractFitter):
         -------
         float
         """
+        times = None
+        if self.modelFitter._isOutputTimes:
+            times = self.observedTS[cn.TIME]
         fullFittedTS = self.modelFitter.runSimulation(
               parameters=self.modelFitter.params,
               modelSpecification=self.modelFitter.modelSpecification,
               endTime=self.observedTS.end,
               numPoint=len(self.observedTS),
+              times=times,
               _logger=self.modelFitter.logger,
               _loggerPrefix=self.modelFitter._loggerPrefix,
               )
@@ -111,6 +115,12 @@ class ModelFitterCrossValidator(ModelFitterCore, AbstractCrossValidator):
         if "observedTS" in self.__dict__.keys():
             self.numPoint = len(self.observedTS)
 
+    def _copyLightweight(self, **kwargs):
+        # Cross validation results are not copied
+        newModelFitter = ModelFitterCore._copyLightweight(self, **kwargs)
+        AbstractCrossValidator.__init__(newModelFitter)
+        return newModelFitter
+
     def _getModelFitterGenerator(self, numFold): 
         """
         Constructs fitters for each fold.
@@ -136,6 +146,13 @@ class ModelFitterCrossValidator(ModelFitterCore, AbstractCrossValidator):
                   logger=self.logger,
                   _loggerPrefix=self._loggerPrefix,
                   isPlot=self._isPlot,
+                  isOutputTimes=self._isOutputTimes,
+                  isBatchResiduals=self._isBatchResiduals,
+                  isPersistentPool=self._isPersistentPool,
+                  isParallelRestart=self._isParallelRestart,
+                  targetRssq=self._targetRssq,
+                  restartMethod=self._restartMethod,
+                  numRestartCandidate=self._numRestartCandidate,
                   maxProcess=self._maxProcess,
                   numFitRepeat=self._numFitRepeat,
                   numIteration=self.bootstrapKwargs["numIteration"],
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+ Created on October 18, 2026
+
+Assigns models to a bounded number of workers so that the work of
+the workers is balanced. The cost of a model is a moving average of
+its measured simulation times. The first time of a model on a worker
+is not used since it includes warm up (e.g., loading the model).
+Models are packed by assigning them in order of decreasing cost to
+the worker with the least work (longest processing time first).
+Models are repacked when all costs are first measured and then
+periodically, and the new assignment is used only if it reduces the
+work of the busiest worker.
+
+    Usage
+    -----
+    scheduler = ModelScheduler(numModel, numWorker)
+    do until done:
+        for worker, modelIdxs in enumerate(scheduler.assignments):
+            run models in modelIdxs on worker
+        scheduler.recordCosts(modelIdxs, durations)
+"""
+
+import numpy as np
+
+REBALANCE_INTERVAL = 20  # Evaluations between repacking
+SMOOTHING = 0.3  # Weight of a new measurement in the cost
+TOLERANCE = 0.05  # Fractional reduction in work required to repack
+
+
+class ModelScheduler():
+
+    def __init__(self, numModel:int, numWorker:int,
+          rebalanceInterval:int=REBALANCE_INTERVAL):
+        """
+        Parameters
+        ----------
+        numModel: int
+        numWorker: int
+            maximum number of workers
+        rebalanceInterval: int
+            number of evaluations between repacking
+        """
+        self.numModel = numModel
+        self.numWorker = max(1, min(numWorker, numModel))
+        self.rebalanceInterval = rebalanceInterval
+        # Costs are equal until they are measured
+        self.costArr = np.repeat(1.0, self.numModel)
+        self.isMeasuredArr = np.repeat(False, self.numModel)
+        # Models that have run on their current worker
+        self.isWarmArr = np.repeat(False, self.numModel)
+        self.numEvaluation = 0
+        self.numRebalance = 0
+        self.assignments = self.pack(self.costArr, self.numWorker)
+
+    @staticmethod
+    def pack(costs, numWorker:int)->list:
+        """
+        Assigns models to workers so that the largest total cost of a
+        worker is small.
+
+        Parameters
+        ----------
+        costs: list-float
+            cost of each model
+        numWorker: int
+
+        Returns
+        -------
+        list-list-int
+            indices of the models for each worker
+        """
+        costArr = np.array(costs, dtype=float)
+        loadArr = np.zeros(numWorker)
+        assignments = [[] for _ in range(numWorker)]
+        # Stable sort so that equal costs are assigned in order
+        for modelIdx in np.argsort(-costArr, kind="stable"):
+            workerIdx = int(np.argmin(loadArr))
+            assignments[workerIdx].append(int(modelIdx))
+            loadArr[workerIdx] += costArr[modelIdx]
+        return [sorted(a) for a in assignments]
+
+    def calcLoads(self, assignments=None)->np.ndarray:
+        """
+        Calculates the total cost of each worker.
+
+        Parameters
+        ----------
+        assignments: list-list-int
+            Default is the current assignments
+
+        Returns
+        -------
+        np.ndarray
+        """
+        if assignments is None:
+            assignments = self.assignments
+        return np.array([np.sum(self.costArr[a]) for a in assignments])
+
+    def recordCosts(self, modelIdxs, durations):
+        """
+        Updates the costs of models with measured simulation times,
+        and repacks the models if it is time to do so. The first time
+        of a model on its worker is not used.
+
+        Parameters
+        ----------
+        modelIdxs: list-int
+        durations: list-float
+            seconds
+        """
+        isAllMeasured = all(self.isMeasuredArr)
+        for modelIdx, duration in zip(modelIdxs, durations):
+            if not self.isWarmArr[modelIdx]:
+                self.isWarmArr[modelIdx] = True
+            elif self.isMeasuredArr[modelIdx]:
+                self.costArr[modelIdx] = (1 - SMOOTHING)*self.costArr[modelIdx]  \
+                      + SMOOTHING*duration
+            else:
+                self.costArr[modelIdx] = duration
+                self.isMeasuredArr[modelIdx] = True
+        self.numEvaluation += 1
+        # Repack when costs are first known and then periodically
+        if ((not isAllMeasured) and all(self.isMeasuredArr))  \
+              or (self.numEvaluation % self.rebalanceInterval == 0):
+            _ = self.rebalance()
+
+    def rebalance(self)->bool:
+        """
+        Repacks the models using the current costs.
+
+        Returns
+        -------
+        bool
+            True if the assignments changed
+        """
+        assignments = self.pack(self.costArr, self.numWorker)
+        newMax = np.max(self.calcLoads(assignments))
+        curMax = np.max(self.calcLoads())
+        if newMax < (1 - TOLERANCE)*curMax:
+            # Models that move must warm up on their new worker
+            for oldAssignment, newAssignment in zip(self.assignments,
+                  assignments):
+                movedIdxs = list(set(newAssignment) - set(oldAssignment))
+                self.isWarmArr[movedIdxs] = False
+            self.assignments = assignments
+            self.numRebalance += 1
+            return True
+        return False
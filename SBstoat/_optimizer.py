@@ -4,27 +4,81 @@ The abstraction extends lmfit optimizations by:
 1. Ensuring that the parameters chosen have the lowest residuals sum of squares
 2. Providing for a sequence of optimization methods
 3. Providing an option to repeat a method sequence with different randomly
-   chosen initial parameter values (numRandomRestart).
+   chosen initial parameter values (numRandomRestart). Restarts can
+   run concurrently in processes and stop once a target rssq is reached.
+   Initial values can be space filling (e.g., latin hypercube) and
+   prescreened by evaluating the function once for many candidates.
 
 """
 
 from SBstoat.logs import Logger
 from SBstoat import _helpers
 from SBstoat import _constants as cn
+from SBstoat._evaluationTracer import EvaluationTracer
 
 import copy
 import lmfit
+from lmfit.minimizer import AbortFitException
 import matplotlib.pyplot as plt
+import multiprocessing
 import pandas as pd
 import numpy as np
+from scipy.stats import qmc
 import time
+import warnings
 
+EPSFCN = 1e-10  # lmfit default for the step of leastsq finite differences
+TRACE_CAPACITY = 10000  # Executions kept by a tracer for each method
+# Optimizer class, function, methods, and keyword arguments in a process
+# that runs restarts
+_RESTART_DCT = {}
+
+
+def _getForkContext():
+    """
+    Provides the multiprocessing context for processes that run restarts.
+    Processes must be forked so that the function need not be picklable.
+
+    Returns
+    -------
+    multiprocessing.context.BaseContext (None if fork is not available)
+    """
+    try:
+        return multiprocessing.get_context("fork")
+    except ValueError:
+        return None
+
+def _initializeRestartProcess(cls, function, methods, kwargs):
+    """
+    Saves the arguments of restarts in a process. Processes are forked,
+    and so each has its own copy of the function and its models.
+    """
+    _RESTART_DCT.update(dict(cls=cls, function=function, methods=methods,
+          kwargs=kwargs))
+
+def _executeRestart(initialParams):
+    """
+    Runs an optimization in a process for parallel restarts.
+
+    Parameters
+    ----------
+    initialParams: lmfit.Parameters
+
+    Returns
+    -------
+    Optimizer (results only)
+    """
+    optimizer = _RESTART_DCT["cls"](_RESTART_DCT["function"], initialParams,
+          _RESTART_DCT["methods"], **_RESTART_DCT["kwargs"])
+    optimizer.execute()
+    return optimizer.copyResults()
 
 
 class _FunctionWrapper():
     """Wraps a function used for optimization."""
 
-    def __init__(self, function, isCollect=False):
+    def __init__(self, function, isCollect=False, batchFunction=None,
+          names=None, traceCapacity=TRACE_CAPACITY):
         """
         Parameters
         ----------
@@ -36,34 +90,331 @@ class _FunctionWrapper():
                returns: np.array
         isCollect: bool
             collect performance statistics on function execution
+        batchFunction: function
+            evaluates many parameter values at once
+               argument: np.ndarray (N X P)
+               returns: np.ndarray (N X R)
+        names: list-str
+            order of parameters for best values and traces.
+            Default is the order of the first parameters executed.
+        traceCapacity: int
+            number of most recent executions kept by the tracer
         """
         self._function = function
         self._isCollect = isCollect
+        self._batchFunction = batchFunction
+        self.names = names
         # Results
-        self.perfStatistics = []  # durations of function executions
-        self.rssqStatistics = []  # residual sum of squares, a quality measure
+        self.tracer = None
+        if self._isCollect:
+            self.tracer = EvaluationTracer(capacity=traceCapacity, names=names)
         self.rssq = 10e10
-        self.bestParamDct = None
+        # Parameter values with the smallest rssq in the order of names
+        self.bestValueArr = None
+        if self.names is not None:
+            self.bestValueArr = np.zeros(len(self.names))
+        self.isBest = False  # bestValueArr has been assigned
+        # Last parameter values and result. Kept if isKeepLast.
+        self.isKeepLast = False
+        self.lastValueDct = None
+        self.lastResult = None
+
+    @property
+    def bestParamDct(self):
+        """
+        Parameter values with the smallest rssq.
+
+        Returns
+        -------
+        dict (None if there are none)
+            key: parameter name
+            value: value
+        """
+        if not self.isBest:
+            return None
+        return dict(zip(self.names, self.bestValueArr))
+
+    def _setBestValues(self, params):
+        """
+        Saves the parameter values in bestValueArr without
+        constructing a dictionary.
+
+        Parameters
+        ----------
+        params: lmfit.Parameters
+        """
+        if self.names is None:
+            self.names = list(params.keys())
+            self.bestValueArr = np.zeros(len(self.names))
+        for idx, name in enumerate(self.names):
+            self.bestValueArr[idx] = params[name].value
+        self.isBest = True
+
+    @property
+    def perfStatistics(self):
+        """
+        Durations of the function executions kept by the tracer.
+        """
+        if self.tracer is None:
+            return np.array([])
+        return self.tracer.getDurations()
+
+    @property
+    def rssqStatistics(self):
+        """
+        Residual sum of squares, a quality measure, of the function
+        executions kept by the tracer.
+        """
+        if self.tracer is None:
+            return np.array([])
+        return self.tracer.getRssqs()
 
     @staticmethod
     def _calcSSQ(arr):
-        return sum(arr**2)
+        arr = np.asarray(arr, dtype=float).ravel()
+        return np.dot(arr, arr)
 
     def execute(self, params, **kwargs):
         if self._isCollect:
-            startTime = time.time()
+            startTime = time.perf_counter()
         result = self._function(params, **kwargs)
         if self._isCollect:
-            duration = time.time() - startTime
+            duration = time.perf_counter() - startTime
         rssq = _FunctionWrapper._calcSSQ(result)
         if rssq < self.rssq:
             self.rssq = rssq
-            self.bestParamDct = dict(params.valuesdict())
+            self._setBestValues(params)
         if self._isCollect:
-            self.perfStatistics.append(duration - startTime)
-            self.rssqStatistics.append(rssq)
+            self.tracer.record(duration, rssq,
+                  values=[params[n].value for n in self.tracer.names])
+        if self.isKeepLast:
+            self.lastValueDct = params.valuesdict()
+            self.lastResult = result
         return result
 
+    def executeBatch(self, valueArr, names):
+        """
+        Evaluates the batch function for a population of parameter values.
+
+        Parameters
+        ----------
+        valueArr: np.ndarray (N X P)
+            rows are parameter values in the order of names
+        names: list-str
+            parameter names
+
+        Returns
+        -------
+        np.ndarray (N)
+            residual sum of squares for each row
+        """
+        if self._isCollect:
+            startTime = time.perf_counter()
+        residualsArr = self._batchFunction(valueArr)
+        rssqs = np.einsum("ij,ij->i", residualsArr, residualsArr)
+        if self._isCollect:
+            duration = (time.perf_counter() - startTime)/len(rssqs)
+            self.tracer.recordBatch(np.repeat(duration, len(rssqs)), rssqs,
+                  valueArr=valueArr)
+        bestIdx = np.argmin(rssqs)
+        if rssqs[bestIdx] < self.rssq:
+            self.rssq = rssqs[bestIdx]
+            if self.names is None:
+                self.names = list(names)
+                self.bestValueArr = np.zeros(len(self.names))
+            if list(names) == self.names:
+                self.bestValueArr[:] = valueArr[bestIdx, :]
+            else:
+                for idx, name in enumerate(self.names):
+                    self.bestValueArr[idx] = valueArr[bestIdx,
+                          names.index(name)]
+            self.isBest = True
+        return rssqs
+
+
+class _BatchMapper():
+    """
+    Map-like callable used as the workers argument of
+    differential_evolution so that a population is evaluated in one batch.
+    lmfit provides values in its internal (bounded) representation.
+    Evaluations are counted by the lmfit minimizer, and the fit is aborted
+    when max_nfev is reached, as lmfit does for single evaluations.
+    """
+
+    def __init__(self, functionWrapper, params):
+        """
+        Parameters
+        ----------
+        functionWrapper: _FunctionWrapper
+        params: lmfit.Parameters
+        """
+        self._functionWrapper = functionWrapper
+        self.minimizer = None  # lmfit.Minimizer that counts evaluations
+        self.numEvaluation = 0
+        self._params = params.copy()
+        for parameter in self._params.values():
+            parameter.setup_bounds()
+        self._names = list(self._params.keys())
+        self._varyNames = [n for n, p in self._params.items() if p.vary]
+
+    def __call__(self, _, population):
+        """
+        Parameters
+        ----------
+        _: function evaluated by scipy for a single member
+        population: iterable-np.ndarray
+            internal values of the varying parameters
+
+        Returns
+        -------
+        list-float
+        """
+        internalArr = np.array(list(population), dtype=float)
+        numPopulation = len(internalArr)
+        isAbort = False
+        if self.minimizer is not None:
+            # Evaluations beyond max_nfev abort the fit
+            result = self.minimizer.result
+            numAllowed = max(0, self.minimizer.max_nfev - result.nfev)
+            if numAllowed < numPopulation:
+                isAbort = True
+            result.last_internal_values = internalArr[
+                  max(min(numAllowed, numPopulation), 1) - 1]
+            internalArr = internalArr[:numAllowed]
+            result.nfev += len(internalArr)
+        if len(internalArr) > 0:
+            rssqs = self._evaluate(internalArr)
+            self.numEvaluation += len(rssqs)
+        if isAbort:
+            msg = "number of function evaluations > %d"  \
+                  % self.minimizer.max_nfev
+            result.aborted = True
+            result.message = "Fit aborted: %s" % msg
+            result.success = False
+            raise AbortFitException("fit aborted: %s" % msg)
+        return list(rssqs)
+
+    def _evaluate(self, internalArr):
+        """
+        Evaluates internal values of the varying parameters.
+
+        Parameters
+        ----------
+        internalArr: np.ndarray (N X V)
+
+        Returns
+        -------
+        np.ndarray (N)
+        """
+        valueArr = np.array([np.repeat(self._params[n].value,
+              len(internalArr)) for n in self._names]).T
+        for idx, name in enumerate(self._varyNames):
+            parameter = self._params[name]
+            pos = self._names.index(name)
+            valueArr[:, pos] = [parameter.from_internal(v)
+                  for v in internalArr[:, idx]]
+        return self._functionWrapper.executeBatch(valueArr, self._names)
+
+
+class _BatchJacobian():
+    """
+    Callable used as the Dfun argument of leastsq that computes
+    the Jacobian by finite differences. The perturbed parameter
+    values are evaluated in one batch so that they are computed
+    concurrently. Derivatives are with respect to the (external) values
+    of the varying parameters. Residuals at the parameter values are
+    those of the last function evaluation if it was at these values.
+    A step is backward if a forward step leaves the bounds and there
+    is more room below.
+    """
+
+    def __init__(self, batchFunction, params, epsfcn=EPSFCN,
+          functionWrapper=None):
+        """
+        Parameters
+        ----------
+        batchFunction: function
+            evaluates many parameter values at once
+               argument: np.ndarray (N X P), columns ordered as params
+               returns: np.ndarray (N X R)
+        params: lmfit.Parameters
+        epsfcn: float
+            steps are sqrt(epsfcn) relative to the parameter value
+        functionWrapper: _FunctionWrapper
+            function evaluated by the minimizer
+        """
+        self._batchFunction = batchFunction
+        self._names = list(params.keys())
+        self._stepFactor = np.sqrt(epsfcn)
+        self._functionWrapper = functionWrapper
+        if self._functionWrapper is not None:
+            self._functionWrapper.isKeepLast = True
+        self.numEvaluation = 0
+
+    def _getLastResiduals(self, valueArr):
+        """
+        Provides the residuals of the last function evaluation if it
+        was at the parameter values.
+
+        Parameters
+        ----------
+        valueArr: np.ndarray (P)
+            values in the order of the parameter names
+
+        Returns
+        -------
+        np.ndarray (R) (None if there are none)
+        """
+        if self._functionWrapper is None:
+            return None
+        valueDct = self._functionWrapper.lastValueDct
+        if valueDct is None:
+            return None
+        for name, value in zip(self._names, valueArr):
+            if valueDct.get(name, None) != value:
+                return None
+        return np.asarray(self._functionWrapper.lastResult,
+              dtype=float).ravel()
+
+    def __call__(self, params, *_, **__):
+        """
+        Parameters
+        ----------
+        params: lmfit.Parameters
+
+        Returns
+        -------
+        np.ndarray (R X V)
+        """
+        valueArr = np.array([params[n].value for n in self._names],
+              dtype=float)
+        varyIdxs = [i for i, n in enumerate(self._names) if params[n].vary]
+        stepArr = self._stepFactor*np.abs(valueArr[varyIdxs])
+        stepArr[stepArr == 0] = self._stepFactor
+        # Keep perturbed values within the bounds
+        minArr = np.array([params[self._names[i]].min for i in varyIdxs])
+        maxArr = np.array([params[self._names[i]].max for i in varyIdxs])
+        upperRoomArr = maxArr - valueArr[varyIdxs]
+        lowerRoomArr = valueArr[varyIdxs] - minArr
+        isBackwards = (stepArr > upperRoomArr) & (lowerRoomArr > upperRoomArr)
+        roomArr = np.where(isBackwards, lowerRoomArr, upperRoomArr)
+        isShorts = (stepArr > roomArr) & (roomArr > 0)
+        stepArr[isShorts] = roomArr[isShorts]
+        stepArr[isBackwards] *= -1
+        perturbedArr = np.repeat(valueArr[np.newaxis, :], len(varyIdxs),
+              axis=0)
+        perturbedArr[np.arange(len(varyIdxs)), varyIdxs] += stepArr
+        baseArr = self._getLastResiduals(valueArr)
+        if baseArr is None:
+            # The first row is the unperturbed values
+            perturbedArr = np.vstack([valueArr, perturbedArr])
+        residualsArr = self._batchFunction(perturbedArr)
+        self.numEvaluation += len(perturbedArr)
+        if baseArr is None:
+            baseArr = residualsArr[0, :]
+            residualsArr = residualsArr[1:, :]
+        return (residualsArr - baseArr).T/stepArr
+
 
 class Optimizer():
     """
@@ -79,7 +430,8 @@ class Optimizer():
     """
 
     def __init__(self, function, initialParams, methods, logger=None,
-          isCollect=False):
+          isCollect=False, batchFunction=None, jacobianFunction=None,
+          traceCapacity=TRACE_CAPACITY):
         """
         Parameters
         ----------
@@ -93,15 +445,35 @@ class Optimizer():
         methods: list-_helpers.OptimizerMethod
         isCollect: bool
            Collects performance statistcs
+        batchFunction: Function
+           Used instead of function by methods in cn.METHOD_BATCH
+           and for the finite differences of cn.METHOD_LEASTSQ
+           if there is no jacobianFunction
+           Arguments
+            np.ndarray (N X P), columns ordered as initialParams
+           returns np.ndarray (N X R) of residuals
+        jacobianFunction: Function
+           Used as Dfun by cn.METHOD_LEASTSQ
+           Arguments
+            lmfit.parameters
+           returns np.ndarray (R X V) derivatives of residuals with
+            respect to the varying parameters
+        traceCapacity: int
+           Number of most recent function executions for which
+           statistics are kept for each method if isCollect
         """
         self._function = function
+        self._batchFunction = batchFunction
+        self._jacobianFunction = jacobianFunction
         self._methods = methods
         self._initialParams = initialParams
         self._isCollect = isCollect
+        self._traceCapacity = traceCapacity
         self.logger = logger
         if self.logger is None:
             self.logger = Logger()
         # Outputs
+        self.tracers = []  # EvaluationTracer for each method
         self.performanceStats = []  # list of performance results
         self.qualityStats = []  # relative rssq
         self.params = None
@@ -117,12 +489,21 @@ class Optimizer():
         Optimizer
         """
         newOptimizer = Optimizer(self._function, self._initialParams.copy(),
-              self._methods, logger=self.logger, isCollect=self._isCollect)
+              self._methods, logger=self.logger, isCollect=self._isCollect,
+              traceCapacity=self._traceCapacity)
         newOptimizer._function = None  # Not serializable
+        newOptimizer._batchFunction = None
         #
+        newOptimizer.tracers = copy.deepcopy(self.tracers)
         newOptimizer.performanceStats = copy.deepcopy(self.performanceStats)
         newOptimizer.qualityStats = copy.deepcopy(self.qualityStats)
-        newOptimizer.minimizerResult = copy.deepcopy(self.minimizerResult)
+        minimizerResult = self.minimizerResult
+        if "Dfun" in getattr(minimizerResult, "call_kws", {}).keys():
+            # Dfun references the function, which is not serializable
+            minimizerResult = copy.copy(minimizerResult)
+            minimizerResult.call_kws = dict(minimizerResult.call_kws,
+                  Dfun=None)
+        newOptimizer.minimizerResult = copy.deepcopy(minimizerResult)
         newOptimizer.params = None
         if self.params is not None:
             newOptimizer.params = self.params.copy()
@@ -148,7 +529,93 @@ class Optimizer():
             newParameters.add(name, min=parameter.min, max=parameter.max,
                   value=newValue)
         return newParameters
-       
+
+    @staticmethod
+    def _mkStartParams(params, numStart, startMethod=cn.START_RANDOM,
+          seed=None):
+        """
+        Constructs initial values for restarts. Values of varying
+        parameters are spread between min and max.
+
+        Parameters
+        ----------
+        params: lmfit.Parameters
+        numStart: int
+            number of initial values
+        startMethod: str
+            a method in cn.START_METHODS
+        seed: int
+            seed for the values. Default is from np.random.
+
+        Returns
+        -------
+        list-lmfit.Parameters
+        """
+        if startMethod not in cn.START_METHODS:
+            raise ValueError("Invalid start method: %s" % startMethod)
+        if (startMethod == cn.START_RANDOM) and (seed is None):
+            return [Optimizer._setRandomValue(params)
+                  for _ in range(numStart)]
+        if seed is None:
+            seed = np.random.randint(2**31)
+        varyNames = [n for n, p in params.items() if p.vary]
+        # Values in the unit hypercube
+        if startMethod == cn.START_RANDOM:
+            unitArr = np.random.default_rng(seed).uniform(
+                  size=(numStart, len(varyNames)))
+        else:
+            if startMethod == cn.START_LATIN_HYPERCUBE:
+                sampler = qmc.LatinHypercube(d=len(varyNames), seed=seed)
+            elif startMethod == cn.START_SOBOL:
+                sampler = qmc.Sobol(d=len(varyNames), seed=seed)
+            else:
+                sampler = qmc.Halton(d=len(varyNames), seed=seed)
+            with warnings.catch_warnings():
+                # Sobol prefers a number of points that is a power of 2
+                warnings.simplefilter("ignore")
+                unitArr = sampler.random(numStart)
+        startParamsList = []
+        for unitValues in unitArr:
+            newParams = params.copy()
+            for name, unitValue in zip(varyNames, unitValues):
+                parameter = newParams[name]
+                parameter.set(value=parameter.min
+                      + unitValue*(parameter.max - parameter.min))
+            startParamsList.append(newParams)
+        return startParamsList
+
+    @staticmethod
+    def _prescreen(function, paramsList, numSelect, batchFunction=None):
+        """
+        Selects the parameters with the smallest residual sum of squares
+        from one evaluation of each.
+
+        Parameters
+        ----------
+        function: Function
+            calculates residuals for lmfit.Parameters
+        paramsList: list-lmfit.Parameters
+        numSelect: int
+        batchFunction: Function
+            calculates residuals for np.ndarray (N X P) of values
+
+        Returns
+        -------
+        list-lmfit.Parameters
+            ordered by residual sum of squares
+        """
+        if batchFunction is not None:
+            names = list(paramsList[0].keys())
+            valueArr = np.array([[p[n].value for n in names]
+                  for p in paramsList], dtype=float)
+            rssqs = np.sum(batchFunction(valueArr)**2, axis=1)
+        else:
+            rssqs = np.array([np.sum(np.array(function(p), dtype=float)**2)
+                  for p in paramsList])
+        rssqs[~np.isfinite(rssqs)] = np.inf
+        idxs = np.argsort(rssqs, kind="stable")[:numSelect]
+        return [paramsList[i] for i in idxs]
+
     def execute(self):
         """
         Performs the optimization on the function.
@@ -161,8 +628,35 @@ class Optimizer():
             method = optimizerMethod.method
             kwargs = optimizerMethod.kwargs
             wrapperFunction = _FunctionWrapper(self._function,
-                  isCollect=self._isCollect)
+                  isCollect=self._isCollect, batchFunction=self._batchFunction,
+                  names=list(self.params.keys()),
+                  traceCapacity=self._traceCapacity)
+            if (self._batchFunction is not None)  \
+                  and (method in cn.METHOD_BATCH)  \
+                  and ("workers" not in kwargs.keys()):
+                # Evaluate each generation as a batch. scipy requires
+                # deferred updating for workers.
+                kwargs = dict(kwargs)
+                batchMapper = _BatchMapper(wrapperFunction, self.params)
+                kwargs["workers"] = batchMapper
+                kwargs["updating"] = "deferred"
+            else:
+                batchMapper = None
+            if (method == cn.METHOD_LEASTSQ)  \
+                  and ("Dfun" not in kwargs.keys()):
+                jacobianFunction = self._jacobianFunction
+                if (jacobianFunction is None)  \
+                      and (self._batchFunction is not None):
+                    # Perturbed values are evaluated concurrently
+                    jacobianFunction = _BatchJacobian(self._batchFunction,
+                          self.params, epsfcn=kwargs.get("epsfcn", EPSFCN),
+                          functionWrapper=wrapperFunction)
+                if jacobianFunction is not None:
+                    kwargs = dict(kwargs)
+                    kwargs["Dfun"] = jacobianFunction
             minimizer = lmfit.Minimizer(wrapperFunction.execute, self.params)
+            if batchMapper is not None:
+                batchMapper.minimizer = minimizer
             try:
                 self.minimizerResult = minimizer.minimize(method=method, **kwargs)
             except Exception as excp:
@@ -171,13 +665,16 @@ class Optimizer():
                 self.logger.error(msg, excp)
                 continue
             # Update the parameters
-            if wrapperFunction.bestParamDct is not None:
-                _helpers.updateParameterValues(self.params,
-                      wrapperFunction.bestParamDct)
+            if wrapperFunction.isBest:
+                for name, value in zip(wrapperFunction.names,
+                      wrapperFunction.bestValueArr):
+                    self.params[name].set(value=value)
             # Update other statistics
             self.rssq = wrapperFunction.rssq
-            self.performanceStats.append(list(wrapperFunction.perfStatistics))
-            self.qualityStats.append(list(wrapperFunction.rssqStatistics))
+            if wrapperFunction.tracer is not None:
+                self.tracers.append(wrapperFunction.tracer)
+            self.performanceStats.append(wrapperFunction.perfStatistics)
+            self.qualityStats.append(wrapperFunction.rssqStatistics)
         if minimizer is None:
             msg = "*** Optimization failed."
             self.logger.error(msg, lastExcp)
@@ -227,11 +724,12 @@ class Optimizer():
         CNT = "Cnt"
         AVG = "Avg"
         IDX = "Idx"
-        totalTimes = [sum(v) for v in self.performanceStats]
-        counts = [len(v) for v in self.performanceStats]
-        averages = [np.mean(v) for v in self.performanceStats]
+        # Tracers have statistics for executions that are not kept
+        totalTimes = [t.totalDuration for t in self.tracers]
+        counts = [t.numEvaluation for t in self.tracers]
+        averages = [t.meanDuration for t in self.tracers]
         df = pd.DataFrame({
-            IDX: range(len(self.performanceStats)),
+            IDX: range(len(self.tracers)),
             TOT: totalTimes,
             CNT: counts,
             AVG: averages,
@@ -309,7 +807,10 @@ class Optimizer():
         return result
 
     @classmethod
-    def optimize(cls, function, initialParams, methods, numRestart=0, **kwargs):
+    def optimize(cls, function, initialParams, methods, numRestart=0,
+          isParallel=False, maxProcess=None, targetRssq=None,
+          startMethod=cn.START_RANDOM, seed=None, numCandidate=None,
+          **kwargs):
         """
         Parameters
         ----------
@@ -323,18 +824,110 @@ class Optimizer():
         methods: list-_helpers.OptimizerMethod
         numRestart: int
             Number of restarts with randomly chosen initial values
+        isParallel: bool
+            run the initial optimization and the restarts concurrently
+            in forked processes. Restarts are serial if fork is not
+            available (e.g., Windows).
+        maxProcess: int
+            maximum number of processes. Default is the number of CPUs
+        targetRssq: float
+            no more restarts are started once an optimization has
+            an rssq no larger than this
+        startMethod: str
+            how initial values of restarts are chosen (cn.START_METHODS)
+        seed: int
+            seed for the initial values of restarts
+        numCandidate: int
+            if larger than numRestart, the initial values of restarts
+            are the numRestart best of numCandidate values as
+            measured by one evaluation of the function
 
         Returns
         -------
         Optimizer
         """
+        def isDone(optimizer):
+            return (targetRssq is not None) and (optimizer.rssq is not None)  \
+                  and (optimizer.rssq <= targetRssq)
+        #
+        startParamsList = []
+        if numRestart > 0:
+            numStart = numRestart
+            if numCandidate is not None:
+                numStart = max(numRestart, numCandidate)
+            startParamsList = Optimizer._mkStartParams(initialParams,
+                  numStart, startMethod=startMethod, seed=seed)
+            if numStart > numRestart:
+                startParamsList = Optimizer._prescreen(function,
+                      startParamsList, numRestart,
+                      batchFunction=kwargs.get("batchFunction", None))
+        if isParallel and (numRestart > 0) and (_getForkContext() is not None):
+            return cls._optimizeParallel(function, initialParams, methods,
+                  startParamsList, isDone, maxProcess=maxProcess, **kwargs)
         bestOptimizer = cls(function, initialParams, methods, **kwargs)
         bestOptimizer.execute()
         #
-        for _ in range(numRestart):
-            newInitialParams = Optimizer._setRandomValue(initialParams)
+        for newInitialParams in startParamsList:
+            if isDone(bestOptimizer):
+                break
             newOptimizer = cls(function, newInitialParams, methods, **kwargs)
             newOptimizer.execute()
             if newOptimizer.rssq < bestOptimizer.rssq:
                 bestOptimizer = newOptimizer
         return bestOptimizer
+
+    @classmethod
+    def _optimizeParallel(cls, function, initialParams, methods,
+          startParamsList, isDone, maxProcess=None, **kwargs):
+        """
+        Runs the initial optimization and the restarts in a pool of
+        processes. Remaining optimizations are cancelled once isDone.
+        Functions that evaluate in batches are not used since
+        processes in the pool cannot create processes.
+
+        Parameters
+        ----------
+        startParamsList: list-lmfit.Parameters
+            initial values of restarts
+        isDone: Function
+            Arguments: Optimizer
+            returns bool (stop the optimizations)
+        (see optimize for other parameters)
+
+        Returns
+        -------
+        Optimizer
+            results of the optimization with the smallest rssq
+        """
+        kwargs = dict(kwargs)
+        kwargs["batchFunction"] = None
+        initialParamsList = [initialParams] + list(startParamsList)
+        numProcess = maxProcess
+        if numProcess is None:
+            numProcess = multiprocessing.cpu_count()
+        numProcess = min(numProcess, len(initialParamsList))
+        bestOptimizer = None
+        # Fork regardless of the default start method
+        pool = _getForkContext().Pool(numProcess,
+              initializer=_initializeRestartProcess,
+              initargs=(cls, function, methods, kwargs))
+        try:
+            for optimizer in pool.imap_unordered(_executeRestart,
+                  initialParamsList):
+                if optimizer.rssq is None:
+                    continue
+                if (bestOptimizer is None)  \
+                      or (optimizer.rssq < bestOptimizer.rssq):
+                    bestOptimizer = optimizer
+                if isDone(bestOptimizer):
+                    break
+        finally:
+            # Cancels optimizations that are not complete
+            pool.terminate()
+        if bestOptimizer is None:
+            # No optimization succeeded. Report errors from this process.
+            bestOptimizer = cls(function, initialParams, methods, **kwargs)
+            bestOptimizer.execute()
+        else:
+            bestOptimizer._function = function
+        return bestOptimizer
@@ -15,6 +15,14 @@ This class if provided to ParallelRunner, which runs the codes in parallel.
     runner = ParallelRunner(cls)  # cls is an AbstractRunner
     arguments = list of arguments for instances of cls
     listOfResults = runner.runSync(arguments)
+    for result in runner.runStream(arguments):
+        # Process each result as it completes
+
+    With isDynamic=True, processes take one argument at a time from a
+    shared queue. An argument whose work unit exceeds the task timeout,
+    or whose process fails, is retried in a new process. Arguments that
+    fail after the retries are abandoned. Their indices are in
+    runner.abandonedIdxs and their error messages are in runner.errorDct.
 
 Classes:
 
@@ -28,14 +36,30 @@ User must subclass and override:
         Do one work unit
 
 ParallelRunner. Runs AbstractRunners in parallel.
+
+RunnerPool. Long-lived processes that keep AbstractRunners across calls.
+Runners used with a RunnerPool must also override:
+    function: restart(numWorkUnit)
+        Prepare to do numWorkUnit more work units
 """
 
+import collections
 import multiprocessing
 import numpy as np
+import queue as qu
+import time
 from tqdm import tqdm
 
 TASK_TIMEOUT = 120  # 2 minute timeout for a task
 WORK_UNIT_DESC = "task"
+MAX_RUNNER = 10  # Maximum number of runners kept by a RunnerPool process
+MAX_RETRY = 2  # Retries of an argument by the dynamic scheduler
+POLL_INTERVAL = 1.0  # Seconds between checks for stalled processes
+# Messages from processes of the dynamic scheduler
+MSG_START = "start"  # Began an argument
+MSG_UNIT = "unit"  # Completed a work unit; payload is (unitIdx, result)
+MSG_DONE = "done"  # Completed an argument
+MSG_ERROR = "error"  # Exception; payload is the error message
 
 
 ##################### FUNCTIONS #########################
@@ -66,6 +90,91 @@ def _toplevelRunner(cls, arguments, isProgressBar, numProcess, desc, queue):
         return results
     queue.put(results)
 
+def _dynamicRunner(cls, argumentsList, taskQueue, resultQueue, workerIdx):
+    """
+    Top level function for a process of the dynamic scheduler.
+    Takes indices of arguments from taskQueue until it gets None.
+    Arguments are passed when the process is created since they
+    need not be pickleable.
+    Messages posted to resultQueue are
+    (message type, workerIdx, argumentIdx, payload).
+
+    Parameters
+    ----------
+    cls: inherits from AbstractRunner
+    argumentsList: list
+    taskQueue: multiprocessing queue
+        tasks are argumentIdx
+    resultQueue: multiprocessing queue
+    workerIdx: int
+        identifies the process
+    """
+    while True:
+        argumentIdx = taskQueue.get()
+        if argumentIdx is None:
+            break
+        resultQueue.put((MSG_START, workerIdx, argumentIdx, None))
+        try:
+            runner = cls(argumentsList[argumentIdx])
+            for unitIdx in range(runner.numWorkUnit):
+                if runner.isDone:
+                    break
+                result = runner.run()
+                resultQueue.put((MSG_UNIT, workerIdx, argumentIdx,
+                      (unitIdx, result)))
+            resultQueue.put((MSG_DONE, workerIdx, argumentIdx, None))
+        except Exception as err:
+            resultQueue.put((MSG_ERROR, workerIdx, argumentIdx, str(err)))
+
+def _persistentRunner(cls, taskQueue, resultQueue, workerIdx, maxRunner):
+    """
+    Top level function for a process in a RunnerPool. Runners are
+    kept between tasks so that their state (e.g., compiled models)
+    is reused. Messages posted to resultQueue are
+    (workerIdx, isFinal, payload, errorMsg), where payload is the list
+    of results for a final message and errorMsg is None unless
+    the task failed. A runner whose task failed is not kept.
+
+    Parameters
+    ----------
+    cls: inherits from AbstractRunner
+    taskQueue: multiprocessing queue
+        tasks are (key, argument, numWorkUnit); None ends the process.
+        argument is None if the process already has a runner for key.
+    resultQueue: multiprocessing queue
+    workerIdx: int
+        index of the process in the pool
+    maxRunner: int
+        maximum number of runners kept
+    """
+    runnerDct = collections.OrderedDict()
+    while True:
+        task = taskQueue.get()
+        if task is None:
+            break
+        key, argument, numWorkUnit = task
+        results = []
+        errorMsg = None
+        try:
+            if argument is not None:
+                runnerDct[key] = cls(argument)
+                if len(runnerDct) > maxRunner:
+                    _ = runnerDct.popitem(last=False)
+            elif key not in runnerDct:
+                raise RuntimeError("No runner for key %s." % str(key))
+            runnerDct.move_to_end(key)
+            runner = runnerDct[key]
+            runner.restart(numWorkUnit)
+            for _ in range(numWorkUnit):
+                if runner.isDone:
+                    break
+                results.append(runner.run())
+                resultQueue.put((workerIdx, False, None, None))
+        except Exception as err:
+            _ = runnerDct.pop(key, None)
+            errorMsg = str(err)
+        resultQueue.put((workerIdx, True, results, errorMsg))
+
 
 ##################### CLASSES #########################
 class AbstractRunner(object):
@@ -104,6 +213,17 @@ class AbstractRunner(object):
         """
         raise RuntimeError("Must override.")
 
+    def restart(self, numWorkUnit):
+        """
+        Prepares a runner kept by a RunnerPool for more work.
+
+        Parameters
+        ----------
+        numWorkUnit: int
+            number of work units to be processed
+        """
+        raise RuntimeError("Must override.")
+
 
 class RunnerManager():
     """Manages runners for a process. There is a runner for each argument."""
@@ -196,7 +316,8 @@ class ParallelRunner():
     """
 
     def __init__(self, cls, maxProcess=None,
-           taskTimeout=TASK_TIMEOUT, desc=WORK_UNIT_DESC, isProgressBar=True):
+           taskTimeout=TASK_TIMEOUT, desc=WORK_UNIT_DESC, isProgressBar=True,
+           isDynamic=False, maxRetry=MAX_RETRY):
         """
         Parameters
         ----------
@@ -204,11 +325,16 @@ class ParallelRunner():
         maxProcess: int
             maximum number of concurrent tasks
         taskTimeout: float
-            maximum runtime for a task
+            maximum runtime for a task. For isDynamic, maximum
+            runtime for a work unit.
         desc: str
             description of the work unit
         isProgressBar: bool
             display the progress bar
+        isDynamic: bool
+            processes take arguments from a shared queue
+        maxRetry: int
+            number of times an argument is retried if isDynamic
         """
         self.cls = cls
         self.taskTimeout = taskTimeout
@@ -218,6 +344,11 @@ class ParallelRunner():
         self.maxProcess = min(maxProcess, multiprocessing.cpu_count())
         self.processes = []
         self._isProgressBar = isProgressBar
+        self.isDynamic = isDynamic
+        self.maxRetry = maxRetry
+        # Results of the last run by the dynamic scheduler
+        self.abandonedIdxs = []  # Indices of arguments not completed
+        self.errorDct = {}  # key: argumentIdx, value: list-str errors
 
     def _mkArgumentsCollections(self, arguments):
         """
@@ -259,7 +390,11 @@ class ParallelRunner():
             list of results
         """
         results = []
-        if isParallel:
+        self.abandonedIdxs = []
+        self.errorDct = {}
+        if isParallel and self.isDynamic:
+            results = self._runDynamic(argumentsList, isProgressBar)
+        elif isParallel:
             self.processes = []
             queue = multiprocessing.Queue()
             # Start the processes
@@ -290,3 +425,356 @@ class ParallelRunner():
             results = _toplevelRunner(self.cls, argumentsList,
                 isProgressBar, numProcess, self.desc, None)
         return results
+
+    def runStream(self, argumentsList, isParallel=True, isProgressBar=True):
+        """
+        Runs the function for each of the arguments, providing each
+        result as soon as it is available. Parallel execution uses
+        the dynamic scheduler. Processes are ended if the caller stops
+        iterating.
+
+        Parameters
+        ----------
+        argumentsList: List
+        isParallel: True
+            runs the function in parallel
+        isProgressBar: bool
+            display the progress bar
+
+        Returns
+        -------
+        generator
+            results of work units in order of completion
+        """
+        self.abandonedIdxs = []
+        self.errorDct = {}
+        if isParallel:
+            for _, result in self._streamDynamic(argumentsList, isProgressBar):
+                yield result
+        else:
+            for argument in tqdm(argumentsList, desc=self.desc,
+                  disable=not isProgressBar):
+                runner = self.cls(argument)
+                for _ in range(runner.numWorkUnit):
+                    if runner.isDone:
+                        break
+                    yield runner.run()
+
+    def _runDynamic(self, argumentsList, isProgressBar):
+        """
+        Runs the arguments using the dynamic scheduler.
+
+        Parameters
+        ----------
+        argumentsList: List
+        isProgressBar: bool
+            display the progress bar; progress is by argument
+
+        Returns
+        -------
+        list
+            results in the order of argumentsList
+        """
+        resultsList = [[] for _ in range(len(argumentsList))]
+        for argumentIdx, result in self._streamDynamic(argumentsList,
+              isProgressBar):
+            resultsList[argumentIdx].append(result)
+        results = []
+        _ = [results.extend(r) for r in resultsList]
+        return results
+
+    def _streamDynamic(self, argumentsList, isProgressBar):
+        """
+        Runs the arguments on processes that take arguments from a shared
+        queue. A process that does not complete a work unit within
+        the task timeout is replaced, and its argument is retried.
+        A retried argument only provides results for the work units
+        not already provided. Arguments that are not completed are
+        recorded in self.abandonedIdxs, and errors are recorded in
+        self.errorDct.
+
+        Parameters
+        ----------
+        argumentsList: List
+        isProgressBar: bool
+            display the progress bar; progress is by argument
+
+        Returns
+        -------
+        generator
+            (index of argument, result of work unit)
+        """
+        numArgument = len(argumentsList)
+        isDones = [False for _ in range(numArgument)]
+        numTries = [0 for _ in range(numArgument)]
+        numYields = [0 for _ in range(numArgument)]  # Results provided
+        self.abandonedIdxs = []
+        self.errorDct = {}
+        taskQueue = multiprocessing.Queue()
+        resultQueue = multiprocessing.Queue()
+        for argumentIdx in range(numArgument):
+            taskQueue.put(argumentIdx)
+        processDct = {}  # key: workerIdx, value: process
+        activeDct = {}  # key: workerIdx, value: [argumentIdx, time of message]
+        def startProcess(workerIdx):
+            process = multiprocessing.Process(target=_dynamicRunner,
+                  args=(self.cls, argumentsList, taskQueue, resultQueue,
+                  workerIdx,))
+            process.start()
+            processDct[workerIdx] = process
+        #
+        numProcess = min(numArgument, self.maxProcess)
+        for workerIdx in range(numProcess):
+            startProcess(workerIdx)
+        nextWorkerIdx = numProcess
+        progressBar = tqdm(total=numArgument, desc=self.desc,
+              disable=not isProgressBar)
+        numDone = 0
+        lastMsgTime = time.time()
+        def retry(argumentIdx, msg):
+            """Returns the number of arguments that are abandoned."""
+            numTries[argumentIdx] += 1
+            self.errorDct.setdefault(argumentIdx, []).append(msg)
+            if numTries[argumentIdx] > self.maxRetry:
+                isDones[argumentIdx] = True
+                self.abandonedIdxs.append(argumentIdx)
+                progressBar.update(1)
+                return 1
+            taskQueue.put(argumentIdx)
+            return 0
+        #
+        try:
+            while numDone < numArgument:
+                try:
+                    msgType, workerIdx, argumentIdx, payload = resultQueue.get(
+                          timeout=POLL_INTERVAL)
+                except qu.Empty:
+                    msgType = None
+                now = time.time()
+                if msgType is not None:
+                    lastMsgTime = now
+                elif (len(activeDct) == 0)  \
+                      and (now - lastMsgTime > self.taskTimeout):
+                    # No process is working on the remaining arguments
+                    for idx in range(numArgument):
+                        if not isDones[idx]:
+                            self.errorDct.setdefault(idx, []).append(
+                                  "no progress")
+                            self.abandonedIdxs.append(idx)
+                    break
+                if (msgType is not None) and (workerIdx in processDct):
+                    if msgType in [MSG_START, MSG_UNIT]:
+                        activeDct[workerIdx] = [argumentIdx, now]
+                    if msgType == MSG_UNIT:
+                        unitIdx, result = payload
+                        if (not isDones[argumentIdx])  \
+                              and (unitIdx >= numYields[argumentIdx]):
+                            numYields[argumentIdx] += 1
+                            yield argumentIdx, result
+                    elif msgType == MSG_DONE:
+                        del activeDct[workerIdx]
+                        if not isDones[argumentIdx]:
+                            isDones[argumentIdx] = True
+                            numDone += 1
+                            progressBar.update(1)
+                    elif msgType == MSG_ERROR:
+                        del activeDct[workerIdx]
+                        numDone += retry(argumentIdx, payload)
+                # Replace processes that are stalled or have died
+                for workerIdx, process in list(processDct.items()):
+                    isStalled = False
+                    if workerIdx in activeDct:
+                        argumentIdx, lastTime = activeDct[workerIdx]
+                        isStalled = now - lastTime > self.taskTimeout
+                    if isStalled or (not process.is_alive()):
+                        process.terminate()
+                        del processDct[workerIdx]
+                        if workerIdx in activeDct:
+                            del activeDct[workerIdx]
+                            numDone += retry(argumentIdx, "timeout")
+                        startProcess(nextWorkerIdx)
+                        nextWorkerIdx += 1
+        finally:
+            progressBar.close()
+            # End the processes
+            for _ in processDct:
+                taskQueue.put(None)
+            for process in processDct.values():
+                if numDone < numArgument:
+                    # Stopped early
+                    process.terminate()
+                process.join(timeout=1)
+                if process.is_alive():
+                    process.terminate()
+
+
+class RunnerPool():
+
+    """
+    Long-lived processes that run AbstractRunners. A runner is constructed
+    once in a process for a key and is reused by later calls with the
+    same key. Arguments are pickled to the processes. Fitters in
+    arguments are copied unless the caller has done
+    shareObservedData.
+
+        Usage
+        -----
+        pool = RunnerPool(cls)
+        listOfResults = pool.runSync(key, mkArgument, numWorkUnit)
+        pool.close()
+    """
+
+    def __init__(self, cls, maxProcess=None,
+           taskTimeout=TASK_TIMEOUT, desc=WORK_UNIT_DESC, maxRunner=MAX_RUNNER):
+        """
+        Parameters
+        ----------
+        cls: Inherits from AbstractRunner
+        maxProcess: int
+            number of processes
+        taskTimeout: float
+            maximum runtime for a work unit
+        desc: str
+            description of the work unit
+        maxRunner: int
+            maximum number of runners kept by a process
+        """
+        self.cls = cls
+        self.taskTimeout = taskTimeout
+        self.desc = desc
+        if maxProcess is None:
+            maxProcess = multiprocessing.cpu_count()
+        self.maxProcess = min(maxProcess, multiprocessing.cpu_count())
+        self.maxRunner = maxRunner
+        self.resultQueue = multiprocessing.Queue()
+        self.taskQueues = []
+        self.processes = []
+        # Keys of the runners kept by each process in least recently used order
+        self._keyDcts = []
+        for idx in range(self.maxProcess):
+            taskQueue = multiprocessing.Queue()
+            process = multiprocessing.Process(target=_persistentRunner,
+                  args=(self.cls, taskQueue, self.resultQueue, idx,
+                  self.maxRunner,))
+            process.start()
+            self.taskQueues.append(taskQueue)
+            self.processes.append(process)
+            self._keyDcts.append(collections.OrderedDict())
+
+    @property
+    def isAlive(self):
+        """
+        Returns
+        -------
+        bool: all processes are running
+        """
+        if len(self.processes) == 0:
+            return False
+        return all([p.is_alive() for p in self.processes])
+
+    def _submit(self, workerIdx, key, mkArgument, numWorkUnit):
+        """
+        Sends a task to a process. The argument is only sent if
+        the process does not have a runner for the key.
+        """
+        keyDct = self._keyDcts[workerIdx]
+        if key in keyDct:
+            argument = None
+        else:
+            argument = mkArgument()
+            keyDct[key] = None
+            if len(keyDct) > self.maxRunner:
+                _ = keyDct.popitem(last=False)
+        keyDct.move_to_end(key)
+        self.taskQueues[workerIdx].put((key, argument, numWorkUnit))
+
+    def runSync(self, key, mkArgument, numWorkUnit, numProcess=None,
+          isProgressBar=True):
+        """
+        Runs work units for the runner identified by key.
+        The caller waits for completion.
+
+        Parameters
+        ----------
+        key: hashable
+            identifies the runner. Must change if the argument changes.
+        mkArgument: Function
+            no arguments; constructs the argument for cls.
+            Only called if a process does not have a runner for key.
+        numWorkUnit: int
+            total number of work units, divided among the processes
+        numProcess: int
+            maximum number of processes used. Default: all
+        isProgressBar: bool
+            display the progress bar
+
+        Returns
+        -------
+        list
+            list of results
+
+        Raises
+        ------
+        RuntimeError: a task failed or timed out
+        """
+        if not self.isAlive:
+            raise RuntimeError("RunnerPool is closed.")
+        if numProcess is None:
+            numProcess = self.maxProcess
+        numProcess = min(numWorkUnit, numProcess, self.maxProcess)
+        argument = []
+        def mkArgumentOnce():
+            if len(argument) == 0:
+                argument.append(mkArgument())
+            return argument[0]
+        #
+        for idx in range(numProcess):
+            size = numWorkUnit // numProcess
+            if idx < numWorkUnit % numProcess:
+                size += 1
+            self._submit(idx, key, mkArgumentOnce, size)
+        # Wait for the results
+        results = []
+        progressBar = tqdm(total=numWorkUnit, desc=self.desc,
+              disable=not isProgressBar)
+        numFinal = 0
+        errorMsgs = []
+        try:
+            while numFinal < numProcess:
+                workerIdx, isFinal, payload, errorMsg =  \
+                      self.resultQueue.get(timeout=self.taskTimeout)
+                if isFinal:
+                    numFinal += 1
+                    results.extend(payload)
+                    if errorMsg is not None:
+                        # The process does not have a runner for key
+                        _ = self._keyDcts[workerIdx].pop(key, None)
+                        errorMsgs.append(errorMsg)
+                else:
+                    progressBar.update(1)
+        except qu.Empty:
+            # The state of the processes is unknown
+            progressBar.close()
+            self.close()
+            raise RuntimeError("RunnerPool task timed out after %f seconds."
+                  % self.taskTimeout)
+        progressBar.close()
+        if len(errorMsgs) > 0:
+            raise RuntimeError("RunnerPool task failed: %s"
+                  % "; ".join(errorMsgs))
+        return results
+
+    def close(self):
+        """
+        Ends the processes.
+        """
+        for taskQueue, process in zip(self.taskQueues, self.processes):
+            if process.is_alive():
+                taskQueue.put(None)
+        for process in self.processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+        self.taskQueues = []
+        self._keyDcts = []
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+ Created on October 18, 2026
+
+Binds parameter names to the storage of a roadrunner model so that
+values can be set without looking up names on each simulation.
+Global parameters are set with a single call to
+setGlobalParameterValues using their indices in the model. Other
+names (e.g., species and compartments) are set by name.
+
+    Usage
+    -----
+    binding = ParameterBinding(roadrunner, ["k1", "k2"])
+    roadrunner.reset()
+    binding.setValues([1.0, 2.0])
+"""
+
+from SBstoat.logs import Logger
+
+import lmfit
+import numpy as np
+
+
+class ParameterBinding():
+
+    def __init__(self, roadrunner, names:list, logger:Logger=Logger()):
+        """
+        Parameters
+        ----------
+        roadrunner: ExtendedRoadRunner
+        names: list-str
+            parameter names in the order of the values to be set
+        logger: Logger
+        """
+        self.roadrunner = roadrunner
+        self.names = list(names)
+        self.logger = logger
+        globalIds = list(self.roadrunner.model.getGlobalParameterIds())
+        # Indices in names and in the model of global parameters
+        self._globalPositionArr = np.array([p for p, n in
+              enumerate(self.names) if n in globalIds], dtype=int)
+        self._globalIdxArr = np.array([globalIds.index(self.names[p])
+              for p in self._globalPositionArr], dtype=np.int32)
+        # Positions in names of other values
+        self._otherPositions = [p for p, n in enumerate(self.names)
+              if n not in globalIds]
+
+    def isBound(self, roadrunner, names:list)->bool:
+        """
+        Checks if the binding applies to the roadrunner model and names.
+
+        Parameters
+        ----------
+        roadrunner: ExtendedRoadRunner
+        names: list-str
+
+        Returns
+        -------
+        bool
+        """
+        return (roadrunner is self.roadrunner) and (list(names) == self.names)
+
+    def getValues(self, parameters)->np.ndarray:
+        """
+        Extracts the values of the bound names.
+
+        Parameters
+        ----------
+        parameters: lmfit.Parameters/dict/pd.Series
+
+        Returns
+        -------
+        np.ndarray
+        """
+        if isinstance(parameters, lmfit.Parameters):
+            return np.array([parameters[n].value for n in self.names],
+                  dtype=float)
+        return np.array([parameters[n] for n in self.names], dtype=float)
+
+    def setValues(self, values):
+        """
+        Sets values in the roadrunner model.
+
+        Parameters
+        ----------
+        values: np.ndarray
+            values in the order of names
+        """
+        values = np.asarray(values, dtype=float)
+        if len(self._globalIdxArr) > 0:
+            self.roadrunner.model.setGlobalParameterValues(self._globalIdxArr,
+                  values[self._globalPositionArr])
+        for position in self._otherPositions:
+            name = self.names[position]
+            try:
+                self.roadrunner.model[name] = values[position]
+            except Exception as err:
+                msg = "_parameterBinding.setValues: Could not set value for %s"  \
+                      % name
+                self.logger.error(msg, err)
@@ -22,6 +22,20 @@ an instance of an AbstractServer.
         listOfResults = manager.submit(arguments)
         user processes results
     manager.stop()
+
+Initial arguments are pickled if processes are not created by fork.
+Fitters in initial arguments are copied unless the caller has done
+shareObservedData.
+
+Work can also be submitted without waiting for results. submitAsync
+returns a ServerFuture for each work unit, and the client does other
+work while the servers run.
+
+    Usage
+    -----
+    futures = manager.submitAsync(arguments)
+    user does other work
+    listOfResults = manager.gather(futures)
 """
 
 from SBstoat.logs import Logger
@@ -77,6 +91,59 @@ class AbstractServer(multiprocessing.Process):
         raise RuntimeError("Must override.")
 
 
+class ServerFuture():
+
+    """
+    Result of a work unit submitted to a server. Results are obtained
+    from the ServerManager, which reads the output queue of the server
+    in the order in which work units were submitted.
+    """
+
+    def __init__(self, manager, serverIdx, sequence):
+        """
+        Parameters
+        ----------
+        manager: ServerManager
+        serverIdx: int
+            index of the server that does the work unit
+        sequence: int
+            position of the work unit among those submitted to the server
+        """
+        self.manager = manager
+        self.serverIdx = serverIdx
+        self.sequence = sequence
+        self._isResult = False
+        self._result = None
+
+    def done(self)->bool:
+        """
+        Checks if the result is available without waiting.
+
+        Returns
+        -------
+        bool
+        """
+        return self._isResult or self.manager._isDone(self)
+
+    def result(self, timeout=TIMEOUT):
+        """
+        Waits for the result of the work unit.
+
+        Parameters
+        ----------
+        timeout: float
+            seconds to wait for the result
+
+        Returns
+        -------
+        object (None if the server does not respond)
+        """
+        if not self._isResult:
+            self._result = self.manager._getResult(self, timeout=timeout)
+            self._isResult = True
+        return self._result
+
+
 class ServerManager():
 
     """
@@ -102,6 +169,57 @@ class ServerManager():
               self.outputQs[i], logger=self.logger, **kwargs)
               for i in range(self.numProcess)]
         _ = [s.start() for s in self.servers]
+        # Bookkeeping for futures of each server
+        self._numSubmitteds = [0]*self.numProcess  # Work units submitted
+        self._numReads = [0]*self.numProcess  # Results read from the queue
+        # key: sequence; value: result read before it is requested
+        self._resultDcts = [{} for _ in range(self.numProcess)]
+        # Sequences whose results timed out. Late results are discarded.
+        self._abandonedSets = [set() for _ in range(self.numProcess)]
+
+    def submitAsync(self, arguments, serverIdxs=None):
+        """
+        Submits work units to servers without waiting for results.
+
+        Parameters
+        ----------
+        arguments: list-workRequest
+            each element results corresponds to a separate server
+        serverIdxs: list-int
+            indices of the servers for the arguments.
+            Default is the first len(arguments) servers.
+
+        Returns
+        -------
+        list-ServerFuture
+        """
+        if serverIdxs is None:
+            serverIdxs = range(len(arguments))
+        futures = []
+        for serverIdx, argument in zip(serverIdxs, arguments):
+            self.inputQs[serverIdx].put(argument)
+            futures.append(ServerFuture(self, serverIdx,
+                  self._numSubmitteds[serverIdx]))
+            self._numSubmitteds[serverIdx] += 1
+        return futures
+
+    def gather(self, futures, timeout=TIMEOUT):
+        """
+        Waits for the results of futures. If a server does not respond,
+        a None is inserted.
+
+        Parameters
+        ----------
+        futures: list-ServerFuture
+        timeout: float
+            seconds to wait for each result
+
+        Returns
+        -------
+        list
+            list of results in the order of futures
+        """
+        return [f.result(timeout=timeout) for f in futures]
 
     def submit(self, arguments):
         """
@@ -118,17 +236,54 @@ class ServerManager():
         list
             list of results
         """
-        results = []
-        for idx, argument in enumerate(arguments):
-            self.inputQs[idx].put(argument)
-        for queue in self.outputQs:
+        return self.gather(self.submitAsync(arguments))
+
+    def _readResult(self, serverIdx, **kwargs):
+        """
+        Reads the next result of a server from its output queue.
+        Results of abandoned work units are discarded.
+
+        Parameters
+        ----------
+        serverIdx: int
+        kwargs: dict
+            arguments for queue.get
+
+        Raises
+        ------
+        queue.Empty: no result is available
+        """
+        result = self.outputQs[serverIdx].get(**kwargs)
+        sequence = self._numReads[serverIdx]
+        self._numReads[serverIdx] += 1
+        if sequence in self._abandonedSets[serverIdx]:
+            self._abandonedSets[serverIdx].remove(sequence)
+        else:
+            self._resultDcts[serverIdx][sequence] = result
+
+    def _isDone(self, future)->bool:
+        resultDct = self._resultDcts[future.serverIdx]
+        while (future.sequence not in resultDct)  \
+              and (self._numReads[future.serverIdx] <= future.sequence):
+            try:
+                self._readResult(future.serverIdx, block=False)
+            except Exception:
+                return False
+        return True
+
+    def _getResult(self, future, timeout=TIMEOUT):
+        serverIdx = future.serverIdx
+        resultDct = self._resultDcts[serverIdx]
+        while (future.sequence not in resultDct)  \
+              and (self._numReads[serverIdx] <= future.sequence):
             try:
-                result = queue.get(timeout=TIMEOUT)
+                self._readResult(serverIdx, timeout=timeout)
             except Exception as err:
-                self.logger.error("Timeout in %s" % self.name, err)
-                result = None
-            results.append(result)
-        return results
+                self.logger.error("Timeout in %s" % self.servers[serverIdx].name,
+                      err)
+                self._abandonedSets[serverIdx].add(future.sequence)
+                resultDct[future.sequence] = None
+        return resultDct.pop(future.sequence, None)
 
     def stop(self):
         """
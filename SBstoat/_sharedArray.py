@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+ Created on October 18, 2026
+
+A numpy array backed by shared memory (multiprocessing.shared_memory).
+Pickling a SharedArray sends only the name, shape, and dtype of the
+block, and unpickling attaches to the block without copying. So,
+processes that receive a SharedArray in their arguments or through
+queues use the same memory as the creating process. Arrays in
+attached processes are read-only.
+
+The SharedArray that created the block owns it and removes it with
+unlink or when it is garbage collected. Copies attach to the block.
+Processes created by fork have the object of the creating process,
+but do not own the block.
+
+    Usage
+    -----
+    sharedArray = SharedArray(arr)
+    arr = sharedArray.array  # View of the shared memory
+    sharedArray.unlink()
+"""
+
+from multiprocessing import shared_memory
+import numpy as np
+import os
+
+
+def _attach(name:str)->shared_memory.SharedMemory:
+    """
+    Attaches to an existing block. Processes started by multiprocessing
+    use the resource tracker of the creating process, which already
+    has the block.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # track is available in python 3.13 and later
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedArray():
+
+    def __init__(self, arr:np.ndarray):
+        """
+        Parameters
+        ----------
+        arr: np.ndarray
+            values copied into a new block of shared memory
+        """
+        arr = np.ascontiguousarray(arr)
+        self.shape = arr.shape
+        self.dtype = arr.dtype
+        self._ownerPid = os.getpid()
+        self._isCreator = True  # This object created the block
+        self._isUnlinked = False
+        # Blocks cannot have size 0
+        self._sharedMemory = shared_memory.SharedMemory(create=True,
+              size=max(arr.nbytes, 1))
+        self.name = self._sharedMemory.name
+        self.array = np.ndarray(self.shape, dtype=self.dtype,
+              buffer=self._sharedMemory.buf)
+        self.array[...] = arr
+
+    @property
+    def isOwner(self)->bool:
+        """
+        True if this object created the block in this process.
+        """
+        return self._isCreator and (self._ownerPid == os.getpid())
+
+    def __getstate__(self):
+        return dict(name=self.name, shape=self.shape, dtype=self.dtype.str,
+              ownerPid=self._ownerPid)
+
+    def __setstate__(self, state):
+        self.name = state["name"]
+        self.shape = tuple(state["shape"])
+        self.dtype = np.dtype(state["dtype"])
+        self._ownerPid = state["ownerPid"]
+        self._isCreator = False
+        self._isUnlinked = False
+        try:
+            self._sharedMemory = _attach(self.name)
+        except FileNotFoundError:
+            # The block no longer exists (e.g., a serialization in a file)
+            self._sharedMemory = None
+            self.array = None
+            return
+        self.array = np.ndarray(self.shape, dtype=self.dtype,
+              buffer=self._sharedMemory.buf)
+        self.array.flags.writeable = False
+
+    def attach(self)->'SharedArray':
+        """
+        Creates a SharedArray that uses the block of this one but
+        does not own it.
+
+        Returns
+        -------
+        SharedArray
+        """
+        newSharedArray = self.__class__.__new__(self.__class__)
+        newSharedArray.__setstate__(self.__getstate__())
+        return newSharedArray
+
+    def unlink(self):
+        """
+        Removes the name of the block if this process owns it so that
+        no more processes can attach. Memory is released when no array
+        uses it.
+        """
+        if self.isOwner and (not self._isUnlinked)  \
+              and (self._sharedMemory is not None):
+            self._sharedMemory.unlink()
+        self._isUnlinked = True
+
+    def __del__(self):
+        try:
+            self.unlink()
+        except Exception:
+            pass
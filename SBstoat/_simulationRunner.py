@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+ Created on October 18, 2026
+
+Runs simulations for a matrix of parameter values, accumulating
+the results in a TimeseriesStatistic. Batches of rows of the matrix
+are work units so that simulations can be spread across processes.
+A runner loads its roadrunner model once for all of its batches.
+Models come from _modelCache so that they are not compiled again.
+"""
+
+from SBstoat._parallelRunner import AbstractRunner
+from SBstoat.namedTimeseries import NamedTimeseries
+from SBstoat.timeseriesStatistic import TimeseriesStatistic
+
+import numpy as np
+
+
+class SimulationRunnerArgument():
+    """ Arguments passed to SimulationRunner. """
+
+    def __init__(self, fitter, parameterNames:list, parameterArr:np.ndarray,
+          numPoint:int=100, batchSize:int=100, percentiles:list=None):
+        """
+        Parameters
+        ----------
+        fitter: ModelFitterCore
+        parameterNames: list-str
+        parameterArr: np.ndarray
+            rows are samples; columns are in the order of parameterNames
+        numPoint: int
+            number of points in a simulation
+        batchSize: int
+            number of simulations in a work unit
+        percentiles: list-float
+            percentiles calculated by the TimeseriesStatistic
+        """
+        self.fitter = fitter.copy(isLightweight=True)
+        self.parameterNames = list(parameterNames)
+        self.parameterArr = np.array(parameterArr)
+        self.numPoint = numPoint
+        self.batchSize = batchSize
+        self.percentiles = percentiles
+
+
+class SimulationRunner(AbstractRunner):
+    """
+    A work unit simulates a batch of rows of the parameter matrix and
+    returns a TimeseriesStatistic for the batch. Results are combined
+    with TimeseriesStatistic.merge.
+    """
+
+    def __init__(self, runnerArgument):
+        """
+        Parameters
+        ----------
+        runnerArgument: SimulationRunnerArgument
+        """
+        super().__init__()
+        self.fitter = runnerArgument.fitter
+        # The lightweight copy has an antimony model in _modelCache
+        self.fitter.initializeRoadRunnerModel()
+        self.numPoint = runnerArgument.numPoint
+        self.percentiles = runnerArgument.percentiles
+        self.parameterNames = runnerArgument.parameterNames
+        numBatch = max(1, int(np.ceil(len(runnerArgument.parameterArr)
+              /runnerArgument.batchSize)))
+        self.batches = np.array_split(runnerArgument.parameterArr, numBatch)
+        self.batchIdx = 0
+
+    @property
+    def numWorkUnit(self):
+        return len(self.batches)
+
+    @property
+    def isDone(self):
+        return self.batchIdx >= len(self.batches)
+
+    def run(self):
+        """
+        Simulates the next batch of parameter values.
+
+        Returns
+        -------
+        TimeseriesStatistic
+        """
+        batch = self.batches[self.batchIdx]
+        self.batchIdx += 1
+        statistic = None
+        for values in batch:
+            params = dict(zip(self.parameterNames, values))
+            fittedTS = NamedTimeseries(namedArray=self.fitter._simulateNumpy(
+                  params=params, numPoint=self.numPoint))
+            if statistic is None:
+                statistic = TimeseriesStatistic(fittedTS,
+                      percentiles=self.percentiles)
+            statistic.accumulate(fittedTS)
+        return statistic
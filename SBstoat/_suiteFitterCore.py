@@ -8,13 +8,16 @@ A parameter collection is a collection of parameters.
 
 from SBstoat import _constants as cn
 from SBstoat.modelFitter import ModelFitter
+from SBstoat._modelScheduler import ModelScheduler
 from SBstoat._optimizer import Optimizer
 from SBstoat.logs import Logger
 from SBstoat._serverManager import AbstractServer, ServerManager
 
 import matplotlib.pyplot as plt
+import multiprocessing
 import numpy as np
 import lmfit
+import time
 
 
 class _Parameter():
@@ -137,6 +140,24 @@ class ResidualsServer(AbstractServer):
         """
         super().__init__(fitter, inputQ, outputQ, logger=logger)
         self.fitter = fitter
+
+    @staticmethod
+    def calcResiduals(fitter, params):
+        """
+        Calculates residuals normalized by their number.
+
+        Parameters
+        ----------
+        fitter: ModelFitter
+        params: lmfit.parameters
+
+        Returns
+        -------
+        np.array: residuals
+        """
+        fitter.initializeRoadRunnerModel()
+        residuals = fitter.calcResiduals(params)
+        return residuals/np.size(residuals)
    
     def runFunction(self, params):
         """
@@ -150,15 +171,67 @@ class ResidualsServer(AbstractServer):
         -------
         np.array: residuals
         """
-        self.fitter.initializeRoadRunnerModel()
-        residuals = self.fitter.calcResiduals(params)
-        return residuals/np.size(residuals)
+        return self.calcResiduals(self.fitter, params)
+
+
+class MultiResidualsServer(AbstractServer):
+
+    """
+    Server that hosts the fitters of all models in a suite and
+    calculates residuals for the models in a work unit. The models
+    done by a server can change between work units. Roadrunner models
+    are only constructed for the models that a server does.
+
+    server = MultiResidualsServer(fitters, inputQ, outputQ)
+    server.run()
+    while not done:
+        inputQ.put([(modelIdx, params), ...])
+        results = outputQ.get()  # [(residualsArr, duration), ...]
+    server.terminate()
+    """
+
+    def __init__(self, fitters, inputQ, outputQ, logger=Logger()):
+        """
+        Parameters
+        ----------
+        fitters: list-ModelFitter
+            cannot have swig objects (e.g., roadrunner)
+        inputQ: multiprocessing.queue
+        outputQ: multiprocessing.queue
+        logger: Logger
+        """
+        super().__init__(fitters, inputQ, outputQ, logger=logger)
+        self.fitters = fitters
+
+    def runFunction(self, workUnit):
+        """
+        
+        Parameters
+        ----------
+        workUnit: list-(int, lmfit.parameters)
+            index of the model and its parameters
+        
+        Returns
+        -------
+        list-(np.array, float)
+            residuals and seconds of simulation for each model
+        """
+        results = []
+        for modelIdx, params in workUnit:
+            fitter = self.fitters[modelIdx]
+            # Loading the model is not part of its cost
+            fitter.initializeRoadRunnerModel()
+            startTime = time.perf_counter()
+            residuals = ResidualsServer.calcResiduals(fitter, params)
+            results.append((residuals, time.perf_counter() - startTime))
+        return results
 
 
 class SuiteFitterCore():
 
     def __init__(self, modelFitters, modelNames=None, modelWeights=None,
-          fitterMethods=None, numRestart=0, isParallel=False, logger=Logger()):
+          fitterMethods=None, numRestart=0, isParallel=False,
+          maxProcess=None, logger=Logger()):
         """
         Parameters
         ----------
@@ -172,6 +245,10 @@ class SuiteFitterCore():
             initial values for parameters to fit.
         isParallel: bool
             runs each fitter in parallel
+        maxProcess: int
+            maximum number of processes used if isParallel.
+            Models are packed onto processes by their simulation times.
+            Default: numCPU
         logger: Logger
 
         Raises
@@ -187,6 +264,7 @@ class SuiteFitterCore():
             self.modelNames = [str(v) for v in range(len(modelSpecifications))]
         self._numRestart = numRestart
         self._isParallel = isParallel
+        self._maxProcess = maxProcess
         self.logger = logger
         # Validation checks
         if self.numModel != len(self.modelNames):
@@ -204,6 +282,7 @@ class SuiteFitterCore():
         self.residualsServers = [ResidualsServer(f, None, None,
               logger=self.logger) for f in self.fitterDct.values()]
         self.manager = None
+        self.scheduler = None
         # Results
         self.optimizer = None
 
@@ -217,6 +296,20 @@ class SuiteFitterCore():
         if self.manager is not None:
             self.manager.stop()
 
+    def _startServers(self):
+        """
+        Starts servers that do simulations in parallel. Each server
+        hosts all fitters so that models can be moved between servers.
+        """
+        maxProcess = self._maxProcess
+        if maxProcess is None:
+            maxProcess = multiprocessing.cpu_count()
+        self.scheduler = ModelScheduler(self.numModel, maxProcess)
+        fitters = [f.copy(isLightweight=True)
+              for f in self.fitterDct.values()]
+        self.manager = ServerManager(MultiResidualsServer,
+              [fitters]*self.scheduler.numWorker, logger=self.logger)
+
     def _calcResiduals(self, parameters):
         """
         Calculates the residuals for models in the suite. The residuals are the
@@ -233,16 +326,40 @@ class SuiteFitterCore():
             residuals for each model
         """
         self.parameterManager.updateValues(parameters)
-        residualsCollection = []
-        parametersList = [self.parameterManager.mkParameters(modelName=n)
-              for n in self.fitterDct.keys()]
         if self._isParallel and (self.manager is not None):
-            residualsCollection = self.manager.submit(parametersList)
+            # Submit the models of each server as soon as their parameters
+            # are constructed so that bookkeeping overlaps with running
+            # simulations
+            modelNames = list(self.fitterDct.keys())
+            assignments = self.scheduler.assignments
+            futures = []
+            for serverIdx, modelIdxs in enumerate(assignments):
+                workUnit = [(i, self.parameterManager.mkParameters(
+                      modelName=modelNames[i])) for i in modelIdxs]
+                futures.extend(self.manager.submitAsync([workUnit],
+                      serverIdxs=[serverIdx]))
+            # Normalize results as they are received
+            normalizedCollection = [None]*self.numModel
+            measuredIdxs = []
+            durations = []
+            for modelIdxs, future in zip(assignments, futures):
+                results = future.result()
+                if results is None:
+                    msg = "Server failed to calculate residuals for models %s."
+                    raise RuntimeError(msg % str(modelIdxs))
+                for modelIdx, (residuals, duration) in zip(modelIdxs, results):
+                    normalizedCollection[modelIdx] =  \
+                          self.modelWeights[modelIdx]*residuals
+                    measuredIdxs.append(modelIdx)
+                    durations.append(duration)
+            self.scheduler.recordCosts(measuredIdxs, durations)
         else:
+            parametersList = [self.parameterManager.mkParameters(modelName=n)
+                  for n in self.fitterDct.keys()]
             residualsCollection = [s.runFunction(p) for s, p in 
                   zip(self.residualsServers, parametersList)]
-        normalizedCollection = [w*a for w, a in zip(self.modelWeights,
-              residualsCollection)]
+            normalizedCollection = [w*a for w, a in zip(self.modelWeights,
+                  residualsCollection)]
         return normalizedCollection
 
     def calcResiduals(self, parameters):
@@ -284,9 +401,7 @@ class SuiteFitterCore():
             initialParameters = params.copy()
         # Setup parallel servers if needed
         if self._isParallel:
-            fitters = [f.copy() for f in self.fitterDct.values()]
-            self.manager = ServerManager(ResidualsServer, fitters,
-                  logger=self.logger)
+            self._startServers()
         # Do the optimization
         self.optimizer = Optimizer.optimize(self.calcResiduals, initialParameters,
               self._fitterMethods, logger=self.logger, isCollect=True,
@@ -131,11 +131,12 @@ class SuiteFitterCrossValidator(SuiteFitterCore, AbstractCrossValidator):
                   fitterMethods=self._fitterMethods,
                   numRestart=self._numRestart,
                   isParallel=self._isParallel,
+                  maxProcess=self._maxProcess,
                   logger=self.logger,
                   )
             yield SuiteFitterWrapper(newSuiteFitter, testTSDct)
 
-    def crossValidate(self, numFold, isParallel=True):
+    def crossValidate(self, numFold, isParallel=True, isDynamic=False):
         """
         Do cross validation.
 
@@ -146,6 +147,9 @@ class SuiteFitterCrossValidator(SuiteFitterCore, AbstractCrossValidator):
              optional parameters for _crossValidate
         isParallel: bool
              run each fold in parallel
+        isDynamic: bool
+             balance folds among processes with the dynamic scheduler
         """
         fitterGenerator = self._getFitterGenerator(numFold)
-        self._crossValidate(fitterGenerator, isParallel=isParallel)
+        self._crossValidate(fitterGenerator, isParallel=isParallel,
+              isDynamic=isDynamic)
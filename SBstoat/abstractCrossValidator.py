@@ -197,7 +197,8 @@ class AbstractCrossValidator(object):
             trainIndices = list(set(indices).difference(testIndices))
             yield trainIndices, testIndices
 
-    def _crossValidate(self, fitterGenerator, isParallel=True):
+    def _crossValidate(self, fitterGenerator, isParallel=True,
+          isDynamic=False):
         """
         Calculates parameters for folds.
 
@@ -206,13 +207,24 @@ class AbstractCrossValidator(object):
         fitterGenerator: generator
         isParallel: bool
              run each fold in parallel
+        isDynamic: bool
+             balance folds among processes with the dynamic scheduler
         """
         self.cvFitters = list(fitterGenerator)
-        runner = ParallelRunner(FitterRunner, desc="Folds",
-              maxProcess=self.maxProcess)
-        argumentsCol = runner._mkArgumentsCollections(self.cvFitters)
+        if isDynamic:
+            runner = ParallelRunner(FitterRunner, desc="Folds",
+                  maxProcess=self.maxProcess, isDynamic=True)
+            argumentsCol = [[f] for f in self.cvFitters]
+        else:
+            runner = ParallelRunner(FitterRunner, desc="Folds",
+                  maxProcess=self.maxProcess)
+            argumentsCol = runner._mkArgumentsCollections(self.cvFitters)
         initialResults = runner.runSync(argumentsCol,
               isParallel=isParallel, isProgressBar=True)
+        if len(runner.abandonedIdxs) > 0:
+            msg = "Folds %s could not be fitted: %s"  \
+                  % (str(sorted(runner.abandonedIdxs)), str(runner.errorDct))
+            raise RuntimeError(msg)
         results = []
         _ = [results.extend(r) for r in initialResults]
         # Extract the fields
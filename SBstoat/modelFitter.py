@@ -179,7 +179,8 @@ class ModelFitter(ModelFitterReport):
         bandLowTS = None
         bandHighTS = None
         if self.bootstrapResult is not None:
-            statistic = self.bootstrapResult.simulate(numPoint=100, numSample=1000)
+            statistic = self.bootstrapResult.simulate(numPoint=100, numSample=1000,
+                  isParallel=self._isParallel, maxProcess=self._maxProcess)
             fittedTS = statistic.meanTS
             bandLowTS = statistic.percentileDct[LOW_PERCENTILE]
             bandHighTS = statistic.percentileDct[HIGH_PERCENTILE]
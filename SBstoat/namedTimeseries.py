@@ -30,9 +30,12 @@ Usage:
    # Create a new column variable
    timeseries["S8"] = timeseries["time"]**2 + 3*timeseries["S1"]
    timeseries["S9"] = 10  # Assign a constant to all rows
+   # Put values in shared memory so that processes attach to them
+   timeseries.share()
 """
 
 from SBstoat import rpickle
+from SBstoat._sharedArray import SharedArray
 
 import copy
 import csv
@@ -155,6 +158,9 @@ class NamedTimeseries(rpickle.RPickler):
         if timeseries is not None:
             # Copy the existing object
             for k in timeseries.__dict__.keys():
+                if k == "_sharedArray":
+                    # Copies are not shared
+                    continue
                 self.__setattr__(k,
                       copy.deepcopy(timeseries.__dict__[k]))
         else:
@@ -202,6 +208,91 @@ class NamedTimeseries(rpickle.RPickler):
         """
         return cls(isNone=True)
 
+    def rpRevise(self):
+        """
+        Drops shared memory that is not available after deserialization.
+        """
+        if not self.isShared:
+            self._sharedArray = None
+
+    @property
+    def isShared(self)->bool:
+        """
+        True if values are in shared memory.
+        """
+        sharedArray = self.__dict__.get("_sharedArray", None)
+        return (sharedArray is not None)  \
+              and (sharedArray.array is not None)  \
+              and (self.values is sharedArray.array)
+
+    def share(self):
+        """
+        Puts values in shared memory. Processes that receive a pickled
+        copy of the timeseries attach to the values instead of copying
+        them, and their values are read-only. Copies made with copy or
+        deepcopy are not shared. Operations that replace values
+        (e.g., adding a column) end the sharing.
+
+        Returns
+        -------
+        NamedTimeseries
+        """
+        if not self.isShared:
+            self._sharedArray = SharedArray(self.values)
+            self.values = self._sharedArray.array
+        return self
+
+    def unshare(self):
+        """
+        Moves values from shared memory to memory of this process.
+        """
+        if self.isShared:
+            self.values = np.array(self.values)
+            self._sharedArray.unlink()
+        self._sharedArray = None
+
+    def attach(self):
+        """
+        Creates a timeseries that uses the shared values of this one.
+        The new timeseries does not own the shared memory and its
+        values are read-only.
+
+        Returns
+        -------
+        NamedTimeseries
+        """
+        if not self.isShared:
+            raise RuntimeError("Timeseries is not shared.")
+        newTimeseries = self.__class__(isNone=True)
+        for key, value in self.__dict__.items():
+            if key not in ["_sharedArray", "values"]:
+                newTimeseries.__dict__[key] = copy.deepcopy(value)
+        newTimeseries._sharedArray = self._sharedArray.attach()
+        newTimeseries.values = newTimeseries._sharedArray.array
+        return newTimeseries
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        if self.isShared:
+            # Values are attached on unpickling
+            del state["values"]
+        else:
+            state.pop("_sharedArray", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if "values" not in self.__dict__.keys():
+            self.values = self._sharedArray.array
+
+    def __deepcopy__(self, memo):
+        newTimeseries = self.__class__(isNone=True)
+        memo[id(self)] = newTimeseries
+        for key, value in self.__dict__.items():
+            if key != "_sharedArray":
+                newTimeseries.__dict__[key] = copy.deepcopy(value, memo)
+        return newTimeseries
+
     def __repr__(self):
         df = self.to_dataframe()
         return str(df)
@@ -16,7 +16,8 @@ class SuiteFitter(SuiteFitterCrossValidator):
 
 def mkSuiteFitter(modelSpecifications, datasets, parametersCol,
       modelNames=None, modelWeights=None, fitterMethods=None,
-      numRestart=0, isParallel=False, logger=Logger(), **kwargs):
+      numRestart=0, isParallel=False, maxProcess=None, logger=Logger(),
+      **kwargs):
     """
     Constructs a SuiteFitterCore with fitters that have similar
     structure.
@@ -35,6 +36,8 @@ def mkSuiteFitter(modelSpecifications, datasets, parametersCol,
         initial values for parameters to fit.
     isParallel: bool
         run fits in parallel for each fitter
+    maxProcess: int
+        maximum number of processes used if isParallel
     logger: Logger
     kwargs: dict
         keyword arguments for ModelFitter
@@ -51,4 +54,5 @@ def mkSuiteFitter(modelSpecifications, datasets, parametersCol,
         modelFitters.append(modelFitter)
     return SuiteFitter(modelFitters, modelNames=modelNames,
           modelWeights=modelWeights, fitterMethods=fitterMethods,
-          numRestart=numRestart, isParallel=isParallel, logger=logger)
+          numRestart=numRestart, isParallel=isParallel, maxProcess=maxProcess,
+          logger=logger)
@@ -9,6 +9,14 @@ Calculation of statistics for time series. Usage:
     print(statistic.stdTS)  # Timeseries of std values
     print(statistic.lowerPercentileTS)  # Timeseries of lower 5% at each time
     print(statistic.upperPercentileTS)  # Timeseries of lower 95% at each time
+
+Accumulated values are kept in a (sample x row x column) array so that
+statistics are calculated with single numpy operations.
+With reservoirSize, percentiles are calculated from a uniform random sample
+of at most reservoirSize of the accumulated timeseries. Memory and the costs
+of accumulate, merge and calculate do not depend on the number of
+timeseries accumulated. Percentiles are exact until more than reservoirSize
+timeseries are accumulated.
 """
 
 from SBstoat.namedTimeseries import NamedTimeseries
@@ -23,12 +31,15 @@ PERCENTILES = [5.0, 50.0, 95.0]  # Percentiles calculated
 
 class TimeseriesStatistic(rpickle.RPickler):
 
-    def __init__(self, prototypeTS:NamedTimeseries, percentiles:list=None):
+    def __init__(self, prototypeTS:NamedTimeseries, percentiles:list=None,
+          reservoirSize:int=None):
         """
         Parameters
         ----------
         prototypeTS: same length and columns as desired
         percentiles: percentiles to calculate for accumulated Timeseries
+        reservoirSize: maximum number of timeseries kept for percentiles
+            None: keep all timeseries
         """
         # Statistics
         if prototypeTS is not None:
@@ -40,7 +51,9 @@ class TimeseriesStatistic(rpickle.RPickler):
             if percentiles is None:
                 percentiles = PERCENTILES
             self.percentiles = percentiles
-            self._timeseries_list = []  # List of timeseries accumulated
+            self.reservoirSize = reservoirSize
+            # Accumulated values of colnames; a random sample if reservoirSize
+            self._sampleArr = None
             # Means
             self.meanTS = prototypeTS.copy(isInitialize=True) # means
             # Standard deviations
@@ -63,6 +76,19 @@ class TimeseriesStatistic(rpickle.RPickler):
         """
         return cls(None)
 
+    def rpRevise(self):
+        """
+        Overrides rpickler.
+        """
+        if "reservoirSize" not in self.__dict__.keys():
+            self.reservoirSize = None
+        if "_timeseries_list" in self.__dict__.keys():
+            self._sampleArr = None
+            if len(self._timeseries_list) > 0:
+                self._sampleArr = np.array([t[self.colnames]
+                      for t in self._timeseries_list])
+            del self._timeseries_list
+
     def copy(self):
         """
         Makes a copy of the object, including internal state.
@@ -103,7 +129,9 @@ class TimeseriesStatistic(rpickle.RPickler):
             if "__" in attr:
                 continue
             expression = "dir(self.%s)" % attr
-            if "equals" in eval(expression):
+            if isinstance(self.__getattribute__(attr), np.ndarray):
+                expression = "np.array_equal(self.%s, other.%s)" % (attr, attr)
+            elif "equals" in eval(expression):
                 expression = "self.%s.equals(other.%s)" % (attr, attr)
             else:
                 expression = "self.%s == other.%s" % (attr, attr)
@@ -119,9 +147,48 @@ class TimeseriesStatistic(rpickle.RPickler):
         self.ssqTS[self.colnames] = self.ssqTS[self.colnames]  \
                + newTS[self.colnames]**2
         if len(self.percentiles) > 0:
-            self._timeseries_list.append(newTS)
+            self._addSample(newTS[self.colnames])
         self.count += 1
 
+    @property
+    def numSample(self):
+        """
+        Returns
+        -------
+        int: number of timeseries in the sample array
+        """
+        if self.reservoirSize is None:
+            return self.count
+        return min(self.count, self.reservoirSize)
+
+    def _addSample(self, arr):
+        """
+        Adds the values of a timeseries to the sample array, growing it
+        as needed. With reservoirSize, the array is kept as a uniform
+        random sample of the accumulated values.
+
+        Parameters
+        ----------
+        arr: np.ndarray
+            values for self.colnames
+        """
+        if (self.reservoirSize is not None)  \
+              and (self.count >= self.reservoirSize):
+            idx = np.random.randint(0, self.count + 1)
+            if idx < self.reservoirSize:
+                self._sampleArr[idx] = arr
+            return
+        if self._sampleArr is None:
+            self._sampleArr = np.zeros((1,) + np.shape(arr))
+        elif self.count >= len(self._sampleArr):
+            size = 2*len(self._sampleArr)
+            if self.reservoirSize is not None:
+                size = min(size, self.reservoirSize)
+            sampleArr = np.zeros((size,) + np.shape(arr))
+            sampleArr[:len(self._sampleArr)] = self._sampleArr
+            self._sampleArr = sampleArr
+        self._sampleArr[self.count] = arr
+
     def calculate(self):
         """
         Calculates statistics.
@@ -133,34 +200,25 @@ class TimeseriesStatistic(rpickle.RPickler):
             self._calculatePercentiles()
 
     def _calculateMean(self):
-        for col in self.colnames:
-            self.meanTS[col] = (1.0*self.sumTS[col]) / self.count
+        self.meanTS[self.colnames] = (1.0*self.sumTS[self.colnames]) / self.count
 
     def _calculateStd(self):
-        for col in self.colnames:
-            if self.count > 1:
-                self.stdTS[col] = self.ssqTS[col] - self.count*self.meanTS[col]**2
-                self.stdTS[col] = self.stdTS[col] / (self.count - 1)
-                self.stdTS[col] = np.array([
-                      0.0 if np.isclose(v, 0.0) else v for v in self.stdTS[col]])
-                self.stdTS[col] = np.sqrt(self.stdTS[col])
-            else:
-                pass
+        if self.count > 1:
+            varianceArr = self.ssqTS[self.colnames]  \
+                  - self.count*self.meanTS[self.colnames]**2
+            varianceArr = varianceArr / (self.count - 1)
+            varianceArr[np.isclose(varianceArr, 0.0)] = 0.0
+            self.stdTS[self.colnames] = np.sqrt(varianceArr)
 
     def _calculatePercentiles(self):
         if len(self.percentiles) == 0:
             return
         self.percentileDct = {}
-        refTS = self._timeseries_list[0]
-        indices = range(len(refTS))
-        for percentile in self.percentiles:
-            percentileTS = refTS.copy(isInitialize=True)
-            for col in self.colnames:
-                col_values = []
-                for idx in indices:
-                    time_values = [t[col][idx]  for t in self._timeseries_list]
-                    col_values.append(np.percentile(time_values, percentile))
-                percentileTS[col] = np.array(col_values)
+        percentileArr = np.percentile(self._sampleArr[:self.numSample],
+              self.percentiles, axis=0)
+        for percentile, arr in zip(self.percentiles, percentileArr):
+            percentileTS = self.prototypeTS.copy(isInitialize=True)
+            percentileTS[self.colnames] = arr
             self.percentileDct[percentile] = percentileTS
 
     def _merge(self, others):
@@ -178,12 +236,49 @@ class TimeseriesStatistic(rpickle.RPickler):
         """
         result = self.copy()
         for other in others:
+            if other.count == 0:
+                continue
+            if (result.reservoirSize is None) != (other.reservoirSize is None):
+                raise ValueError(
+                      "Cannot merge statistics with and without a reservoir.")
+            if result.reservoirSize is not None:
+                result._mergeReservoir(other)
+            elif len(result.percentiles) > 0:
+                result._sampleArr = np.concatenate([
+                      result._sampleArr[:result.numSample],
+                      other._sampleArr[:other.numSample]])
             result.count += other.count
             result.sumTS[result.colnames] += other.sumTS[result.colnames]
             result.ssqTS[result.colnames] += other.ssqTS[result.colnames]
-            result._timeseries_list.extend(other._timeseries_list)
         return result
 
+    def _mergeReservoir(self, other):
+        """
+        Combines the reservoir of other with this reservoir so that
+        the reservoir samples the values accumulated by both.
+        Must be called before updating self.count.
+
+        Parameters
+        ----------
+        other: TimeseriesStatistic
+        """
+        if (len(self.percentiles) == 0) or (other.count == 0):
+            return
+        num1 = self.numSample
+        num2 = other.numSample
+        numSample = min(num1 + num2, self.reservoirSize)
+        # Number of values from this reservoir is proportional to its count
+        num1Sample = np.random.binomial(numSample,
+              self.count/(self.count + other.count))
+        num1Sample = min(max(num1Sample, numSample - num2), num1)
+        sampleArrs = []
+        if num1Sample > 0:
+            idxs = np.random.choice(num1, num1Sample, replace=False)
+            sampleArrs.append(self._sampleArr[idxs])
+        idxs = np.random.choice(num2, numSample - num1Sample, replace=False)
+        sampleArrs.append(other._sampleArr[idxs])
+        self._sampleArr = np.concatenate(sampleArrs)
+
     @classmethod
     def merge(cls, others):
         """
@@ -199,6 +294,8 @@ class TimeseriesStatistic(rpickle.RPickler):
         TimeseriesStatistic
         """
         if len(others) > 0:
+            # Start with a statistic that has accumulated timeseries
+            others = sorted(others, key=lambda s: s.count == 0)
             statistic = others[0]
             newOthers = list(others[1:])
             return statistic._merge(newOthers)
@@ -17,6 +17,17 @@ date         Version         numIteration    numProcess  Time (sec)
 04/12/2021*  1.6             10,000          5            18.5
 
 *Using only leastsq, 100 function evaluations, S1, S3
+
+Per evaluation of residuals (mainEvaluation), microseconds to reset
+the model and for the whole evaluation
+
+date         Reset           Evaluation
+10/18/2026   3.0-5.3         340-360
+
+Restoring saved floating species amounts instead of a reset takes
+1.5-3.0 usec. Reset time grows with the model (118 usec for a chain
+of 200 species), but so does simulation time (8,000 usec), and so
+a restore saves at most 1-3% of an evaluation.
 """
 
 from SBstoat import modelFitter as mf
@@ -43,6 +54,7 @@ MODEL = """
     k1 = 0; k2 = 0; 
 """
 NUM_ITERATION = 10000
+NUM_EVALUATION = 10000
         
 
 def main(numIteration):
@@ -75,9 +87,43 @@ def main(numIteration):
         print(fitter.logger.formatPerformanceDF())
     fitter.plotFitAll()
     return elapsedTime
+
+def mainEvaluation(numEvaluation):
+    """
+    Calculates the time for an evaluation of residuals, the
+    work done in each iteration of an optimizer, and the part of
+    that time spent resetting the model.
+
+    Parameters
+    ----------
+    numEvaluation: int
+
+    Returns
+    -------
+    float: microseconds to reset the model
+    float: microseconds for an evaluation
+    """
+    fitter = mf.ModelFitter(MODEL, BENCHMARK_PATH,
+          ["k1", "k2"], selectedColumns=['S1', 'S3'], isPlot=IS_PLOT,
+          isProgressBar=False)
+    fitter.initializeRoadRunnerModel()
+    params = fitter.mkParams()
+    _ = fitter.calcResiduals(params)
+    startTime = time.time()
+    for _ in range(numEvaluation):
+        fitter.roadrunnerModel.reset()
+    resetTime = time.time() - startTime
+    startTime = time.time()
+    for _ in range(numEvaluation):
+        _ = fitter.calcResiduals(params)
+    evaluationTime = time.time() - startTime
+    return 1e6*resetTime/numEvaluation, 1e6*evaluationTime/numEvaluation
         
 
 if __name__ == '__main__':
     if IS_PLOT:
         matplotlib.use('TkAgg')
+    resetTime, evaluationTime = mainEvaluation(NUM_EVALUATION)
+    print("Reset (usec): %4.2f. Evaluation (usec): %4.2f"
+          % (resetTime, evaluationTime))
     print("Elapsed time: %4.2f" % main(NUM_ITERATION))
@@ -73,6 +73,45 @@ class TestBootstrapResult(unittest.TestCase):
         self.assertEqual(len(mergedResult.parameterDct[self.parameterNames[0]]),
               mergedResult.numIteration)
 
+    def testMergeIncremental(self):
+        if IGNORE_TEST:
+            return
+        nullResult = br.BootstrapResult(self.fitter, 0, {},
+              TimeseriesStatistic(self.fitter.fittedTS))
+        partialResult = br.BootstrapResult.merge(
+              [nullResult, self.bootstrapResult])
+        self.assertIsNone(partialResult.fitter)
+        mergedResult = br.BootstrapResult.merge(
+              [partialResult, self.bootstrapResult], self.fitter)
+        self.assertEqual(mergedResult.numIteration, 2*NUM_ITERATION)
+        self.assertEqual(len(mergedResult.parameterDct[self.parameterNames[0]]),
+              mergedResult.numIteration)
+        self.assertEqual(mergedResult.fittedStatistic.count,
+              2*self.fittedStatistic.count)
+
+    def testBootstrapConvergence(self):
+        if IGNORE_TEST:
+            return
+        def test(tolerance):
+            np.random.seed(0)
+            convergence = br.BootstrapConvergence(tolerance)
+            for _ in range(1000):
+                parameterDct = {n: [np.random.normal(10, 1)]
+                      for n in self.parameterNames}
+                result = br.BootstrapResult(None, 1, parameterDct, None)
+                if convergence.update(result):
+                    break
+            return convergence
+        #
+        convergence = test(0.1)
+        self.assertTrue(convergence.isConverged)
+        self.assertGreaterEqual(convergence.numIteration,
+              br.MIN_CONVERGENCE_ITERATION)
+        self.assertLess(convergence.numIteration, 1000)
+        convergence = test(0.0)
+        self.assertFalse(convergence.isConverged)
+        self.assertEqual(convergence.numIteration, 1000)
+
     def testSimulate(self):
         if IGNORE_TEST:
             return
@@ -83,6 +122,31 @@ class TestBootstrapResult(unittest.TestCase):
         trues = [l <= u for l, u in zip(lowers, uppers)]
         self.assertTrue(all(trues))
 
+    def testSampleParams(self):
+        if IGNORE_TEST:
+            return
+        numSample = 1000
+        parameterArr = self.bootstrapResult._sampleParams(numSample)
+        self.assertEqual(np.shape(parameterArr),
+              (numSample, len(self.parameterNames)))
+        for idx, name in enumerate(self.parameterNames):
+            values = set(self.parameterDct[name])
+            self.assertTrue(set(parameterArr[:, idx]).issubset(values))
+
+    def testSimulateParallel(self):
+        if IGNORE_TEST:
+            return
+        self.bootstrapResult.setFitter(self.fitter)
+        numSample = 200
+        statistic = self.bootstrapResult.simulate(numSample=numSample,
+              numPoint=50, isParallel=True, maxProcess=2)
+        self.assertEqual(statistic.count, numSample)
+        self.assertEqual(len(statistic.meanTS), 50)
+        lowers = statistic.percentileDct[bsr.PERCENTILES[0]].flatten()
+        uppers = statistic.percentileDct[bsr.PERCENTILES[-1]].flatten()
+        trues = [l <= u for l, u in zip(lowers, uppers)]
+        self.assertTrue(all(trues))
+
     def testRpickleInterface(self):
         if IGNORE_TEST:
             return
@@ -49,6 +49,32 @@ class TestBootstrapRunner(unittest.TestCase):
             return
         self.assertEqual(self.runner.numWorkUnit, NUM_ITERATION)
 
+    def testInitialFit(self):
+        if IGNORE_TEST:
+            return
+        fitter = FITTER.copy()
+        fitter.fitModel()
+        argument = br.RunnerArgument(fitter, numIteration=2)
+        self.assertEqual(argument.redchi, fitter.minimizerResult.redchi)
+        runner = br.BootstrapRunner(argument)
+        # The runner uses the initial fit instead of fitting
+        self.assertIsNone(runner.fitter.minimizerResult)
+        self.assertEqual(runner.baseChisq, argument.redchi)
+        self.assertTrue(runner.fitter.fittedTS.equals(fitter.fittedTS))
+        results = []
+        while not runner.isDone:
+            results.append(runner.run())
+        self.assertEqual(len(results), 2)
+        self.assertGreater(results[-1].numIteration, 0)
+        # Parameters come from the fit after a bootstrap
+        fitter.bootstrapResult = results[-1]
+        argument = br.RunnerArgument(fitter, numIteration=2)
+        self.assertEqual(argument.params.valuesdict(),
+              fitter.optimizer.params.valuesdict())
+        for name, parameter in argument.params.items():
+            self.assertEqual(parameter.min,
+                  fitter.optimizer.params[name].min)
+
     def testRun(self):
         if IGNORE_TEST:
             return
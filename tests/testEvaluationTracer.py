@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Created on October 18, 2026
+"""
+
+from SBstoat._evaluationTracer import EvaluationTracer
+
+import numpy as np
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+CAPACITY = 10
+NAMES = ["k1", "k2"]
+
+
+class TestEvaluationTracer(unittest.TestCase):
+
+    def setUp(self):
+        self.tracer = EvaluationTracer(capacity=CAPACITY, names=NAMES)
+
+    def _record(self, numEvaluation):
+        for idx in range(numEvaluation):
+            self.tracer.record(1.0, idx, values=[idx, 2*idx])
+
+    def testRecord(self):
+        if IGNORE_TEST:
+            return
+        self.assertEqual(len(self.tracer.getRssqs()), 0)
+        self.assertTrue(np.isnan(self.tracer.meanDuration))
+        self._record(CAPACITY - 2)
+        self.assertEqual(list(self.tracer.getRssqs()),
+              list(range(CAPACITY - 2)))
+        self.assertEqual(self.tracer.getValues().shape,
+              (CAPACITY - 2, len(NAMES)))
+
+    def testRecordWrap(self):
+        if IGNORE_TEST:
+            return
+        numEvaluation = 3*CAPACITY + 3
+        self._record(numEvaluation)
+        expected = list(range(numEvaluation - CAPACITY, numEvaluation))
+        self.assertEqual(list(self.tracer.getRssqs()), expected)
+        self.assertEqual(list(self.tracer.getValues()[:, 1]),
+              [2*v for v in expected])
+        self.assertEqual(len(self.tracer.getDurations()), CAPACITY)
+        # Totals include evaluations that are not kept
+        self.assertEqual(self.tracer.numEvaluation, numEvaluation)
+        self.assertEqual(self.tracer.totalDuration, numEvaluation)
+        self.assertEqual(self.tracer.meanDuration, 1.0)
+
+    def testRecordBatch(self):
+        if IGNORE_TEST:
+            return
+        self._record(CAPACITY - 2)
+        numBatch = CAPACITY + 5
+        rssqs = np.arange(100, 100 + numBatch)
+        valueArr = np.array([rssqs, rssqs]).T
+        self.tracer.recordBatch(np.repeat(0.5, numBatch), rssqs,
+              valueArr=valueArr)
+        self.assertEqual(list(self.tracer.getRssqs()),
+              list(rssqs[-CAPACITY:]))
+        self.assertEqual(list(self.tracer.getValues()[:, 0]),
+              list(rssqs[-CAPACITY:]))
+        self.tracer.recordBatch([0.5, 0.5], [1, 2])
+        self.assertEqual(list(self.tracer.getRssqs()[-3:]),
+              [rssqs[-1], 1, 2])
+        self.assertEqual(self.tracer.numEvaluation, CAPACITY - 2 + numBatch + 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Created on October 18, 2026
+"""
+
+from SBstoat import _modelCache as mc
+from tests import _testHelpers as th
+
+import numpy as np
+import os
+import shutil
+import tellurium as te
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(DIR, "tmp_modelCache")
+MODEL = th.ANTIMONY_MODEL
+
+
+class TestModelCache(unittest.TestCase):
+
+    def setUp(self):
+        self._remove()
+        self.directory = mc.getCacheDirectory()
+        mc.setCacheDirectory(CACHE_DIR)
+        mc.clearCache()
+
+    def tearDown(self):
+        mc.clearCache()
+        mc.setCacheDirectory(self.directory)
+        self._remove()
+
+    def _remove(self):
+        if os.path.isdir(CACHE_DIR):
+            shutil.rmtree(CACHE_DIR)
+
+    def testMkKey(self):
+        if IGNORE_TEST:
+            return
+        self.assertEqual(mc.mkKey(MODEL), mc.mkKey(str(MODEL)))
+        self.assertNotEqual(mc.mkKey(MODEL), mc.mkKey(MODEL + " "))
+
+    def testGetRoadrunner(self):
+        if IGNORE_TEST:
+            return
+        expectedArr = te.loada(MODEL).simulate(0, 5, 10)
+        roadrunner1 = mc.getRoadrunner(MODEL)
+        self.assertEqual(len(mc._STATE_DCT), 1)
+        self.assertTrue(os.path.isfile(mc._getPath(mc.mkKey(MODEL))))
+        roadrunner2 = mc.getRoadrunner(MODEL)
+        # Instances are separate
+        self.assertFalse(roadrunner1 is roadrunner2)
+        roadrunner1.model["k1"] = 100
+        self.assertEqual(roadrunner2.model["k1"], th.PARAMETER_DCT["k1"])
+        np.testing.assert_array_almost_equal(roadrunner2.simulate(0, 5, 10),
+              expectedArr)
+        self.assertEqual(roadrunner2.timeCourseSelections,
+              roadrunner1.timeCourseSelections)
+
+    def testGetRoadrunnerFile(self):
+        if IGNORE_TEST:
+            return
+        _ = mc.getRoadrunner(MODEL)
+        # Only the file has the state
+        mc.clearCache()
+        self.assertEqual(len(mc._STATE_DCT), 0)
+        roadrunner = mc.getRoadrunner(MODEL)
+        self.assertEqual(len(mc._STATE_DCT), 1)
+        self.assertGreater(len(roadrunner.simulate(0, 5, 10)), 0)
+        # Corrupted files are replaced
+        mc.clearCache()
+        with open(mc._getPath(mc.mkKey(MODEL)), "wb") as fd:
+            fd.write(b"bad state")
+        roadrunner = mc.getRoadrunner(MODEL)
+        self.assertGreater(len(roadrunner.simulate(0, 5, 10)), 0)
+        mc.clearCache(isFiles=True)
+        self.assertEqual(len(os.listdir(CACHE_DIR)), 0)
+
+    def testPermissions(self):
+        if IGNORE_TEST or (mc._GETUID is None):
+            return
+        _ = mc.getRoadrunner(MODEL)
+        key = mc.mkKey(MODEL)
+        path = mc._getPath(key)
+        self.assertEqual(os.stat(CACHE_DIR).st_mode & 0o777,
+              mc.DIRECTORY_MODE)
+        self.assertEqual(os.stat(path).st_mode & 0o777, mc.FILE_MODE)
+        self.assertIsNotNone(mc._readState(key))
+        # Files that other users can change are not loaded
+        os.chmod(path, 0o666)
+        self.assertIsNone(mc._readState(key))
+        os.chmod(path, mc.FILE_MODE)
+        os.chmod(CACHE_DIR, 0o777)
+        self.assertIsNone(mc._readState(key))
+        mc.clearCache()
+        self.assertGreater(len(mc.getRoadrunner(MODEL).simulate(0, 5, 10)), 0)
+        os.chmod(CACHE_DIR, mc.DIRECTORY_MODE)
+        self.assertIsNotNone(mc._readState(key))
+
+    def testNoDirectory(self):
+        if IGNORE_TEST:
+            return
+        mc.setCacheDirectory(None)
+        _ = mc.getRoadrunner(MODEL)
+        self.assertFalse(os.path.isdir(CACHE_DIR))
+        self.assertEqual(len(mc._STATE_DCT), 1)
+
+    def testMaxCachedModel(self):
+        if IGNORE_TEST:
+            return
+        for idx in range(mc.MAX_CACHED_MODEL + 2):
+            _ = mc.getRoadrunner("%s\nk1 = %d" % (MODEL, idx + 1))
+        self.assertEqual(len(mc._STATE_DCT), mc.MAX_CACHED_MODEL)
+
+
+if __name__ == '__main__':
+    unittest.main()
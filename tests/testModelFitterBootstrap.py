@@ -93,10 +93,10 @@ class TestModelFitterBootstrap(unittest.TestCase):
     def testBootstrap1(self):
         if IGNORE_TEST:
             return
-        def test(isParallel):
+        def test(isParallel, isDynamic=False):
             self._init()
             self.fitter.bootstrap(numIteration=10,
-                  maxProcess=1,
+                  maxProcess=1, isDynamic=isDynamic,
                   serializePath=FILE_SERIALIZE, isParallel=isParallel)
             NUM_STD = 10
             result = self.fitter.bootstrapResult
@@ -115,7 +115,27 @@ class TestModelFitterBootstrap(unittest.TestCase):
         #
         test(False)
         test(True)
+        test(True, isDynamic=True)
 
+    def testBootstrapReservoir(self):
+        if IGNORE_TEST:
+            return
+        numIteration = 8
+        # All fitted timeseries are kept by default
+        self._init()
+        self.fitter.bootstrap(numIteration=numIteration, isParallel=False)
+        statistic = self.fitter.bootstrapResult.fittedStatistic
+        self.assertIsNone(statistic.reservoirSize)
+        self.assertEqual(statistic.numSample, statistic.count)
+        exactArr = statistic.percentileDct[50][statistic.colnames]
+        # A reservoir keeps a sample
+        self._init()
+        self.fitter.bootstrap(numIteration=numIteration, isParallel=False,
+              reservoirSize=2)
+        statistic = self.fitter.bootstrapResult.fittedStatistic
+        self.assertEqual(statistic.numSample, 2)
+        self.assertEqual(np.shape(statistic.percentileDct[50][
+              statistic.colnames]), np.shape(exactArr))
 
     def testBoostrapAccuracy(self):
         if IGNORE_TEST:
@@ -130,6 +150,46 @@ class TestModelFitterBootstrap(unittest.TestCase):
         trues = [c < 0.5 for c in cvDF.values]
         self.assertTrue(all(trues))
 
+    def testBootstrapPersistentPool(self):
+        if IGNORE_TEST:
+            return
+        fitter = FITTER.copy(isPersistentPool=True)
+        fitter.fitModel()
+        key = fitter._mkBootstrapKey({})
+        pool = mfb.getBootstrapPool(1)
+        # Repeated bootstraps use the same pool and runners
+        for _ in range(2):
+            fitter.bootstrap(numIteration=4, isParallel=True)
+            self.assertEqual(fitter.bootstrapResult.numSimulation, 4)
+            self.assertEqual(key, fitter._mkBootstrapKey({}))
+            self.assertTrue(mfb.getBootstrapPool(1) is pool)
+            self.assertTrue(all([list(d.keys()) == [key]
+                  for d in pool._keyDcts if len(d) > 0]))
+        # Completed iterations are not discarded by a convergence check
+        fitter.bootstrap(numIteration=4, isParallel=True,
+              convergenceTolerance=1.0)
+        self.assertEqual(fitter.bootstrapResult.numSimulation, 4)
+        pool = mfb.getBootstrapPool(1)
+        self.assertTrue(pool.isAlive)
+        self.assertTrue(all([key in d for d in pool._keyDcts]))
+        # Different data results in a different key
+        fitter.observedTS = fitter.observedTS.copy()
+        fitter.observedTS[fitter.selectedColumns[0]] += 1
+        self.assertNotEqual(key, fitter._mkBootstrapKey({}))
+        mfb.closeBootstrapPool()
+        self.assertFalse(pool.isAlive)
+
+    def testBootstrapConvergence(self):
+        if IGNORE_TEST:
+            return
+        self._init()
+        numIteration = 1000
+        self.fitter.bootstrap(numIteration=numIteration,
+              convergenceTolerance=1.0)
+        numSimulation = self.fitter.bootstrapResult.numSimulation
+        self.assertLess(numSimulation, numIteration)
+        self.assertGreater(numSimulation, 0)
+
     def testGetParameter(self):
         if IGNORE_TEST:
             return
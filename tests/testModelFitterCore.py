@@ -23,6 +23,7 @@ import lmfit
 import matplotlib
 import numpy as np
 import os
+import pickle
 import tellurium
 import unittest
 
@@ -109,6 +110,62 @@ class TestModelFitterCore(unittest.TestCase):
         self.assertTrue(isinstance(newFitter.modelSpecification, str))
         self.assertTrue(isinstance(newFitter, ModelFitterCore))
 
+    def testCopyLightweight(self):
+        if IGNORE_TEST:
+            return
+        self._init()
+        self.fitter.fitModel()
+        newFitter = self.fitter.copy(isLightweight=True)
+        self.assertTrue(isinstance(newFitter, ModelFitterCore))
+        self.assertTrue(newFitter.observedTS.equals(self.fitter.observedTS))
+        self.assertFalse(newFitter.observedTS is self.fitter.observedTS)
+        self.assertIsNone(newFitter.roadrunnerModel)
+        self.assertIsNone(newFitter.minimizerResult)
+        self.assertIsNone(newFitter.optimizer)
+        # Parameters are those of a new fitter
+        fullFitter = self.fitter.copy()
+        self.assertEqual(newFitter.params.valuesdict(),
+              fullFitter.params.valuesdict())
+        self.assertFalse(newFitter.params is self.fitter._params)
+        # Fits are independent
+        newFitter.fitModel()
+        self.assertTrue(newFitter.roadrunnerModel
+              is not self.fitter.roadrunnerModel)
+        for name, value in self.fitter.params.valuesdict().items():
+            self.assertTrue(np.isclose(newFitter.params[name].value, value,
+                  rtol=0.01))
+        # Uses the full copy with overrides
+        newFitter = self.fitter.copy(isLightweight=True, numPoint=5)
+        self.assertEqual(newFitter.numPoint, 5)
+        # Keeps the logger only if requested
+        logger = Logger()
+        self.fitter.logger = logger
+        newFitter = self.fitter.copy(isLightweight=True)
+        self.assertFalse(newFitter.logger is logger)
+        newFitter = self.fitter.copy(isLightweight=True, isKeepLogger=True)
+        self.assertTrue(newFitter.logger is logger)
+
+    def testCopyLightweightRoadrunner(self):
+        if IGNORE_TEST:
+            return
+        self._init()
+        rr = te.loada(th.ANTIMONY_MODEL)
+        fitter = ModelFitterCore(rr, self.fitter.observedTS,
+              parametersToFit=self.fitter.parametersToFit)
+        newFitter = fitter.copy(isLightweight=True)
+        self.assertTrue(isinstance(newFitter.modelSpecification, str))
+        self.assertIsNone(newFitter.roadrunnerModel)
+        # The conversion to antimony is done once
+        otherFitter = fitter.copy(isLightweight=True)
+        self.assertTrue(otherFitter.modelSpecification
+              is newFitter.modelSpecification)
+        fullFitter = fitter.copy()
+        self.assertEqual(newFitter.selectedColumns,
+              fullFitter.selectedColumns)
+        residualsArr = newFitter.calcResiduals(newFitter.params)
+        np.testing.assert_allclose(residualsArr,
+              fullFitter.calcResiduals(fullFitter.params))
+
     def testResiduals(self):
         if IGNORE_TEST:
             return
@@ -442,6 +499,26 @@ class TestModelFitterCore(unittest.TestCase):
               smallTimes)
         np.testing.assert_array_equal(smallTimes, resultArr)
 
+    def testSelectCompatibleIndices2(self):
+        if IGNORE_TEST:
+            return
+        SIZE = 50
+        bigTimes = np.random.permutation(np.linspace(0, 10, SIZE))
+        smallTimes = np.random.uniform(-1, 11, 2*SIZE)
+        resultArr = ModelFitterCore.selectCompatibleIndices(bigTimes,
+              smallTimes)
+        expectedArr = np.array([np.argmin(np.abs(bigTimes - t))
+              for t in smallTimes])
+        np.testing.assert_array_equal(bigTimes[resultArr],
+              bigTimes[expectedArr])
+        # Tolerance check
+        resultArr = ModelFitterCore.selectCompatibleIndices(bigTimes,
+              bigTimes, tolerance=1e-8)
+        np.testing.assert_array_equal(resultArr, range(SIZE))
+        with self.assertRaises(ValueError):
+            _ = ModelFitterCore.selectCompatibleIndices(bigTimes,
+                  [20.0], tolerance=1.0)
+
     def testNoneParameters(self):
         if IGNORE_TEST:
             return
@@ -451,6 +528,244 @@ class TestModelFitterCore(unittest.TestCase):
         self.assertIsNone(fitter.params)
         self.assertGreater(len(fitter.fittedTS), 0)
 
+    def testCalcResidualsBatch(self):
+        if IGNORE_TEST:
+            return
+        self._init()
+        self.fitter.initializeRoadRunnerModel()
+        names = list(self.fitter.params.keys())
+        paramArr = np.random.uniform(1, 5, (5, len(names)))
+        expectedArr = []
+        for values in paramArr:
+            params = self.fitter.mkParams()
+            _helpers.updateParameterValues(params,
+                  {n: v for n, v in zip(names, values)})
+            expectedArr.append(self.fitter.calcResiduals(params))
+        for isParallel in [False, True]:
+            residualsArr = self.fitter.calcResidualsBatch(paramArr,
+                  isParallel=isParallel)
+            np.testing.assert_array_almost_equal(residualsArr,
+                  np.array(expectedArr))
+        self.assertIsNotNone(self.fitter._residualsPool)
+        self.fitter.closeResidualsPool()
+        self.assertIsNone(self.fitter._residualsPool)
+
+    def testFitBatchResiduals(self):
+        if IGNORE_TEST:
+            return
+        self._init()
+        methods = [SBstoat.OptimizerMethod(cn.METHOD_DIFFERENTIAL_EVOLUTION,
+              {cn.MAX_NFEV: 10})]
+        fitter = ModelFitterCore(th.ANTIMONY_MODEL, self.timeseries,
+              list(th.PARAMETER_DCT.keys()), fitterMethods=methods,
+              isBatchResiduals=True, maxProcess=2)
+        fitter.fitModel()
+        self.assertIsNone(fitter._residualsPool)
+        self.assertLess(fitter.optimizer.rssq, 10e10)
+        self.checkParameterValues()
+        # Finite differences of leastsq are evaluated in batches
+        fitter = ModelFitterCore(th.ANTIMONY_MODEL, self.timeseries,
+              list(th.PARAMETER_DCT.keys()), fitterMethods=METHODS,
+              isBatchResiduals=True, maxProcess=2)
+        fitter.fitModel()
+        self.fitter.fitModel()
+        self.assertLess(fitter.optimizer.rssq,
+              1.1*self.fitter.optimizer.rssq)
+
+    def testOutputTimes(self):
+        if IGNORE_TEST:
+            return
+        self._init()
+        # Irregular times that are not on the simulation grid
+        idxs = [0, 1, 2, 5, 11, 17, 29]
+        observedTS = self.timeseries[idxs]
+        observedTS[TIME] = observedTS[TIME] + 0.01
+        fitter = ModelFitterCore(th.ANTIMONY_MODEL, observedTS,
+              list(th.PARAMETER_DCT.keys()), fitterMethods=METHODS,
+              isOutputTimes=True)
+        fitter.initializeRoadRunnerModel()
+        arr = fitter.calcResiduals(fitter.mkParams())
+        self.assertEqual(len(arr), len(observedTS.flatten()))
+        fitter.fitModel()
+        np.testing.assert_array_almost_equal(fitter.fittedTS[TIME],
+              observedTS[TIME])
+        self.assertEqual(len(fitter.residualsTS), len(observedTS))
+        newFitter = fitter.copy()
+        self.assertTrue(newFitter._isOutputTimes)
+
+    def testParameterBinding(self):
+        if IGNORE_TEST:
+            return
+        self._init()
+        self.fitter.initializeRoadRunnerModel()
+        params = self.fitter.mkParams()
+        residualsArr = self.fitter.calcResiduals(params)
+        binding = self.fitter._parameterBinding
+        self.assertEqual(binding.names, list(params.keys()))
+        # Binding is reused
+        _ = self.fitter.calcResiduals(params)
+        self.assertTrue(binding is self.fitter._parameterBinding)
+        # Same result as setting parameters by name
+        self.fitter._parameterBinding = None
+        arr = ModelFitterCore.runSimulationNumpy(parameters=params,
+              modelSpecification=self.fitter.roadrunnerModel,
+              startTime=self.fitter.observedTS.start,
+              endTime=self.fitter.endTime, numPoint=self.fitter.numPoint,
+              selectedColumns=self.fitter.selectedColumns)
+        expectedArr = self.fitter._observedArr  \
+              - arr[self.fitter._selectedIdxs, 1:].flatten()
+        np.testing.assert_array_almost_equal(residualsArr, expectedArr)
+        # New binding for a new model
+        self.fitter.clean()
+        self.assertIsNone(self.fitter._parameterBinding)
+
+    def testCalcJacobian(self):
+        if IGNORE_TEST:
+            return
+        self._init()
+        def test(fitter, fixedNames):
+            fitter.initializeRoadRunnerModel()
+            # A previous use with other parameters does not change results
+            _ = fitter.calcJacobian(fitter.mkParams())
+            params = fitter.mkParams()
+            for name in fixedNames:
+                params[name].set(vary=False)
+            jacobianArr = fitter.calcJacobian(params)
+            varyNames = [n for n, p in params.items() if p.vary]
+            self.assertEqual(jacobianArr.shape,
+                  (len(fitter._observedArr), len(varyNames)))
+            # Compare with finite differences
+            fitter.roadrunnerModel.integrator.relative_tolerance = 1e-10
+            fitter.roadrunnerModel.integrator.absolute_tolerance = 1e-12
+            residualsArr = fitter.calcResiduals(params)
+            for idx, name in enumerate(varyNames):
+                newParams = params.copy()
+                delta = 1e-5*params[name].value
+                newParams[name].set(value=params[name].value + delta)
+                diffArr = (fitter.calcResiduals(newParams)  \
+                      - residualsArr)/delta
+                np.testing.assert_allclose(jacobianArr[:, idx], diffArr,
+                      rtol=1e-2, atol=1e-3)
+        #
+        test(self.fitter, ["k2"])
+        # Compartment volume is not 1
+        speciesNames = ["S%d" % n for n in range(1, 7)]
+        model = th.ANTIMONY_MODEL + """
+    compartment C = 2.5;
+    species %s in C;
+""" % ", ".join(speciesNames)
+        fitter = ModelFitterCore(model, self.timeseries, ["k1", "k2"])
+        test(fitter, [])
+        #
+        fitter = th.getFitter(cls=ModelFitterCore, fitterMethods=METHODS)
+        fitter.fitModel(isJacobian=True)
+        self.assertTrue(fitter._isSensitivity)
+        self.fitter.fitModel()
+        self.assertLess(fitter.optimizer.rssq,
+              1.1*self.fitter.optimizer.rssq)
+        # Parameters that are not global parameters use finite differences
+        fitter = ModelFitterCore(th.ANTIMONY_MODEL, self.timeseries,
+              ["k1", "S1"], fitterMethods=METHODS)
+        fitter.fitModel(isJacobian=True)
+        self.assertIsNone(fitter._isSensitivity)
+
+    def testParallelRestart(self):
+        if IGNORE_TEST:
+            return
+        self._init()
+        fitter = ModelFitterCore(th.ANTIMONY_MODEL, self.timeseries,
+              list(th.PARAMETER_DCT.keys()), fitterMethods=METHODS,
+              numRestart=3, isParallelRestart=True, maxProcess=2)
+        fitter.fitModel()
+        self.fitter.fitModel()
+        self.assertLess(fitter.optimizer.rssq,
+              1.1*self.fitter.optimizer.rssq)
+        self.assertIsNotNone(fitter.minimizerResult)
+        newFitter = fitter.copy()
+        self.assertTrue(newFitter._isParallelRestart)
+        # Restarts are not done if the first fit is good enough
+        fitter = ModelFitterCore(th.ANTIMONY_MODEL, self.timeseries,
+              list(th.PARAMETER_DCT.keys()), fitterMethods=METHODS,
+              numRestart=100, targetRssq=10e10)
+        fitter.fitModel()
+        self.assertEqual(fitter.optimizer.rssq, self.fitter.optimizer.rssq)
+
+    def testRestartMethod(self):
+        if IGNORE_TEST:
+            return
+        self._init()
+        fitter = ModelFitterCore(th.ANTIMONY_MODEL, self.timeseries,
+              list(th.PARAMETER_DCT.keys()), fitterMethods=METHODS,
+              numRestart=2, restartMethod=cn.START_LATIN_HYPERCUBE,
+              numRestartCandidate=10)
+        fitter.fitModel()
+        self.fitter.fitModel()
+        self.assertLess(fitter.optimizer.rssq,
+              1.1*self.fitter.optimizer.rssq)
+        newFitter = fitter.copy()
+        self.assertEqual(newFitter._restartMethod, cn.START_LATIN_HYPERCUBE)
+        self.assertEqual(newFitter._numRestartCandidate, 10)
+
+    def testShareObservedData(self):
+        if IGNORE_TEST:
+            return
+        self._init()
+        self.fitter.initializeRoadRunnerModel()
+        params = self.fitter.mkParams()
+        expectedArr = self.fitter.calcResiduals(params)
+        self.fitter.shareObservedData()
+        self.assertTrue(self.fitter._isObservedArrShared())
+        fitter = pickle.loads(pickle.dumps(self.fitter.copy(
+              isLightweight=True).clean()))
+        self.assertTrue(fitter._isObservedArrShared())
+        self.assertTrue(fitter.observedTS.isShared)
+        # Lightweight copies do not own the shared memory
+        newFitter = self.fitter.copy(isLightweight=True)
+        self.assertTrue(newFitter._isObservedArrShared())
+        self.assertFalse(newFitter._sharedObservedArr
+              is self.fitter._sharedObservedArr)
+        self.assertFalse(newFitter._sharedObservedArr.isOwner)
+        newFitter.unshareObservedData()
+        del newFitter
+        self.assertTrue(self.fitter._isObservedArrShared())
+        self.assertTrue(self.fitter.observedTS.isShared)
+        fitter = pickle.loads(pickle.dumps(self.fitter.copy(
+              isLightweight=True).clean()))
+        self.assertTrue(fitter._isObservedArrShared())
+        self.assertTrue(fitter.observedTS.isShared)
+        fitter.initializeRoadRunnerModel()
+        np.testing.assert_array_almost_equal(fitter.calcResiduals(params),
+              expectedArr)
+        # Deep copies do not use the shared memory of the original
+        fitter = copy.deepcopy(self.fitter.copy(isLightweight=True).clean())
+        self.assertFalse(fitter._isObservedArrShared())
+        self.assertFalse(fitter.observedTS.isShared)
+        self.assertTrue(fitter._observedArr.flags.writeable)
+        fitter = pickle.loads(pickle.dumps(fitter))
+        fitter.initializeRoadRunnerModel()
+        np.testing.assert_array_almost_equal(fitter.calcResiduals(params),
+              expectedArr)
+        self.fitter.unshareObservedData()
+        self.assertFalse(self.fitter._isObservedArrShared())
+        self.assertFalse(self.fitter.observedTS.isShared)
+
+    def testSimulateValueMapping(self):
+        if IGNORE_TEST:
+            return
+        self._init()
+        params = self.fitter.mkParams()
+        dct = {n: 2*v for n, v in params.valuesdict().items()}
+        _helpers.updateParameterValues(params, dct)
+        expectedTS = self.fitter.simulate(params=params)
+        fittedTS = self.fitter.simulate(params=dct)
+        self.assertTrue(fittedTS.equals(expectedTS))
+        arr = ModelFitterCore.runSimulationNumpy(parameters=dct,
+              modelSpecification=th.ANTIMONY_MODEL,
+              endTime=self.fitter.endTime, numPoint=self.fitter.numPoint,
+              selectedColumns=self.fitter.selectedColumns)
+        np.testing.assert_array_almost_equal(arr,
+              expectedTS[expectedTS.allColnames])
+
 
        
 
@@ -31,6 +31,8 @@ IGNORE_TEST = False
 IS_PLOT = False
 TIMESERIES = th.getTimeseries()
 NUM_FOLD = 5
+DIR = os.path.dirname(os.path.abspath(__file__))
+FILE_SERIALIZE = os.path.join(DIR, "modelFitterCrossValidator.pcl")
 
 
 class TestModelFitterWrapper(unittest.TestCase):
@@ -73,6 +75,10 @@ class TestModelFitterCrossValidator(unittest.TestCase):
     def setUp(self):
         self.validator = th.getFitter(cls=ModelFitterCrossValidator)
 
+    def tearDown(self):
+        if os.path.isfile(FILE_SERIALIZE):
+            os.remove(FILE_SERIALIZE)
+
     def testConstructor(self):
         if IGNORE_TEST:
             return
@@ -84,6 +90,11 @@ class TestModelFitterCrossValidator(unittest.TestCase):
         numFold = 30
         self.validator.crossValidate(numFold, isParallel=True)
         self.assertEqual(numFold, len(self.validator.cvFitters))
+        # Folds balanced by the dynamic scheduler
+        validator = th.getFitter(cls=ModelFitterCrossValidator)
+        validator.crossValidate(numFold, isParallel=True, isDynamic=True)
+        self.assertEqual(numFold, len(validator.cvFitters))
+        self.assertEqual(numFold, len(validator.cvRsqs))
 
     def testCrossValidateSequential(self):
         if IGNORE_TEST:
@@ -92,6 +103,24 @@ class TestModelFitterCrossValidator(unittest.TestCase):
         self.validator.crossValidate(numFold, isParallel=False)
         self.assertEqual(numFold, len(self.validator.cvFitters))
 
+    def testSerialize(self):
+        if IGNORE_TEST:
+            return
+        self.validator.crossValidate(2, isParallel=False)
+        newValidator = self.validator.copy(isLightweight=True)
+        self.assertEqual(newValidator.numFold, 0)
+        self.assertFalse(newValidator.cvRsqs is self.validator.cvRsqs)
+        self.assertFalse(newValidator.cvParametersCollection
+              is self.validator.cvParametersCollection)
+        # Cross validation results are not serialized
+        self.validator.serialize(FILE_SERIALIZE)
+        validator = ModelFitterCrossValidator.deserialize(FILE_SERIALIZE)
+        self.assertEqual(validator.numFold, 0)
+        self.assertEqual(len(validator.cvRsqs), 0)
+        self.assertEqual(len(validator.cvParametersCollection), 0)
+        self.assertTrue(validator.observedTS.equals(self.validator.observedTS))
+        self.assertEqual(self.validator.numFold, 2)
+
     def testScoreDF(self):
         if IGNORE_TEST:
             return
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Created on October 18, 2026
+"""
+
+from SBstoat._modelScheduler import ModelScheduler
+import SBstoat._modelScheduler as ms
+
+import numpy as np
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+NUM_MODEL = 7
+NUM_WORKER = 3
+
+
+class TestModelScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = ModelScheduler(NUM_MODEL, NUM_WORKER)
+
+    def _getModelIdxs(self, assignments):
+        modelIdxs = []
+        for idxs in assignments:
+            modelIdxs.extend(idxs)
+        return sorted(modelIdxs)
+
+    def testConstructor(self):
+        if IGNORE_TEST:
+            return
+        self.assertEqual(len(self.scheduler.assignments), NUM_WORKER)
+        self.assertEqual(self._getModelIdxs(self.scheduler.assignments),
+              list(range(NUM_MODEL)))
+        # Workers are bounded by the number of models
+        scheduler = ModelScheduler(2, 8)
+        self.assertEqual(scheduler.numWorker, 2)
+
+    def testPack(self):
+        if IGNORE_TEST:
+            return
+        costs = [10, 1, 1, 4, 5, 1, 6]
+        assignments = ModelScheduler.pack(costs, NUM_WORKER)
+        self.assertEqual(self._getModelIdxs(assignments),
+              list(range(len(costs))))
+        loads = [np.sum(np.array(costs)[a]) for a in assignments]
+        self.assertEqual(max(loads), 10)
+        self.assertEqual(assignments[0], [0])
+
+    def testRecordCosts(self):
+        if IGNORE_TEST:
+            return
+        modelIdxs = list(range(NUM_MODEL))
+        durations = [1]*NUM_MODEL
+        durations[0] = 10
+        # First times include warm up and are not used
+        self.scheduler.recordCosts(modelIdxs, [100]*NUM_MODEL)
+        self.assertFalse(any(self.scheduler.isMeasuredArr))
+        self.assertEqual(self.scheduler.numRebalance, 0)
+        # Measurements set the costs and repack
+        self.scheduler.recordCosts(modelIdxs, durations)
+        np.testing.assert_allclose(self.scheduler.costArr, durations)
+        self.assertEqual(self.scheduler.numRebalance, 1)
+        self.assertTrue([0] in self.scheduler.assignments)
+        # Models that moved warm up on their new worker
+        isMovedArr = np.logical_not(self.scheduler.isWarmArr)
+        self.assertTrue(any(isMovedArr))
+        self.scheduler.recordCosts(modelIdxs, [100]*NUM_MODEL)
+        np.testing.assert_allclose(self.scheduler.costArr[isMovedArr],
+              np.array(durations)[isMovedArr])
+        self.assertTrue(all(self.scheduler.isWarmArr))
+        # Later measurements are averaged
+        cost = self.scheduler.costArr[0]
+        self.scheduler.recordCosts([0], [0])
+        self.assertTrue(np.isclose(self.scheduler.costArr[0],
+              (1 - ms.SMOOTHING)*cost))
+        # Repacks periodically
+        self.scheduler.costArr[:] = 1
+        self.scheduler.costArr[0] = 0
+        numRebalance = self.scheduler.numRebalance
+        for _ in range(ms.REBALANCE_INTERVAL):
+            self.scheduler.recordCosts([], [])
+        self.assertEqual(self.scheduler.numRebalance, numRebalance + 1)
+        self.assertFalse([0] in self.scheduler.assignments)
+
+    def testRebalance(self):
+        if IGNORE_TEST:
+            return
+        # Assignments do not change unless the busiest worker improves
+        self.assertFalse(self.scheduler.rebalance())
+        self.scheduler.costArr[:] = 1
+        self.scheduler.costArr[0] = 10
+        self.assertTrue(self.scheduler.rebalance())
+        self.assertEqual(np.max(self.scheduler.calcLoads()), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,6 +13,7 @@ import SBstoat.namedTimeseries as namedTimeseries
 import numpy as np
 import os
 import pandas as pd
+import pickle
 import tellurium as te
 import unittest
 
@@ -377,6 +378,42 @@ class TestNamedTimeseries(unittest.TestCase):
         timeseries = serialization.deserialize()
         self.assertTrue(timeseries.equals(self.timeseries))
 
+    def testShare(self):
+        if IGNORE_TEST:
+            return
+        expected = self.timeseries.copy()
+        self.timeseries.share()
+        self.assertTrue(self.timeseries.isShared)
+        self.assertTrue(self.timeseries.equals(expected))
+        # Pickles attach to the values
+        timeseries = pickle.loads(pickle.dumps(self.timeseries))
+        self.assertTrue(timeseries.isShared)
+        self.assertTrue(timeseries.equals(expected))
+        self.assertLess(len(pickle.dumps(self.timeseries)),
+              len(pickle.dumps(expected)))
+        # Copies are not shared
+        newTimeseries = self.timeseries.copy(isInitialize=True)
+        self.assertFalse(newTimeseries.isShared)
+        # Attached timeseries use the values but do not own them
+        newTimeseries = self.timeseries.attach()
+        self.assertTrue(newTimeseries.isShared)
+        self.assertTrue(newTimeseries.equals(expected))
+        newTimeseries.unshare()
+        self.assertTrue(self.timeseries.isShared)
+        timeseries = pickle.loads(pickle.dumps(self.timeseries))
+        self.assertTrue(timeseries.isShared)
+        self.assertTrue(self.timeseries.equals(expected))
+        # Replacing values ends sharing
+        serialization = rpickle.Serialization(self.timeseries)
+        timeseries = serialization.deserialize()
+        self.assertTrue(timeseries.equals(expected))
+        self.timeseries["S7"] = 1
+        self.assertFalse(self.timeseries.isShared)
+        timeseries = pickle.loads(pickle.dumps(self.timeseries))
+        self.assertTrue(timeseries.equals(self.timeseries))
+        self.timeseries.unshare()
+        self.assertFalse(self.timeseries.isShared)
+
     def testRename(self):
         if IGNORE_TEST:
             return
@@ -6,12 +6,14 @@ Created on Tue Feb 9, 2021
 """
 
 import SBstoat._constants as cn
-from SBstoat._optimizer import Optimizer
+from SBstoat._optimizer import Optimizer, _BatchJacobian, _FunctionWrapper
+import SBstoat._optimizer as so
 from SBstoat import _helpers
 from SBstoat.logs import Logger, LEVEL_MAX
 
 import collections
 import matplotlib
+import multiprocessing
 import numpy as np
 import lmfit
 import unittest
@@ -64,6 +66,20 @@ def parabola(params:lmfit.Parameters, minArgs:float=BEST_VALUES,
 
 def parabolaWithoutRaw(params:lmfit.Parameters, minArgs:float=BEST_VALUES):
     return parabola(params, minArgs=minArgs)
+
+def parabolaBatch(valueArr:np.ndarray):
+    """
+    Batch version of parabola.
+
+    Parameters
+    ----------
+    valueArr: np.ndarray (N X 2)
+
+    Returns
+    -------
+    np.ndarray (N X 2)
+    """
+    return (valueArr - np.array(BEST_VALUES))**4
         
 
 ################ TEST CLASSES #############
@@ -124,6 +140,58 @@ class TestOptimizer(unittest.TestCase):
             for idx in range(len(optimizer.performanceStats)):
                 self.assertGreater(len(optimizer.performanceStats[idx]), 100)
 
+    def testTrace(self):
+        if IGNORE_TEST:
+            return
+        traceCapacity = 50
+        methods = Optimizer.mkOptimizerMethod(
+              methodNames=[cn.METHOD_LEASTSQ, cn.METHOD_DIFFERENTIAL_EVOLUTION])
+        optimizer = Optimizer(self.function, self.params, methods,
+              isCollect=True, traceCapacity=traceCapacity)
+        optimizer.execute()
+        self.assertEqual(len(optimizer.tracers), len(methods))
+        for tracer, durations in zip(optimizer.tracers,
+              optimizer.performanceStats):
+            self.assertGreater(tracer.numEvaluation, traceCapacity)
+            self.assertEqual(len(durations), traceCapacity)
+            # Durations are elapsed times
+            self.assertTrue(all(durations < 1))
+            self.assertEqual(tracer.getValues().shape,
+                  (traceCapacity, len(self.params)))
+        newOptimizer = optimizer.copyResults()
+        self.assertEqual(len(newOptimizer.tracers), len(methods))
+
+    def testBestValues(self):
+        if IGNORE_TEST:
+            return
+        wrapper = _FunctionWrapper(self.function,
+              names=list(self.params.keys()))
+        self.assertIsNone(wrapper.bestParamDct)
+        _ = wrapper.execute(self.params)
+        self.assertTrue(wrapper.isBest)
+        params = self.params.copy()
+        params[XKEY].set(value=BEST_VALUES[0])
+        _ = wrapper.execute(params)
+        # A worse value does not change the best values
+        _ = wrapper.execute(self.params)
+        self.assertEqual(list(wrapper.bestValueArr),
+              [BEST_VALUES[0], INITIAL_VALUE])
+        self.assertEqual(wrapper.bestParamDct,
+              {XKEY: BEST_VALUES[0], YKEY: INITIAL_VALUE})
+        # Batches can have a different column order
+        wrapper = _FunctionWrapper(self.function, batchFunction=
+              lambda a: parabolaBatch(a[:, [1, 0]]),
+              names=list(self.params.keys()))
+        valueArr = np.array([[BEST_VALUES[1], 0], [0, 0]])
+        _ = wrapper.executeBatch(valueArr, [YKEY, XKEY])
+        self.assertEqual(list(wrapper.bestValueArr), [0, BEST_VALUES[1]])
+
+    def testCalcSSQ(self):
+        if IGNORE_TEST:
+            return
+        arr = np.array([1.0, 2.0, 3.0])
+        self.assertEqual(_FunctionWrapper._calcSSQ(arr), 14)
+
     def testPlotPerformance(self):
         if IGNORE_TEST:
             return
@@ -166,6 +234,158 @@ class TestOptimizer(unittest.TestCase):
         test1(newerParams)
         test2(newerParams, newParams)
 
+    def testOptimizeBatch(self):
+        if IGNORE_TEST:
+            return
+        calls = []
+        def batchFunction(valueArr):
+            calls.append(len(valueArr))
+            return parabolaBatch(valueArr)
+        methods = Optimizer.mkOptimizerMethod(
+              methodNames=[cn.METHOD_DIFFERENTIAL_EVOLUTION, cn.METHOD_LEASTSQ],
+              maxFev=1000)
+        optimizer = Optimizer(self.function, self.params, methods,
+              batchFunction=batchFunction)
+        self.checkResult(optimizer=optimizer)
+        self.assertGreater(len(calls), 0)
+        # Each call evaluates a population
+        self.assertGreater(max(calls), 1)
+        # The budget and polish setting of the caller are kept
+        for maxFev, isPolish in [(50, False), (1000, True)]:
+            calls = []
+            functionCalls = []
+            def function(params):
+                functionCalls.append(1)
+                return self.function(params)
+            methods = [_helpers.OptimizerMethod(
+                  cn.METHOD_DIFFERENTIAL_EVOLUTION,
+                  {cn.MAX_NFEV: maxFev, "polish": isPolish})]
+            optimizer = Optimizer(function, self.params, methods,
+                  batchFunction=batchFunction)
+            optimizer.execute()
+            callKwargs = optimizer.minimizerResult.call_kws
+            self.assertEqual(callKwargs["polish"], isPolish)
+            self.assertLessEqual(optimizer.minimizerResult.nfev, maxFev)
+            # lmfit evaluates the final parameters
+            self.assertLessEqual(sum(calls) + len(functionCalls), maxFev + 1)
+
+    def testOptimizeJacobian(self):
+        if IGNORE_TEST:
+            return
+        calls = []
+        def jacobianFunction(params):
+            calls.append(1)
+            valueArr = np.array([params[XKEY].value, params[YKEY].value])
+            return np.diag(4*(valueArr - np.array(BEST_VALUES))**3)
+        methods = Optimizer.mkOptimizerMethod(
+              methodNames=[cn.METHOD_LEASTSQ], maxFev=1000)
+        optimizer = Optimizer(self.function, self.params, methods,
+              jacobianFunction=jacobianFunction)
+        self.checkResult(optimizer=optimizer)
+        self.assertGreater(len(calls), 0)
+
+    def testBatchJacobian(self):
+        if IGNORE_TEST:
+            return
+        batchJacobian = _BatchJacobian(parabolaBatch, self.params)
+        self.params[YKEY].set(value=MAX_VALUE)
+        jacobianArr = batchJacobian(self.params)
+        self.assertEqual(batchJacobian.numEvaluation, 3)
+        valueArr = np.array([INITIAL_VALUE, MAX_VALUE])
+        expectedArr = np.diag(4*(valueArr - np.array(BEST_VALUES))**3)
+        np.testing.assert_allclose(jacobianArr, expectedArr, rtol=1e-3)
+        # Parameters that do not vary are not perturbed
+        self.params[XKEY].set(vary=False)
+        self.assertEqual(batchJacobian(self.params).shape, (2, 1))
+        self.params[XKEY].set(vary=True)
+        # Residuals of the last evaluation at the values are used
+        functionWrapper = _FunctionWrapper(self.function)
+        batchJacobian = _BatchJacobian(parabolaBatch, self.params,
+              functionWrapper=functionWrapper)
+        _ = functionWrapper.execute(self.params)
+        np.testing.assert_allclose(batchJacobian(self.params), jacobianArr)
+        self.assertEqual(batchJacobian.numEvaluation, 2)
+        self.params[XKEY].set(value=INITIAL_VALUE + 1)
+        _ = batchJacobian(self.params)
+        self.assertEqual(batchJacobian.numEvaluation, 5)
+        # Steps stay within both bounds
+        rowsArrs = []
+        def batchFunction(valueArr):
+            rowsArrs.append(np.array(valueArr))
+            return parabolaBatch(valueArr)
+        batchJacobian = _BatchJacobian(batchFunction, self.params)
+        for value, lower, upper in [(1, 1, 1 + 1e-7), (1 + 1e-7, 1, 1 + 1e-7),
+              (1, 1, 2), (2, 1, 2)]:
+            self.params[XKEY].set(value=value, min=lower, max=upper)
+            _ = batchJacobian(self.params)
+            xArr = rowsArrs[-1][:, 0]
+            self.assertTrue(all(xArr >= lower))
+            self.assertTrue(all(xArr <= upper))
+            self.assertGreater(len(set(xArr)), 1)
+        self.params[XKEY].set(value=INITIAL_VALUE, min=MIN_VALUE,
+              max=MAX_VALUE)
+        #
+        calls = []
+        def batchFunction(valueArr):
+            calls.append(len(valueArr))
+            return parabolaBatch(valueArr)
+        self.params[XKEY].set(value=INITIAL_VALUE, vary=True)
+        self.params[YKEY].set(value=INITIAL_VALUE)
+        methods = Optimizer.mkOptimizerMethod(
+              methodNames=[cn.METHOD_LEASTSQ], maxFev=1000)
+        optimizer = Optimizer(self.function, self.params, methods,
+              batchFunction=batchFunction)
+        self.checkResult(optimizer=optimizer)
+        # Each Jacobian evaluates the perturbations of the parameters
+        self.assertEqual(set(calls), {2})
+
+    def testMkStartParams(self):
+        if IGNORE_TEST:
+            return
+        numStart = 16
+        self.params[YKEY].set(vary=False)
+        for method in cn.START_METHODS:
+            paramsList = Optimizer._mkStartParams(self.params, numStart,
+                  startMethod=method, seed=1)
+            self.assertEqual(len(paramsList), numStart)
+            values = [p[XKEY].value for p in paramsList]
+            self.assertTrue(all([(v >= MIN_VALUE) and (v <= MAX_VALUE)
+                  for v in values]))
+            self.assertTrue(all([p[YKEY].value == INITIAL_VALUE
+                  for p in paramsList]))
+            # Reproducible with the seed
+            otherParamsList = Optimizer._mkStartParams(self.params, numStart,
+                  startMethod=method, seed=1)
+            self.assertEqual(values, [p[XKEY].value for p in otherParamsList])
+        # Latin hypercube values are in distinct intervals
+        paramsList = Optimizer._mkStartParams(self.params, numStart,
+              startMethod=cn.START_LATIN_HYPERCUBE, seed=1)
+        unitArr = np.array([(p[XKEY].value - MIN_VALUE)/(MAX_VALUE - MIN_VALUE)
+              for p in paramsList])
+        self.assertEqual(len(set(np.floor(unitArr*numStart))), numStart)
+        with self.assertRaises(ValueError):
+            _ = Optimizer._mkStartParams(self.params, numStart,
+                  startMethod="dummy")
+
+    def testPrescreen(self):
+        if IGNORE_TEST:
+            return
+        paramsList = Optimizer._mkStartParams(self.params, 20, seed=1)
+        selectedList = Optimizer._prescreen(self.function, paramsList, 3)
+        rssqs = [np.sum(self.function(p)**2) for p in paramsList]
+        self.assertEqual(np.sum(self.function(selectedList[0])**2),
+              min(rssqs))
+        batchList = Optimizer._prescreen(self.function, paramsList, 3,
+              batchFunction=parabolaBatch)
+        self.assertEqual([p[XKEY].value for p in batchList],
+              [p[XKEY].value for p in selectedList])
+        #
+        methods = Optimizer.mkOptimizerMethod(maxFev=10)
+        optimizer = Optimizer.optimize(self.function, self.params, methods,
+              numRestart=3, startMethod=cn.START_SOBOL, seed=1,
+              numCandidate=20)
+        self.assertIsNotNone(optimizer.rssq)
+
     def testOptimize(self):
         if IGNORE_TEST:
             return
@@ -181,6 +401,69 @@ class TestOptimizer(unittest.TestCase):
             diff0 = (BEST_DCT[name] - valuesDct0[name])**2
             diff100 = (BEST_DCT[name] - value)**2
             self.assertLess(diff100, diff0)
+
+    def testOptimizeParallel(self):
+        if IGNORE_TEST:
+            return
+        methods = Optimizer.mkOptimizerMethod(maxFev=10)
+        np.random.seed(0)
+        optimizer = Optimizer.optimize(self.function, self.params, methods,
+              numRestart=20)
+        np.random.seed(0)
+        parallelOptimizer = Optimizer.optimize(self.function, self.params,
+              methods, numRestart=20, isParallel=True, maxProcess=2)
+        # Both have the best of the same initial values
+        self.assertAlmostEqual(parallelOptimizer.rssq, optimizer.rssq)
+        self.assertEqual(len(parallelOptimizer.performanceStats),
+              len(methods))
+        # Restarts stop once the target is reached
+        calls = []
+        def function(params, **kwargs):
+            calls.append(1)
+            return self.function(params, **kwargs)
+        targetRssq = 10*optimizer.rssq
+        _ = Optimizer.optimize(function, self.params, methods, numRestart=20)
+        numCall = len(calls)
+        calls.clear()
+        np.random.seed(0)
+        optimizer = Optimizer.optimize(function, self.params, methods,
+              numRestart=20, targetRssq=targetRssq)
+        self.assertLessEqual(optimizer.rssq, targetRssq)
+        self.assertLess(len(calls), numCall)
+        np.random.seed(0)
+        optimizer = Optimizer.optimize(self.function, self.params, methods,
+              numRestart=20, targetRssq=targetRssq, isParallel=True,
+              maxProcess=2)
+        self.assertLessEqual(optimizer.rssq, targetRssq)
+
+    def testOptimizeParallelStartMethod(self):
+        if IGNORE_TEST:
+            return
+        methods = Optimizer.mkOptimizerMethod(maxFev=10)
+        np.random.seed(0)
+        optimizer = Optimizer.optimize(self.function, self.params, methods,
+              numRestart=4)
+        # Functions that cannot be pickled are used with spawn as default
+        function = lambda params, **kwargs: self.function(params, **kwargs)
+        startMethod = multiprocessing.get_start_method()
+        try:
+            multiprocessing.set_start_method("spawn", force=True)
+            np.random.seed(0)
+            parallelOptimizer = Optimizer.optimize(function, self.params,
+                  methods, numRestart=4, isParallel=True, maxProcess=2)
+        finally:
+            multiprocessing.set_start_method(startMethod, force=True)
+        self.assertAlmostEqual(parallelOptimizer.rssq, optimizer.rssq)
+        # Restarts are serial if fork is not available
+        getForkContext = so._getForkContext
+        try:
+            so._getForkContext = lambda: None
+            np.random.seed(0)
+            serialOptimizer = Optimizer.optimize(function, self.params,
+                  methods, numRestart=4, isParallel=True, maxProcess=2)
+        finally:
+            so._getForkContext = getForkContext
+        self.assertAlmostEqual(serialOptimizer.rssq, optimizer.rssq)
         
 
 if __name__ == '__main__':
@@ -8,6 +8,7 @@ Created on March 14, 2021
 import SBstoat._parallelRunner as pr
 
 import numpy as np
+import time
 import unittest
 
 
@@ -58,6 +59,25 @@ class PrimeFinder(pr.AbstractRunner):
             self._isDone = True
         return num
 
+    def restart(self, count):
+        self.count = len(self._primes) + count
+        self._isDone = False
+
+
+class ProblemPrimeFinder(PrimeFinder):
+    """A negative count hangs. A count of 0 raises an exception."""
+
+    def __init__(self, count):
+        if count == 0:
+            raise ValueError("Invalid count.")
+        super().__init__(abs(count))
+        self._isHang = count < 0
+
+    def run(self):
+        if self._isHang:
+            time.sleep(100)
+        return super().run()
+
 
 class TestRunnerManager(unittest.TestCase):
 
@@ -175,6 +195,54 @@ class TestParallelRunner(unittest.TestCase):
             return
         self.runPrimes(isParallel=False)
 
+    def testRunSyncDynamic(self):
+        if IGNORE_TEST:
+            return
+        runner = pr.ParallelRunner(PrimeFinder, maxProcess=2, isDynamic=True)
+        arguments = [10, 20, 30]
+        for isProgressBar in [False, True]:
+            results = runner.runSync(arguments, isProgressBar=isProgressBar)
+            self.assertEqual(len(results), sum(arguments))
+            # Results are in the order of the arguments
+            self.assertEqual(results[10], 2)
+
+    def testRunSyncDynamicRetry(self):
+        if IGNORE_TEST:
+            return
+        runner = pr.ParallelRunner(ProblemPrimeFinder, maxProcess=2,
+              isDynamic=True, taskTimeout=2, maxRetry=1)
+        arguments = [10, -5, 0, 20]
+        results = runner.runSync(arguments, isProgressBar=False)
+        self.assertEqual(len(results), 30)
+        # Failed arguments are reported
+        self.assertEqual(sorted(runner.abandonedIdxs), [1, 2])
+        self.assertEqual(len(runner.errorDct[1]), 2)
+        self.assertTrue("timeout" in runner.errorDct[1])
+        self.assertTrue("Invalid count." in runner.errorDct[2])
+
+    def testRunStream(self):
+        if IGNORE_TEST:
+            return
+        runner = pr.ParallelRunner(PrimeFinder, maxProcess=2)
+        arguments = [10, 20, 30]
+        for isParallel in [False, True]:
+            results = list(runner.runStream(arguments, isParallel=isParallel,
+                  isProgressBar=False))
+            self.assertEqual(len(results), sum(arguments))
+            self.assertEqual(len(set(results)), max(arguments))
+
+    def testRunStreamStop(self):
+        if IGNORE_TEST:
+            return
+        runner = pr.ParallelRunner(PrimeFinder, maxProcess=2)
+        arguments = [COUNT, COUNT]
+        count = 0
+        for _ in runner.runStream(arguments, isProgressBar=False):
+            count += 1
+            if count == 5:
+                break
+        self.assertEqual(count, 5)
+
     def testMkArgumentCollections(self):
         if IGNORE_TEST:
             return
@@ -193,5 +261,64 @@ class TestParallelRunner(unittest.TestCase):
             self.assertTrue(all(trues))
 
 
+class TestRunnerPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = pr.RunnerPool(PrimeFinder, maxProcess=2)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def testRunSync(self):
+        if IGNORE_TEST:
+            return
+        mkArguments = []
+        def mkArgument():
+            mkArguments.append(None)
+            return 0
+        #
+        resultsList = []
+        for isProgressBar in [False, True]:
+            results = self.pool.runSync("primes", mkArgument, 100,
+                  isProgressBar=isProgressBar)
+            self.assertEqual(len(results), 100)
+            resultsList.append(results)
+        # Each process continues from its previous primes
+        self.assertTrue(set(resultsList[0]).isdisjoint(resultsList[1]))
+        self.assertEqual(len(mkArguments), 1)
+        results = self.pool.runSync("other", mkArgument, 10, numProcess=1)
+        self.assertEqual(len(results), 10)
+        self.assertEqual(results[0], 2)
+        self.assertEqual(len(mkArguments), 2)
+
+    def testRunSyncError(self):
+        if IGNORE_TEST:
+            return
+        pool = pr.RunnerPool(ProblemPrimeFinder, maxProcess=2)
+        mkArguments = []
+        def mkArgument():
+            mkArguments.append(None)
+            return 0
+        # Failures to construct a runner are raised, and the
+        # argument is sent again on the next call
+        for count in [1, 2]:
+            with self.assertRaises(RuntimeError):
+                _ = pool.runSync("bad", mkArgument, 10, isProgressBar=False)
+            self.assertEqual(len(mkArguments), count)
+            self.assertTrue(all(["bad" not in d for d in pool._keyDcts]))
+        results = pool.runSync("good", lambda: 5, 10, isProgressBar=False)
+        self.assertEqual(len(results), 10)
+        pool.close()
+
+    def testClose(self):
+        if IGNORE_TEST:
+            return
+        self.assertTrue(self.pool.isAlive)
+        self.pool.close()
+        self.assertFalse(self.pool.isAlive)
+        with self.assertRaises(RuntimeError):
+            _ = self.pool.runSync("primes", lambda: 0, 10)
+
+
 if __name__ == '__main__':
     unittest.main()
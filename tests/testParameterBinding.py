@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Created on October 18, 2026
+"""
+
+from SBstoat._parameterBinding import ParameterBinding
+from tests import _testHelpers as th
+
+import lmfit
+import numpy as np
+import tellurium as te
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+ROADRUNNER = te.loada(th.ANTIMONY_MODEL)
+NAMES = ["k3", "S1", "k1"]
+
+
+class TestParameterBinding(unittest.TestCase):
+
+    def setUp(self):
+        self.roadrunner = ROADRUNNER
+        self.roadrunner.reset()
+        self.binding = ParameterBinding(self.roadrunner, NAMES)
+
+    def testConstructor(self):
+        if IGNORE_TEST:
+            return
+        self.assertEqual(list(self.binding._globalPositionArr), [0, 2])
+        self.assertEqual(self.binding._otherPositions, [1])
+
+    def testIsBound(self):
+        if IGNORE_TEST:
+            return
+        self.assertTrue(self.binding.isBound(self.roadrunner, list(NAMES)))
+        self.assertFalse(self.binding.isBound(self.roadrunner, NAMES[:2]))
+        roadrunner = te.loada(th.ANTIMONY_MODEL)
+        self.assertFalse(self.binding.isBound(roadrunner, NAMES))
+
+    def testGetValues(self):
+        if IGNORE_TEST:
+            return
+        params = lmfit.Parameters()
+        for idx, name in enumerate(reversed(NAMES)):
+            params.add(name, value=idx)
+        expected = [2, 1, 0]
+        self.assertEqual(list(self.binding.getValues(params)), expected)
+        dct = params.valuesdict()
+        self.assertEqual(list(self.binding.getValues(dct)), expected)
+
+    def testSetValues(self):
+        if IGNORE_TEST:
+            return
+        values = np.array([30.0, 7.0, 10.0])
+        self.binding.setValues(values)
+        for name, value in zip(NAMES, values):
+            self.assertEqual(self.roadrunner.model[name], value)
+        # Other parameters are unchanged
+        self.assertEqual(self.roadrunner.model["k2"], th.PARAMETER_DCT["k2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -122,6 +122,40 @@ class TestConsumerlRunner(unittest.TestCase):
         for result, size in zip(results, PRIME_SIZES):
             self.assertEqual(len(result), size)
 
+    def testSubmitAsync(self):
+        if IGNORE_TEST:
+            return
+        self._init()
+        futures = self.manager.submitAsync(PRIME_SIZES)
+        # Several work units can be outstanding for a server
+        moreFutures = self.manager.submitAsync(PRIME_SIZES[1:],
+              serverIdxs=[0, 0])
+        # Results are obtained out of order
+        result = moreFutures[1].result()
+        self.assertEqual(len(result), PRIME_SIZES[2])
+        results = self.manager.gather(futures + moreFutures)
+        self.manager.stop()
+        sizes = PRIME_SIZES + PRIME_SIZES[1:]
+        for future, result, size in zip(futures + moreFutures, results, sizes):
+            self.assertTrue(future.done())
+            self.assertEqual(len(result), size)
+        # A result can be obtained more than once
+        self.assertEqual(len(futures[0].result()), PRIME_SIZES[0])
+
+    def testGatherTimeout(self):
+        if IGNORE_TEST:
+            return
+        self._init()
+        futures = self.manager.submitAsync([10000], serverIdxs=[1])
+        self.assertFalse(futures[0].done())
+        results = self.manager.gather(futures, timeout=0.01)
+        self.assertIsNone(results[0])
+        # The late result is not used for later work units
+        results = self.manager.submit(PRIME_SIZES)
+        self.manager.stop()
+        for result, size in zip(results, PRIME_SIZES):
+            self.assertEqual(len(result), size)
+
 
 if __name__ == '__main__':
     unittest.main()
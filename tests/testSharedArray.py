@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Created on October 18, 2026
+"""
+
+from SBstoat._sharedArray import SharedArray
+
+import multiprocessing
+import numpy as np
+import pickle
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+ARR = np.reshape(np.arange(12, dtype=float), (4, 3))
+
+
+def _sumArray(queue, sharedArray):
+    queue.put((float(np.sum(sharedArray.array)),
+          sharedArray.array.flags.writeable))
+
+
+class TestSharedArray(unittest.TestCase):
+
+    def setUp(self):
+        self.sharedArray = SharedArray(ARR)
+
+    def tearDown(self):
+        self.sharedArray.unlink()
+
+    def testConstructor(self):
+        if IGNORE_TEST:
+            return
+        np.testing.assert_array_equal(self.sharedArray.array, ARR)
+        self.assertTrue(self.sharedArray.isOwner)
+        # Values are copied
+        self.assertFalse(np.shares_memory(self.sharedArray.array, ARR))
+
+    def testPickle(self):
+        if IGNORE_TEST:
+            return
+        sharedArray = pickle.loads(pickle.dumps(self.sharedArray))
+        self.assertFalse(sharedArray.isOwner)
+        self.assertFalse(sharedArray.array.flags.writeable)
+        # Attached arrays see changes by the owner
+        self.sharedArray.array[0, 0] = 100
+        self.assertEqual(sharedArray.array[0, 0], 100)
+        # Pickles are small
+        self.assertLess(len(pickle.dumps(SharedArray(np.zeros(10000)))),
+              1000)
+        # Unlinking a copy does not remove the block
+        sharedArray.unlink()
+        sharedArray = pickle.loads(pickle.dumps(self.sharedArray))
+        self.assertIsNotNone(sharedArray.array)
+
+    def testAttach(self):
+        if IGNORE_TEST:
+            return
+        sharedArray = self.sharedArray.attach()
+        self.assertFalse(sharedArray.isOwner)
+        # Uses the same block
+        self.sharedArray.array[0, 0] = 100
+        self.assertEqual(sharedArray.array[0, 0], 100)
+        # Only the creator removes the block
+        sharedArray.unlink()
+        del sharedArray
+        sharedArray = pickle.loads(pickle.dumps(self.sharedArray))
+        self.assertIsNotNone(sharedArray.array)
+
+    def testProcess(self):
+        if IGNORE_TEST:
+            return
+        context = multiprocessing.get_context("spawn")
+        queue = context.Queue()
+        process = context.Process(target=_sumArray,
+              args=(queue, self.sharedArray))
+        process.start()
+        total, isWriteable = queue.get(timeout=60)
+        process.join()
+        self.assertEqual(total, np.sum(ARR))
+        self.assertFalse(isWriteable)
+
+    def testUnlink(self):
+        if IGNORE_TEST:
+            return
+        serialization = pickle.dumps(self.sharedArray)
+        self.sharedArray.unlink()
+        # Values remain available in this process
+        self.assertEqual(np.sum(self.sharedArray.array), np.sum(ARR))
+        sharedArray = pickle.loads(serialization)
+        self.assertIsNone(sharedArray.array)
+
+
+if __name__ == '__main__':
+    unittest.main()
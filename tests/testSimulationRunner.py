@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Created on October 18, 2026
+"""
+
+from SBstoat import _simulationRunner as sr
+from SBstoat import _modelCache as mc
+from SBstoat._modelFitterCore import ModelFitterCore
+from SBstoat.timeseriesStatistic import TimeseriesStatistic
+from tests import _testHelpers as th
+
+import lmfit
+import numpy as np
+import unittest
+
+
+IGNORE_TEST = False
+IS_PLOT = False
+FITTER = th.getFitter(cls=ModelFitterCore)
+PARAMETER_NAMES = list(th.PARAMETER_DCT.keys())
+NUM_SAMPLE = 25
+BATCH_SIZE = 10
+NUM_POINT = 20
+
+
+class TestSimulationRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.fitter = FITTER.copy()
+        values = [th.PARAMETER_DCT[n] for n in PARAMETER_NAMES]
+        self.parameterArr = np.repeat([values], NUM_SAMPLE, axis=0)  \
+              *np.random.uniform(0.9, 1.1, (NUM_SAMPLE, len(values)))
+        self.argument = sr.SimulationRunnerArgument(self.fitter,
+              PARAMETER_NAMES, self.parameterArr, numPoint=NUM_POINT,
+              batchSize=BATCH_SIZE)
+        self.runner = sr.SimulationRunner(self.argument)
+
+    def testConstructor(self):
+        if IGNORE_TEST:
+            return
+        self.assertEqual(self.runner.numWorkUnit, 3)
+        self.assertFalse(self.runner.isDone)
+
+    def testModelCache(self):
+        if IGNORE_TEST:
+            return
+        self.assertIsNotNone(self.runner.fitter.roadrunnerModel)
+        key = mc.mkKey(self.runner.fitter.modelSpecification)
+        self.assertTrue(key in mc._STATE_DCT.keys())
+
+    def testRun(self):
+        if IGNORE_TEST:
+            return
+        statistics = []
+        while not self.runner.isDone:
+            statistics.append(self.runner.run())
+        self.assertEqual(sum([s.count for s in statistics]), NUM_SAMPLE)
+        statistic = TimeseriesStatistic.merge(statistics)
+        statistic.calculate()
+        self.assertEqual(len(statistic.meanTS), NUM_POINT)
+        # Same mean as simulating each sample separately
+        meanArr = np.zeros(np.shape(statistic.meanTS[statistic.colnames]))
+        for values in self.parameterArr:
+            params = lmfit.Parameters()
+            for name, value in zip(PARAMETER_NAMES, values):
+                params.add(name, value=value)
+            fittedTS = self.fitter.simulate(params=params, numPoint=NUM_POINT)
+            meanArr += fittedTS[statistic.colnames]
+        meanArr = meanArr/NUM_SAMPLE
+        self.assertTrue(np.allclose(meanArr,
+              statistic.meanTS[statistic.colnames]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -197,6 +197,40 @@ class TestSuiteFitterCore(unittest.TestCase):
         expectedSize = th.NUM_POINT*self.numModel*len(th.VARIABLE_NAMES)
         self.assertTrue(np.isclose(expectedSize, np.size(residuals)))
 
+    def testCalcResidualsParallel(self):
+        if IGNORE_TEST:
+            return
+        self._init()
+        parameters = self.fitter.parameterManager.mkParameters()
+        expected = self.fitter.calcResiduals(parameters)
+        self.fitter._isParallel = True
+        for maxProcess in [1, 2, 5]:
+            self.fitter._maxProcess = maxProcess
+            self.fitter._startServers()
+            self.assertEqual(len(self.fitter.manager.servers),
+                  min(maxProcess, self.numModel))
+            for _ in range(3):
+                residuals = self.fitter.calcResiduals(parameters)
+                np.testing.assert_allclose(residuals, expected)
+            self.assertEqual(self.fitter.scheduler.numEvaluation, 3)
+            self.assertTrue(all(self.fitter.scheduler.isMeasuredArr))
+            self.fitter.clean()
+
+    def testFitSuiteParallel(self):
+        if IGNORE_TEST:
+            return
+        self._init(numModel=3)
+        self.fitter.fitSuite()
+        expectedDct = self.fitter.params.valuesdict()
+        self._init(numModel=3)
+        self.fitter._isParallel = True
+        self.fitter._maxProcess = 2
+        self.fitter.fitSuite()
+        self.assertIsNone(self.fitter.manager)
+        self.assertEqual(self.fitter.scheduler.numWorker, 2)
+        for name, value in self.fitter.params.valuesdict().items():
+            self.assertTrue(np.isclose(value, expectedDct[name]))
+
     def testFitSuite(self):
         if IGNORE_TEST:
             return
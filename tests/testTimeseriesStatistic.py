@@ -93,10 +93,11 @@ class TestNamedTimeseries(unittest.TestCase):
         stdTS = SIMPLE_TS.copy(isInitialize=True)
         self.assertTrue(self.statistic.stdTS.equals(stdTS))
 
-    def mkStatistics(self, count):
+    def mkStatistics(self, count, reservoirSize=None):
         result = []
         for _ in range(count):
-            statistic = TimeseriesStatistic(UNIFORM_TS)
+            statistic = TimeseriesStatistic(UNIFORM_TS,
+                  reservoirSize=reservoirSize)
             for _ in range(UNIFORM_CNT):
                 statistic.accumulate(
                       mkTimeseries(UNIFORM_LEN, COLNAMES, isRandom=True))
@@ -120,6 +121,50 @@ class TestNamedTimeseries(unittest.TestCase):
         statistic = self.mkStatistics(1)[0]
         self.evaluateStatistic(statistic)
 
+    def testReservoir(self):
+        if IGNORE_TEST:
+            return
+        statistic = TimeseriesStatistic(UNIFORM_TS, reservoirSize=UNIFORM_CNT)
+        for _ in range(2*UNIFORM_CNT):
+            statistic.accumulate(
+                  mkTimeseries(UNIFORM_LEN, COLNAMES, isRandom=True))
+        self.evaluateStatistic(statistic, count=2)
+        self.assertEqual(len(statistic._sampleArr), UNIFORM_CNT)
+
+    def testReservoirExact(self):
+        if IGNORE_TEST:
+            return
+        # A reservoir that is not full has all of the values
+        exactStatistic = TimeseriesStatistic(UNIFORM_TS)
+        statistic = TimeseriesStatistic(UNIFORM_TS, reservoirSize=UNIFORM_CNT)
+        for _ in range(UNIFORM_CNT):
+            timeseries = mkTimeseries(UNIFORM_LEN, COLNAMES, isRandom=True)
+            exactStatistic.accumulate(timeseries)
+            statistic.accumulate(timeseries)
+        exactStatistic.calculate()
+        statistic.calculate()
+        for percentile in statistic.percentiles:
+            self.assertTrue(np.allclose(
+                  statistic.percentileDct[percentile].flatten(),
+                  exactStatistic.percentileDct[percentile].flatten()))
+
+    def testMergeReservoir(self):
+        if IGNORE_TEST:
+            return
+        NUM = 4
+        RESERVOIR_SIZE = 2*UNIFORM_CNT
+        statistics = self.mkStatistics(NUM, reservoirSize=RESERVOIR_SIZE)
+        statistic = TimeseriesStatistic.merge(statistics)
+        self.evaluateStatistic(statistic, count=NUM)
+        self.assertEqual(len(statistic._sampleArr), RESERVOIR_SIZE)
+        # Statistics without timeseries are ignored
+        statistic = TimeseriesStatistic.merge([TimeseriesStatistic(UNIFORM_TS),
+              statistics[0]])
+        self.evaluateStatistic(statistic)
+        with self.assertRaises(ValueError):
+            _ = TimeseriesStatistic.merge([statistics[0],
+                  self.mkStatistics(1)[0]])
+
     def testEquals(self):
         if IGNORE_TEST:
             return
@@ -147,6 +192,22 @@ class TestNamedTimeseries(unittest.TestCase):
         statistic.calculate()
         self.evaluateStatistic(statistic, count=NUM)
 
+    def testRpReviseTimeseriesList(self):
+        if IGNORE_TEST:
+            return
+        # Serializations before the sample array kept a list of timeseries
+        del self.statistic.__dict__["_sampleArr"]
+        self.statistic._timeseries_list = [SIMPLE_TS for _ in range(SIMPLE_CNT)]
+        self.statistic.count = SIMPLE_CNT
+        self.statistic.rpRevise()
+        self.assertFalse("_timeseries_list" in self.statistic.__dict__)
+        self.assertEqual(np.shape(self.statistic._sampleArr),
+              (SIMPLE_CNT, LENGTH, NUM_COL - 1))
+        self.statistic._calculatePercentiles()
+        for percentile in self.statistic.percentiles:
+            self.assertTrue(self.statistic.percentileDct[percentile].equals(
+                  SIMPLE_TS))
+
     def testRpickleInterface(self):
         if IGNORE_TEST:
             return